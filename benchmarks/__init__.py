@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for Shitcord.
+
+These aren't part of the distributed package. Run them from the root of the repository, e.g.
+
+.. code-block:: shell
+
+    python -m benchmarks.mock_server --port 8080
+    python -m benchmarks.http_throughput --requests 5000 --concurrency 500
+"""
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""Drives concurrent :class:`shitcord.http.API` calls against the Discord REST API stand-in.
+
+The benchmark reports throughput, latency percentiles and how many requests were rate limited,
+so changes to the limiter, the retry policy or the connection pooling can be compared.
+
+.. code-block:: shell
+
+    # Starts a stand-in inside the same process.
+    python -m benchmarks.http_throughput --requests 5000 --concurrency 500 --channels 100
+
+    # Uses a stand-in that runs in another process, so it doesn't compete for the CPU.
+    python -m benchmarks.mock_server --port 8080 --latency 0.05
+    python -m benchmarks.http_throughput --url http://127.0.0.1:8080/api/v7
+"""
+
+import argparse
+import json
+import random
+
+import asks
+import trio
+
+from shitcord.http import API, AsksTransport, H11Transport, ShitRequestFailed
+
+from .mock_server import add_arguments, from_arguments
+from .utils import format_table, percentile
+
+SCENARIOS = ('get', 'post', 'mixed')
+TRANSPORTS = ('asks', 'h11')
+
+
+async def _get_stats(session, url):
+    response = await session.get(url.rsplit('/api/', 1)[0] + '/_mock/stats')
+    return json.loads(response.content)
+
+
+async def _reset_stats(session, url):
+    await session.post(url.rsplit('/api/', 1)[0] + '/_mock/reset')
+
+
+def _create_call(api, scenario, channels, messages):
+    channel_id = random.choice(channels)
+    if scenario == 'mixed':
+        scenario = 'post' if random.random() < 0.2 else 'get'
+
+    if scenario == 'post':
+        return api.create_message(channel_id, 'Benchmark message')
+    return api.get_channel_message(channel_id, random.choice(messages[channel_id]))
+
+
+def create_transport(args):
+    if args.transport == 'h11':
+        return H11Transport(max_connections=args.connections)
+    return AsksTransport(connections=args.connections)
+
+
+async def run(args, url):
+    """Runs the benchmark against a stand-in and returns the rows of the result table."""
+
+    # The statistics of the stand-in are queried separately, so they don't show up in the pool.
+    session = asks.Session()
+    transport = create_transport(args)
+    api = API('benchmark', base_url=url, transport=transport, coalesce_requests=not args.no_coalescing)
+
+    await _reset_stats(session, url)
+
+    # Every channel is its own rate limit bucket.
+    channels = [1000 + index for index in range(args.channels)]
+    messages = {}
+    for channel_id in channels:
+        messages[channel_id] = [message.id for message in await api.get_channel_messages(channel_id, limit=100)]
+    await _reset_stats(session, url)
+    api.http.limiter.buckets.clear()
+
+    latencies = []
+    failures = 0
+    limiter = trio.CapacityLimiter(args.concurrency)
+
+    async def call():
+        nonlocal failures
+        async with limiter:
+            started = trio.current_time()
+            try:
+                await _create_call(api, args.scenario, channels, messages)
+            except ShitRequestFailed:
+                failures += 1
+            else:
+                latencies.append(trio.current_time() - started)
+
+    started = trio.current_time()
+    async with trio.open_nursery() as nursery:
+        for _ in range(args.requests):
+            nursery.start_soon(call)
+    elapsed = trio.current_time() - started
+
+    stats = await _get_stats(session, url)
+    client_stats = api.http.get_stats()
+    waits = [route['limiter_wait'] for route in client_stats['routes'].values()]
+    wait_mean = sum(wait['sum'] for wait in waits) / max(sum(wait['count'] for wait in waits), 1)
+
+    await transport.aclose()
+
+    return [
+        ('scenario', '{} ({} channels, concurrency {}, {} connections, {})'.format(
+            args.scenario, args.channels, args.concurrency, args.connections, args.transport)),
+        ('calls', '{} ({} failed)'.format(args.requests, failures)),
+        ('elapsed', '{:.2f} s'.format(elapsed)),
+        ('throughput', '{:.1f} calls/s'.format(args.requests / elapsed)),
+        ('latency p50', '{:.1f} ms'.format(percentile(latencies, 50) * 1000)),
+        ('latency p90', '{:.1f} ms'.format(percentile(latencies, 90) * 1000)),
+        ('latency p99', '{:.1f} ms'.format(percentile(latencies, 99) * 1000)),
+        ('latency max', '{:.1f} ms'.format(max(latencies, default=0) * 1000)),
+        ('requests sent', stats.get('requests', 0)),
+        ('connections', stats.get('connections', 0)),
+        ('429s (bucket)', stats.get('rate_limited', 0)),
+        ('429s (global)', stats.get('global_rate_limited', 0)),
+        ('5xx', stats.get('server_errors', 0)),
+        ('retries', client_stats['retries']),
+        ('coalesced', client_stats['coalesced']),
+        ('limiter wait mean', '{:.1f} ms'.format(wait_mean * 1000)),
+    ]
+
+
+def create_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--url', help='the base URL of an already running stand-in')
+    parser.add_argument('--scenario', choices=SCENARIOS, default='mixed')
+    parser.add_argument('--requests', type=int, default=2000, help='the total amount of API calls')
+    parser.add_argument('--concurrency', type=int, default=500, help='the amount of API calls in flight')
+    parser.add_argument('--connections', type=int, default=20, help='the size of the connection pool')
+    parser.add_argument('--channels', type=int, default=100, help='the amount of channels the calls are spread over')
+    parser.add_argument('--no-coalescing', action='store_true', help='disables the coalescing of GET requests')
+    parser.add_argument('--transport', choices=TRANSPORTS, default='asks', help='the transport of the HTTP client')
+    add_arguments(parser)
+    parser.set_defaults(bucket_limit=50, bucket_window=1.0, global_limit=0)
+    return parser
+
+
+def main():
+    args = create_parser('Benchmarks the throughput of the HTTP client.').parse_args()
+
+    async def _main():
+        if args.url is not None:
+            print(format_table(await run(args, args.url)))
+            return
+
+        server = from_arguments(args)
+        async with trio.open_nursery() as nursery:
+            await nursery.start(server.serve)
+            print(format_table(await run(args, server.url)))
+            nursery.cancel_scope.cancel()
+
+    trio.run(_main)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,876 @@
+# -*- coding: utf-8 -*-
+
+"""A local stand-in for the Discord REST API.
+
+The server implements the routes of :class:`shitcord.http.Endpoints` on top of h11 and trio
+and answers with fake, but well-formed payloads that the models can be constructed from.
+Latency, per-route and global rate limits, bucket hashes as well as 429 and 5xx responses
+can be scripted, so the whole HTTP stack can be exercised without talking to Discord.
+
+.. code-block:: python3
+
+    server = MockDiscord(latency=0.05, error_rate=0.01)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(server.serve)
+
+        api = API('token', base_url=server.url)
+        user = await api.get_current_user()
+
+        nursery.cancel_scope.cancel()
+
+Besides the Discord routes, ``GET /_mock/stats`` returns the statistics of the server
+and ``POST /_mock/reset`` resets them together with all rate limit buckets.
+"""
+
+import argparse
+import bisect
+import collections
+import datetime
+import email.parser
+import email.utils
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+import re
+import time
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import h11
+import trio
+
+from shitcord.http import Endpoints
+from shitcord.models import DISCORD_EPOCH
+from shitcord.utils.compat import BrokenResourceError
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['MockDiscord', 'MockHTTPError', 'MockRequest']
+
+# Discord tracks rate limits per route and per value of these parameters.
+MAJOR_PARAMETERS = ('guild', 'channel', 'webhook')
+
+# Messages older than this can't be deleted in bulk.
+BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60
+
+
+class MockHTTPError(Exception):
+    """Raised by route handlers to answer with an error response.
+
+    Parameters
+    ----------
+    status : int
+        The status code of the response.
+    message : str
+        The error message.
+    code : int, optional
+        The JSON error code Discord uses for this error.
+    """
+
+    def __init__(self, status, message, code=0):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.code = code
+
+
+class _Route:
+    __slots__ = ('name', 'endpoint', 'method', 'template', 'pattern', 'params', 'hash')
+
+    def __init__(self, name, endpoint):
+        self.name = name
+        self.endpoint = endpoint
+        self.method = endpoint[0].value
+        self.template = endpoint[1]
+
+        parts = re.split(r'\{(\w+)\}', self.template)
+        pattern = ''.join(re.escape(part) if index % 2 == 0 else '(?P<{}>[^/]+)'.format(part)
+                          for index, part in enumerate(parts))
+        self.pattern = re.compile(pattern + '$')
+        self.params = parts[1::2]
+
+        # Discord shares a bucket hash between all requests to the same route.
+        self.hash = hashlib.sha1((self.method + self.template).encode('utf-8')).hexdigest()[:16]
+
+    def get_bucket(self, params):
+        fmt = {key: value if key in MAJOR_PARAMETERS else '' for key, value in params.items()}
+        return self.method, self.template.format(**fmt)
+
+
+def _compile_routes():
+    routes = collections.defaultdict(list)
+    for name, endpoint in vars(Endpoints).items():
+        if isinstance(endpoint, tuple):
+            route = _Route(name, endpoint)
+            routes[route.method].append(route)
+
+    # Routes with literal segments like /users/@me have to win over /users/{user}.
+    for candidates in routes.values():
+        candidates.sort(key=lambda route: len(route.params))
+
+    return routes
+
+
+class _Bucket:
+    __slots__ = ('limit', 'window', 'remaining', 'reset')
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset = 0.0
+
+    def acquire(self, now):
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+
+        if self.remaining <= 0:
+            return False
+
+        self.remaining -= 1
+        return True
+
+
+class MockRequest:
+    """Represents a request received by :class:`MockDiscord`.
+
+    Attributes
+    ----------
+    method : str
+        The HTTP method of the request.
+    path : str
+        The path of the request without the API prefix.
+    endpoint : tuple
+        The matching endpoint from :class:`shitcord.http.Endpoints`.
+    params : dict
+        The values of the route parameters, e.g. ``{'channel': '1234'}``.
+    query : dict
+        The query string parameters.
+    headers : dict
+        The request headers with lowercased names.
+    body : bytes
+        The raw request body.
+    """
+
+    __slots__ = ('method', 'path', 'endpoint', 'params', 'query', 'headers', 'body', '_json')
+
+    def __init__(self, method, path, endpoint, params, query, headers, body):
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.params = params
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self._json = None
+
+    def __repr__(self):
+        return '<MockRequest {0.method} {0.path}>'.format(self)
+
+    @property
+    def json(self):
+        """The JSON body of the request. For multipart requests, this is the ``payload_json`` field."""
+
+        if self._json is None:
+            self._json = self._parse_body()
+        return self._json
+
+    def _parse_body(self):
+        content_type = self.headers.get('content-type', '')
+        if content_type.startswith('multipart/form-data'):
+            message = email.parser.BytesParser().parsebytes(b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + self.body)
+            for part in message.get_payload():
+                if part.get_param('name', header='content-disposition') == 'payload_json':
+                    return json.loads(part.get_payload(decode=True))
+            return {}
+
+        if self.body:
+            return json.loads(self.body)
+        return {}
+
+
+class MockDiscord:
+    """A scriptable stand-in for the Discord REST API.
+
+    Parameters
+    ----------
+    latency : float, Callable, optional
+        The seconds every request takes before it's answered or a callable returning them.
+    limits : dict, optional
+        A dict mapping endpoints to ``(limit, window)`` tuples that override the default limit.
+        A value of ``None`` removes the rate limit for an endpoint.
+    default_limit : tuple, optional
+        The ``(limit, window)`` of every route bucket. Defaults to 5 requests per 5 seconds.
+    global_limit : tuple, optional
+        The ``(limit, window)`` of the global rate limit. Defaults to 50 requests per second.
+    error_rate : float, optional
+        The probability of a request failing with a random 5xx status code.
+    rate_limit_rate : float, optional
+        The probability of a request being answered with a spurious 429, like Discord does when
+        shared resources are exhausted.
+    history_size : int, optional
+        The amount of messages every channel starts with.
+    history_interval : float, optional
+        The seconds between two of these messages.
+    member_count : int, optional
+        The amount of members every guild has.
+    guild_count : int, optional
+        The amount of guilds the current user is in.
+    reaction_count : int, optional
+        The amount of users that reacted to every message.
+    seed : int, optional
+        Seeds the random generator for reproducible fault injection.
+
+    Attributes
+    ----------
+    host : str
+        The host the server listens on. Only available after :meth:`serve` was started.
+    port : int
+        The port the server listens on. Only available after :meth:`serve` was started.
+    handlers : dict
+        A dict mapping endpoints to functions that take a :class:`MockRequest` and return the
+        response payload or ``None`` for 204 No Content. They can raise :class:`MockHTTPError`.
+    """
+
+    PREFIX = '/api/v7'
+
+    def __init__(self, *, latency=0.0, limits=None, default_limit=(5, 5.0), global_limit=(50, 1.0),
+                 error_rate=0.0, rate_limit_rate=0.0, history_size=1000, history_interval=60.0,
+                 member_count=1000, guild_count=10, reaction_count=100, seed=None):
+        self.latency = latency
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.global_limit = global_limit
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.history_size = history_size
+        self.history_interval = history_interval
+        self.member_count = member_count
+        self.guild_count = guild_count
+        self.reaction_count = reaction_count
+
+        self.host = None
+        self.port = None
+        self.started = time.time()
+
+        self._random = random.Random(seed)
+        self._routes = _compile_routes()
+        self._buckets = {}
+        self._global_buckets = {}
+        self._faults = collections.defaultdict(collections.deque)
+        self._increment = itertools.count()
+        self._channels = {}
+        self._id_base = self._make_id(self.started - 365 * 24 * 60 * 60)
+
+        self.stats = collections.Counter()
+        self.route_stats = collections.Counter()
+
+        self.handlers = {
+            Endpoints.GET_CHANNEL: self._get_channel,
+            Endpoints.MODIFY_CHANNEL: self._get_channel,
+            Endpoints.DELETE_CHANNEL: self._get_channel,
+            Endpoints.GET_CHANNEL_MESSAGES: self._get_channel_messages,
+            Endpoints.GET_CHANNEL_MESSAGE: self._get_channel_message,
+            Endpoints.CREATE_MESSAGE: self._create_message,
+            Endpoints.EDIT_MESSAGE: self._edit_message,
+            Endpoints.DELETE_MESSAGE: self._delete_message,
+            Endpoints.BULK_DELETE_MESSAGES: self._bulk_delete_messages,
+            Endpoints.GET_REACTIONS: self._get_reactions,
+            Endpoints.GET_GUILD: self._get_guild,
+            Endpoints.MODIFY_GUILD: self._get_guild,
+            Endpoints.GET_GUILD_MEMBER: self._get_guild_member,
+            Endpoints.LIST_GUILD_MEMBERS: self._list_guild_members,
+            Endpoints.GET_GUILD_BANS: lambda request: [],
+            Endpoints.GET_GUILD_AUDIT_LOG: lambda request: {'audit_log_entries': [], 'users': [], 'webhooks': []},
+            Endpoints.GET_CURRENT_USER: lambda request: self._user(self._id_base),
+            Endpoints.MODIFY_CURRENT_USER: lambda request: self._user(self._id_base),
+            Endpoints.GET_USER: lambda request: self._user(int(request.params['user'])),
+            Endpoints.GET_CURRENT_USER_GUILDS: self._get_current_user_guilds,
+            Endpoints.GET_WEBHOOK: self._get_webhook,
+            Endpoints.GET_WEBHOOK_WITH_TOKEN: self._get_webhook,
+            Endpoints.EXECUTE_WEBHOOK: self._execute_webhook,
+            Endpoints.GET_GATEWAY: lambda request: {'url': 'wss://gateway.discord.gg'},
+            Endpoints.GET_GATEWAY_BOT: lambda request: {'url': 'wss://gateway.discord.gg', 'shards': 1},
+        }
+
+    def __repr__(self):
+        return '<MockDiscord url={0.url}>'.format(self)
+
+    @property
+    def url(self):
+        """The base URL to pass to :class:`shitcord.http.HTTP`."""
+
+        return 'http://{}:{}{}'.format(self.host, self.port, self.PREFIX)
+
+    def get_stats(self):
+        """Returns a dict containing the statistics of the server."""
+
+        stats = dict(self.stats)
+        stats['routes'] = dict(self.route_stats)
+        return stats
+
+    def reset(self):
+        """Resets the statistics, rate limit buckets and scripted faults."""
+
+        self.stats.clear()
+        self.route_stats.clear()
+        self._buckets.clear()
+        self._global_buckets.clear()
+        self._faults.clear()
+
+    def fail_next(self, endpoint=None, status=500, *, times=1, retry_after=1.0):
+        """Makes the next requests to an endpoint fail.
+
+        Parameters
+        ----------
+        endpoint : tuple, optional
+            The endpoint from :class:`shitcord.http.Endpoints`. ``None`` for any endpoint.
+        status : int, optional
+            The status code to answer with. Defaults to 500.
+        times : int, optional
+            The amount of requests that should fail. Defaults to 1.
+        retry_after : float, optional
+            The seconds to wait that are sent along with a 429. Defaults to 1.
+        """
+
+        self._faults[endpoint].extend([(status, retry_after)] * times)
+
+    # --- Fake data ----------------------------------------------------------------- #
+
+    def _make_id(self, timestamp):
+        return ((int(timestamp * 1000) - DISCORD_EPOCH) << 22) + (next(self._increment) & 0xFFF)
+
+    @staticmethod
+    def _get_timestamp(snowflake):
+        return ((int(snowflake) >> 22) + DISCORD_EPOCH) / 1000
+
+    def _format_timestamp(self, snowflake):
+        date = datetime.datetime.fromtimestamp(self._get_timestamp(snowflake), datetime.timezone.utc)
+        return date.isoformat(timespec='microseconds')
+
+    @staticmethod
+    def _user(user_id):
+        return {
+            'id': str(user_id),
+            'username': 'User {}'.format(user_id % 10000),
+            'discriminator': '{:04d}'.format(user_id % 10000),
+            'avatar': None,
+            'bot': False,
+        }
+
+    def _member(self, guild_id, user_id):
+        return {
+            'user': self._user(user_id),
+            'nick': None,
+            'roles': [str(guild_id)],
+            'joined_at': self._format_timestamp(user_id),
+            'deaf': False,
+            'mute': False,
+        }
+
+    def _message(self, channel_id, message_id, content, author_id=None):
+        return {
+            'id': str(message_id),
+            'channel_id': str(channel_id),
+            'author': self._user(author_id or self._id_base),
+            'content': content,
+            'timestamp': self._format_timestamp(message_id),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+        }
+
+    def _channel(self, channel_id):
+        return {
+            'id': str(channel_id),
+            'type': 0,
+            'guild_id': str(self._id_base),
+            'position': 0,
+            'permission_overwrites': [],
+            'name': 'channel-{}'.format(channel_id % 10000),
+            'topic': None,
+            'nsfw': False,
+            'last_message_id': None,
+            'rate_limit_per_user': 0,
+        }
+
+    def _guild(self, guild_id):
+        return {
+            'id': str(guild_id),
+            'name': 'Guild {}'.format(guild_id % 10000),
+            'icon': None,
+            'splash': None,
+            'owner_id': str(self._id_base),
+            'region': 'eu-central',
+            'afk_channel_id': None,
+            'afk_timeout': 300,
+            'embed_enabled': False,
+            'embed_channel_id': None,
+            'verification_level': 0,
+            'default_message_notifications': 0,
+            'explicit_content_filter': 0,
+            'roles': [{
+                'id': str(guild_id),
+                'name': '@everyone',
+                'color': 0,
+                'hoist': False,
+                'position': 0,
+                'permissions': 104324161,
+                'managed': False,
+                'mentionable': False,
+            }],
+            'emojis': [],
+            'features': [],
+            'mfa_level': 0,
+            'application_id': None,
+            'widget_enabled': False,
+            'widget_channel_id': None,
+            'system_channel_id': None,
+        }
+
+    def _get_history(self, channel_id):
+        history = self._channels.get(channel_id)
+        if history is None:
+            # The oldest message comes first, just like the IDs are sorted.
+            start = time.time() - self.history_size * self.history_interval
+            ids = [self._make_id(start + index * self.history_interval) for index in range(self.history_size)]
+            history = self._channels[channel_id] = (ids, {message_id: 'Message {}'.format(index)
+                                                          for index, message_id in enumerate(ids)})
+
+        return history
+
+    # --- Route handlers ------------------------------------------------------------ #
+
+    @staticmethod
+    def _get_limit(request, default, maximum, minimum=1):
+        limit = int(request.query.get('limit', default))
+        if not minimum <= limit <= maximum:
+            raise MockHTTPError(400, 'Invalid Form Body', 50035)
+        return limit
+
+    def _get_channel(self, request):
+        return self._channel(int(request.params['channel']))
+
+    def _get_channel_messages(self, request):
+        channel_id = int(request.params['channel'])
+        ids, contents = self._get_history(channel_id)
+        limit = self._get_limit(request, 50, 100)
+
+        if 'after' in request.query:
+            start = bisect.bisect_right(ids, int(request.query['after']))
+            selected = ids[start:start + limit]
+        elif 'around' in request.query:
+            middle = bisect.bisect_left(ids, int(request.query['around']))
+            start = max(middle - limit // 2, 0)
+            selected = ids[start:start + limit]
+        else:
+            end = bisect.bisect_left(ids, int(request.query['before'])) if 'before' in request.query else len(ids)
+            selected = ids[max(end - limit, 0):end]
+
+        # Messages are always returned from newest to oldest.
+        return [self._message(channel_id, message_id, contents[message_id]) for message_id in reversed(selected)]
+
+    def _get_channel_message(self, request):
+        channel_id = int(request.params['channel'])
+        message_id = int(request.params['message'])
+        _, contents = self._get_history(channel_id)
+
+        if message_id not in contents:
+            raise MockHTTPError(404, 'Unknown Message', 10008)
+        return self._message(channel_id, message_id, contents[message_id])
+
+    def _create_message(self, request):
+        channel_id = int(request.params['channel'])
+        payload = request.json
+        content = payload.get('content') or ''
+        if len(content) > 2000:
+            raise MockHTTPError(400, 'Invalid Form Body', 50035)
+
+        ids, contents = self._get_history(channel_id)
+        message_id = self._make_id(time.time())
+        ids.append(message_id)
+        contents[message_id] = content
+
+        message = self._message(channel_id, message_id, content)
+        if payload.get('embed'):
+            message['embeds'] = [payload['embed']]
+        return message
+
+    def _edit_message(self, request):
+        message = self._get_channel_message(request)
+        content = request.json.get('content')
+        if content is not None:
+            self._channels[int(request.params['channel'])][1][int(message['id'])] = content
+            message['content'] = content
+        return message
+
+    def _delete_message(self, request):
+        channel_id = int(request.params['channel'])
+        message_id = int(request.params['message'])
+        ids, contents = self._get_history(channel_id)
+
+        if contents.pop(message_id, None) is None:
+            raise MockHTTPError(404, 'Unknown Message', 10008)
+        ids.remove(message_id)
+
+    def _bulk_delete_messages(self, request):
+        channel_id = int(request.params['channel'])
+        message_ids = [int(message_id) for message_id in request.json.get('messages', [])]
+        if not 2 <= len(message_ids) <= 100:
+            raise MockHTTPError(400, 'Invalid Form Body', 50035)
+
+        cutoff = time.time() - BULK_DELETE_MAX_AGE
+        if any(self._get_timestamp(message_id) < cutoff for message_id in message_ids):
+            raise MockHTTPError(400, 'You can only bulk delete messages that are under 14 days old.', 50034)
+
+        ids, contents = self._get_history(channel_id)
+        for message_id in message_ids:
+            if contents.pop(message_id, None) is not None:
+                ids.remove(message_id)
+
+    def _get_reactions(self, request):
+        limit = self._get_limit(request, 25, 100)
+        after = int(request.query.get('after', 0))
+        start = max(after - self._id_base + 1, 1)
+        end = min(start + limit, self.reaction_count + 1)
+
+        return [self._user(self._id_base + index) for index in range(start, end)]
+
+    def _get_guild(self, request):
+        return self._guild(int(request.params['guild']))
+
+    def _get_guild_member(self, request):
+        return self._member(int(request.params['guild']), int(request.params['member']))
+
+    def _list_guild_members(self, request):
+        guild_id = int(request.params['guild'])
+        limit = self._get_limit(request, 1, 1000)
+        after = int(request.query.get('after', 0))
+        start = max(after - self._id_base + 1, 1)
+        end = min(start + limit, self.member_count + 1)
+
+        return [self._member(guild_id, self._id_base + index) for index in range(start, end)]
+
+    def _get_current_user_guilds(self, request):
+        limit = self._get_limit(request, 100, 100)
+        guild_ids = [self._id_base + index for index in range(1, self.guild_count + 1)]
+
+        if 'before' in request.query:
+            end = bisect.bisect_left(guild_ids, int(request.query['before']))
+            selected = guild_ids[max(end - limit, 0):end]
+        else:
+            start = bisect.bisect_right(guild_ids, int(request.query.get('after', 0)))
+            selected = guild_ids[start:start + limit]
+
+        return [{'id': str(guild_id), 'name': 'Guild {}'.format(guild_id % 10000), 'icon': None,
+                 'owner': False, 'permissions': 104324161} for guild_id in selected]
+
+    def _get_webhook(self, request):
+        webhook_id = int(request.params['webhook'])
+        return {
+            'id': str(webhook_id),
+            'guild_id': str(self._id_base),
+            'channel_id': str(self._id_base),
+            'user': self._user(self._id_base),
+            'name': 'Webhook {}'.format(webhook_id % 10000),
+            'avatar': None,
+            'token': request.params.get('token', 'token'),
+        }
+
+    def _execute_webhook(self, request):
+        payload = request.json
+        if len(payload.get('embeds') or []) > 10:
+            raise MockHTTPError(400, 'Invalid Form Body', 50035)
+
+        if request.query.get('wait', 'false').lower() != 'true':
+            return None
+
+        webhook_id = int(request.params['webhook'])
+        message = self._message(self._id_base, self._make_id(time.time()), payload.get('content') or '', webhook_id)
+        message['webhook_id'] = str(webhook_id)
+        message['embeds'] = payload.get('embeds') or []
+        return message
+
+    def _default_handler(self, request):
+        if request.method in ('PUT', 'DELETE'):
+            return None
+
+        payload = dict(request.json) if request.method in ('POST', 'PATCH') else {}
+        payload.setdefault('id', str(self._make_id(time.time())))
+        return payload
+
+    # --- HTTP ---------------------------------------------------------------------- #
+
+    def _match(self, method, path):
+        for route in self._routes.get(method, ()):
+            match = route.pattern.match(path)
+            if match is not None:
+                return route, {key: unquote(value) for key, value in match.groupdict().items()}
+
+        return None, None
+
+    def _get_latency(self):
+        if callable(self.latency):
+            return self.latency()
+        return self.latency
+
+    def _get_route_bucket(self, route, params):
+        limit = self.limits.get(route.endpoint, self.default_limit)
+        if limit is None:
+            return None
+
+        key = route.get_bucket(params)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(*limit)
+        return bucket
+
+    def _get_global_bucket(self, headers):
+        # Webhooks with a token don't count towards the global rate limit of a bot.
+        authorization = headers.get('authorization')
+        if self.global_limit is None or authorization is None:
+            return None
+
+        bucket = self._global_buckets.get(authorization)
+        if bucket is None:
+            bucket = self._global_buckets[authorization] = _Bucket(*self.global_limit)
+        return bucket
+
+    @staticmethod
+    def _error(status, message, code=0, **extra):
+        payload = {'message': message, 'code': code}
+        payload.update(extra)
+        return status, payload
+
+    def _rate_limited(self, retry_after, is_global=False):
+        status, payload = self._error(429, 'You are being rate limited.', retry_after=int(retry_after * 1000))
+        payload['global'] = is_global
+        return status, payload
+
+    def _process(self, request, route):
+        """Returns the status, payload and rate limit bucket of the response for a request."""
+
+        now = time.time()
+
+        global_bucket = self._get_global_bucket(request.headers)
+        if global_bucket is not None and not global_bucket.acquire(now):
+            self.stats['global_rate_limited'] += 1
+            status, payload = self._rate_limited(global_bucket.reset - now, is_global=True)
+            return status, payload, None
+
+        bucket = self._get_route_bucket(route, request.params)
+        if bucket is not None and not bucket.acquire(now):
+            self.stats['rate_limited'] += 1
+            status, payload = self._rate_limited(bucket.reset - now)
+            return status, payload, bucket
+
+        faults = self._faults[route.endpoint] or self._faults[None]
+        if faults:
+            status, retry_after = faults.popleft()
+            if status == 429:
+                self.stats['rate_limited'] += 1
+                return self._rate_limited(retry_after) + (bucket,)
+            return self._error(status, 'Scripted failure') + (bucket,)
+
+        if self._random.random() < self.error_rate:
+            return self._error(self._random.choice((500, 502, 503)), 'Internal Server Error') + (bucket,)
+
+        if self._random.random() < self.rate_limit_rate:
+            self.stats['rate_limited'] += 1
+            return self._rate_limited(self._random.uniform(0.1, 1.0)) + (bucket,)
+
+        handler = self.handlers.get(route.endpoint, self._default_handler)
+        try:
+            payload = handler(request)
+        except MockHTTPError as error:
+            return self._error(error.status, error.message, error.code) + (bucket,)
+
+        return (204 if payload is None else 200), payload, bucket
+
+    async def _handle_request(self, method, target, headers, body):
+        parts = urlsplit(target)
+        query = dict(parse_qsl(parts.query))
+
+        if parts.path == '/_mock/stats':
+            return 200, self.get_stats(), {}
+        if parts.path == '/_mock/reset':
+            self.reset()
+            return 204, None, {}
+
+        self.stats['requests'] += 1
+
+        await trio.sleep(self._get_latency())
+
+        if not parts.path.startswith(self.PREFIX):
+            return self._error(404, '404: Not Found') + ({},)
+
+        path = parts.path[len(self.PREFIX):]
+        route, params = self._match(method, path)
+        if route is None:
+            return self._error(404, '404: Not Found') + ({},)
+
+        self.route_stats[route.name] += 1
+        if 'authorization' not in headers and 'token' not in params:
+            return self._error(401, '401: Unauthorized') + ({},)
+
+        request = MockRequest(method, path, route.endpoint, params, query, headers, body)
+        status, payload, bucket = self._process(request, route)
+
+        response_headers = {}
+        if bucket is not None:
+            response_headers.update({
+                'X-RateLimit-Limit': str(bucket.limit),
+                'X-RateLimit-Remaining': str(bucket.remaining),
+                'X-RateLimit-Reset': str(math.ceil(bucket.reset)),
+                'X-RateLimit-Reset-After': '{:.3f}'.format(max(bucket.reset - time.time(), 0.0)),
+                'X-RateLimit-Bucket': route.hash,
+            })
+        if status == 429:
+            response_headers['Retry-After'] = str(math.ceil(payload['retry_after'] / 1000))
+            if payload['global']:
+                response_headers['X-RateLimit-Global'] = 'true'
+
+        if status >= 500:
+            self.stats['server_errors'] += 1
+        elif status >= 400 and status != 429:
+            self.stats['client_errors'] += 1
+
+        return status, payload, response_headers
+
+    async def _next_event(self, stream, connection):
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                connection.receive_data(await stream.receive_some(65536))
+                continue
+
+            return event
+
+    async def _send_response(self, stream, connection, status, payload, headers):
+        headers['Date'] = email.utils.formatdate(usegmt=True)
+
+        body = b''
+        if status not in (204, 304):
+            body = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+            headers['Content-Length'] = str(len(body))
+
+        data = connection.send(h11.Response(status_code=status, headers=list(headers.items())))
+        if body:
+            data += connection.send(h11.Data(data=body))
+        data += connection.send(h11.EndOfMessage())
+
+        await stream.send_all(data)
+
+    async def _handle_connection(self, stream):
+        self.stats['connections'] += 1
+        connection = h11.Connection(h11.SERVER)
+
+        try:
+            while True:
+                event = await self._next_event(stream, connection)
+                if not isinstance(event, h11.Request):
+                    break
+
+                headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in event.headers}
+                body = bytearray()
+                while True:
+                    event_ = await self._next_event(stream, connection)
+                    if isinstance(event_, h11.EndOfMessage):
+                        break
+                    body += event_.data
+
+                response = await self._handle_request(event.method.decode('ascii'), event.target.decode('ascii'),
+                                                      headers, bytes(body))
+                await self._send_response(stream, connection, *response)
+
+                if connection.our_state is h11.MUST_CLOSE:
+                    break
+                connection.start_next_cycle()
+
+        except (BrokenResourceError, trio.ClosedResourceError, h11.RemoteProtocolError) as error:
+            logger.debug('Connection closed: %s', error)
+
+        finally:
+            await stream.aclose()
+
+    async def serve(self, host='127.0.0.1', port=0, *, task_status=trio.TASK_STATUS_IGNORED):
+        """|coro|
+
+        Serves the API until cancelled. Use ``nursery.start(server.serve)`` to wait until the server is ready.
+
+        Parameters
+        ----------
+        host : str, optional
+            The host to listen on. Defaults to ``127.0.0.1``.
+        port : int, optional
+            The port to listen on. Defaults to a random free port.
+        """
+
+        listeners = await trio.open_tcp_listeners(port, host=host)
+        self.host = host
+        self.port = listeners[0].socket.getsockname()[1]
+        task_status.started(self)
+
+        await trio.serve_listeners(self._handle_connection, listeners)
+
+
+def add_arguments(parser):
+    """Adds the options of :class:`MockDiscord` to an argument parser."""
+
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds every request takes at least')
+    parser.add_argument('--jitter', type=float, default=0.0, help='additional random latency in seconds')
+    parser.add_argument('--bucket-limit', type=int, default=5, help='requests per bucket and window, 0 to disable')
+    parser.add_argument('--bucket-window', type=float, default=5.0, help='length of a bucket window in seconds')
+    parser.add_argument('--global-limit', type=int, default=50, help='requests per second over all routes, 0 to disable')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of a 5xx response')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='probability of a spurious 429 response')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the fault injection')
+
+
+def from_arguments(args):
+    """Creates a :class:`MockDiscord` from parsed arguments. See :func:`add_arguments`."""
+
+    latency = args.latency
+    if args.jitter:
+        latency = lambda: args.latency + random.uniform(0, args.jitter)
+
+    return MockDiscord(
+        latency=latency,
+        default_limit=(args.bucket_limit, args.bucket_window) if args.bucket_limit else None,
+        global_limit=(args.global_limit, 1.0) if args.global_limit else None,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs a local stand-in for the Discord REST API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = from_arguments(args)
+
+    async def run():
+        async with trio.open_nursery() as nursery:
+            await nursery.start(server.serve, args.host, args.port)
+            print('Serving the Discord API on {}'.format(server.url))
+
+    trio.run(run)
+
+
+if __name__ == '__main__':
+    main()
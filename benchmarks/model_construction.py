@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how long it takes to build the models from realistic payloads.
+
+Payloads are decoded up front, so only the time the models take to parse them is counted.
+
+.. code-block:: shell
+
+    python -m benchmarks.model_construction --count 20000
+"""
+
+import argparse
+import timeit
+
+from .model_memory import MODELS
+from .utils import format_table
+
+
+def measure(model, create_payload, count, repeat):
+    """Returns the fastest time in microseconds it took to build an instance."""
+
+    payloads = [create_payload(index) for index in range(count)]
+
+    def build():
+        for payload in payloads:
+            model(payload, None)
+
+    return min(timeit.repeat(build, number=1, repeat=repeat)) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the construction time of the models.')
+    parser.add_argument('--count', type=int, default=10000, help='the amount of instances per model and round')
+    parser.add_argument('--repeat', type=int, default=5, help='the amount of rounds to take the fastest of')
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS), help='the models to measure')
+    args = parser.parse_args()
+
+    rows = [('model', 'µs per instance')]
+    for name in args.models:
+        model, create_payload = MODELS[name]
+        rows.append((name, '{:.2f}'.format(measure(model, create_payload, args.count, args.repeat))))
+
+    print(format_table(rows))
+
+
+if __name__ == '__main__':
+    main()
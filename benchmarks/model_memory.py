@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how much memory the models take up when they are built from realistic payloads.
+
+Payloads are encoded up front and decoded while the models are built, just like gateway events,
+so only the memory the models keep afterwards is counted. This includes everything a model
+refers to that isn't shared with other models, e.g. its strings, snowflake and timestamps.
+
+.. code-block:: shell
+
+    python -m benchmarks.model_memory --count 20000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from shitcord.models import Guild, Member, Message, Role, TextChannel, User
+
+from .utils import format_table
+
+DISCORD_EPOCH = 1420070400000
+BASE_ID = 481094826489151488
+
+
+def _id(index):
+    return str(BASE_ID + (index << 22) + (index & 0xFFF))
+
+
+def _timestamp(index):
+    return '2018-08-{:02d}T{:02d}:{:02d}:{:02d}.{:06d}+00:00'.format(
+        index % 28 + 1, index % 24, index % 60, (index * 7) % 60, (index * 7919) % 1000000)
+
+
+def user_payload(index):
+    return {
+        'id': _id(index),
+        'username': 'Some User {}'.format(index),
+        'discriminator': '{:04d}'.format(index % 10000),
+        'avatar': 'a_{:032x}'.format(index * 2654435761) if index % 4 == 0 else '{:032x}'.format(index * 2654435761),
+        'bot': index % 50 == 0,
+    }
+
+
+def member_payload(index):
+    return {
+        'user': user_payload(index),
+        'nick': 'Nickname {}'.format(index) if index % 3 == 0 else None,
+        'roles': [_id(index % 20 + role) for role in range(3)],
+        'joined_at': _timestamp(index),
+        'deaf': False,
+        'mute': False,
+    }
+
+
+def role_payload(index):
+    return {
+        'id': _id(index),
+        'name': 'Role {}'.format(index),
+        'color': index * 4099 % 0xFFFFFF,
+        'hoist': index % 5 == 0,
+        'position': index % 50,
+        'permissions': 104324161,
+        'managed': False,
+        'mentionable': index % 2 == 0,
+    }
+
+
+def channel_payload(index):
+    return {
+        'id': _id(index),
+        'type': 0,
+        'guild_id': _id(1),
+        'position': index % 50,
+        'permission_overwrites': [{'id': _id(index % 20), 'type': 'role', 'allow': 1024, 'deny': 2048}],
+        'name': 'channel-{}'.format(index),
+        'topic': 'The topic of channel {}.'.format(index),
+        'nsfw': False,
+        'last_message_id': _id(index + 1000),
+        'rate_limit_per_user': 0,
+        'parent_id': None,
+    }
+
+
+def message_payload(index):
+    return {
+        'id': _id(index),
+        'channel_id': _id(index % 100),
+        'guild_id': _id(1),
+        'author': user_payload(index % 1000),
+        'content': 'This is message number {} with a bit of text, like most messages have.'.format(index),
+        'timestamp': _timestamp(index),
+        'edited_timestamp': _timestamp(index + 1) if index % 10 == 0 else None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [user_payload(index % 1000 + 1)] if index % 5 == 0 else [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+    }
+
+
+def guild_payload(index):
+    return {
+        'id': _id(index),
+        'name': 'Guild {}'.format(index),
+        'icon': '{:032x}'.format(index * 2654435761),
+        'splash': None,
+        'owner_id': _id(index + 1),
+        'region': 'eu-central',
+        'afk_channel_id': None,
+        'afk_timeout': 300,
+        'embed_enabled': False,
+        'embed_channel_id': None,
+        'verification_level': 1,
+        'default_message_notifications': 0,
+        'explicit_content_filter': 0,
+        'roles': [role_payload(index + role) for role in range(20)],
+        'emojis': [],
+        'features': [],
+        'mfa_level': 0,
+        'application_id': None,
+        'widget_enabled': False,
+        'widget_channel_id': None,
+        'system_channel_id': _id(index + 2),
+        'channels': [channel_payload(index + channel) for channel in range(10)],
+    }
+
+
+MODELS = {
+    'User': (User, user_payload),
+    'Member': (Member, member_payload),
+    'Role': (Role, role_payload),
+    'TextChannel': (TextChannel, channel_payload),
+    'Message': (Message, message_payload),
+    'Guild': (Guild, guild_payload),
+}
+
+
+def measure(model, create_payload, count):
+    """Returns the retained bytes per instance, the size of a bare instance and whether it has a ``__dict__``."""
+
+    raws = [json.dumps(create_payload(index)).encode('utf-8') for index in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [model(json.loads(raw), None) for raw in raws]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # The list that holds the instances isn't part of their cost.
+    retained = after - before - sys.getsizeof(instances)
+    return retained / count, sys.getsizeof(instances[0]), hasattr(instances[0], '__dict__')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the memory footprint of the models.')
+    parser.add_argument('--count', type=int, default=10000, help='the amount of instances per model')
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS), help='the models to measure')
+    args = parser.parse_args()
+
+    rows = [('model', 'bytes per instance | bare instance | __dict__')]
+    for name in args.models:
+        model, create_payload = MODELS[name]
+        per_instance, bare, has_dict = measure(model, create_payload, args.count)
+        rows.append((name, '{:.0f} | {} | {}'.format(per_instance, bare, 'yes' if has_dict else 'no')))
+
+    print(format_table(rows))
+
+
+if __name__ == '__main__':
+    main()
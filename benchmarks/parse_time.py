@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""Compares :func:`shitcord.utils.parse_time` with the regex splitting parser it replaced.
+
+.. code-block:: shell
+
+    python -m benchmarks.parse_time --count 100000
+"""
+
+import argparse
+import datetime
+import re
+import timeit
+
+from shitcord.utils.time import parse_time
+
+from .model_memory import _timestamp
+from .utils import format_table
+
+
+def legacy_parse_time(time):
+    if time:
+        return datetime.datetime(*map(int, re.split(r'[^\d]', time.replace('+00:00', ''))))
+    return None
+
+
+def measure(parser, timestamps, repeat):
+    """Returns the fastest time in nanoseconds it took to parse a timestamp."""
+
+    def run():
+        for timestamp in timestamps:
+            parser(timestamp)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(timestamps) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures how fast timestamps are parsed.')
+    parser.add_argument('--count', type=int, default=100000, help='the amount of timestamps per round')
+    parser.add_argument('--repeat', type=int, default=5, help='the amount of rounds to take the fastest of')
+    args = parser.parse_args()
+
+    timestamps = [_timestamp(index) for index in range(args.count)]
+
+    parsers = [
+        ('regex split (before)', legacy_parse_time),
+        ('parse_time', parse_time),
+    ]
+
+    rows = [('parser', 'ns per timestamp')]
+    for name, parse in parsers:
+        rows.append((name, '{:.0f}'.format(measure(parse, timestamps, args.repeat))))
+
+    print(format_table(rows))
+
+
+if __name__ == '__main__':
+    main()
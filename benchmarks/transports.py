@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the HTTP transports by running the throughput benchmark with each of them.
+
+Every transport gets a fresh stand-in, so rate limit buckets and statistics don't carry over.
+
+.. code-block:: shell
+
+    python -m benchmarks.transports --requests 5000 --concurrency 500 --connections 20
+"""
+
+import trio
+
+from .http_throughput import TRANSPORTS, create_parser, run
+from .mock_server import from_arguments
+from .utils import format_table
+
+
+async def compare(args):
+    results = []
+    for transport in TRANSPORTS:
+        args.transport = transport
+
+        if args.url is not None:
+            results.append(await run(args, args.url))
+            continue
+
+        server = from_arguments(args)
+        async with trio.open_nursery() as nursery:
+            await nursery.start(server.serve)
+            results.append(await run(args, server.url))
+            nursery.cancel_scope.cancel()
+
+    rows = [('transport', ' | '.join(TRANSPORTS))]
+    for index, (label, _) in enumerate(results[0][1:], 1):
+        rows.append((label, ' | '.join(str(result[index][1]) for result in results)))
+
+    print(format_table(rows))
+
+
+def main():
+    parser = create_parser('Compares the throughput of the HTTP transports.')
+    args = parser.parse_args()
+    trio.run(compare, args)
+
+
+if __name__ == '__main__':
+    main()
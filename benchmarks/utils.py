@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+__all__ = ['percentile', 'format_table']
+
+
+def percentile(values, percent):
+    """Returns the given percentile of a list of numbers using the nearest-rank method."""
+
+    if not values:
+        return float('nan')
+
+    values = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def format_table(rows):
+    """Formats a list of (label, value) pairs into aligned lines."""
+
+    width = max(len(label) for label, _ in rows)
+    return '\n'.join('{}  {}'.format(label.ljust(width), value) for label, value in rows)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .client import Client, ClientConfig
+from .message_cache import MessageCache
+from .state import State
 
-__all__ = ['Client', 'ClientConfig']
+__all__ = ['Client', 'ClientConfig', 'MessageCache', 'State']
@@ -11,6 +11,7 @@ from ..models import Activity, ActivityType, StatusType
 from ..gateway import DiscordWebSocketClient, Opcodes, _resolve_alias
 from ..http import API, ShitRequestFailed
 from ..utils import EventEmitter
+from .state import State
 
 logger = logging.getLogger('shitcord')
 
@@ -37,6 +38,16 @@ class ClientConfig:
         The logging level Shitcord should use. Defaults to ``logging.INFO``.
     session : :class:`asks.Session`, optional
         The :class:`asks.Session` the bot should use. If no session provided, the bot will create a new one.
+    transport : :class:`shitcord.http.Transport`, optional
+        The transport for the REST API, e.g. a :class:`shitcord.http.H11Transport`. Takes precedence over `session`.
+    response_cache : :class:`shitcord.http.ResponseCache`, optional
+        An optional cache for responses from read endpoints of the REST API. Disabled by default.
+    limiter : :class:`shitcord.http.Limiter`, optional
+        The rate limiter for the REST API. Use a :class:`shitcord.http.SharedLimiter` if several processes
+        share the same token. Defaults to an in-process limiter.
+    state_limits : dict, optional
+        The keyword arguments for the :class:`State` of the client, e.g. ``{'max_members': 100000}``.
+        Every entity type is cached without a limit by default.
     do_reconnect : bool, optional
         Whether the gateway client should reconnect or not. Defaults to ``True``.
     max_reconnects : int, optional
@@ -61,6 +72,12 @@ class ClientConfig:
 
     # configuration for the http client
     session = None
+    transport = None
+    response_cache = None
+    limiter = None
+
+    # configuration for the state
+    state_limits = None
 
     # configuration for the gateway client
     do_reconnect = True
@@ -97,6 +114,8 @@ class Client:
         The client configuration.
     emitter : :class:`EventEmitter`
         The main event emitter for gateway event dispatches.
+    state : :class:`State`
+        The guilds, channels, users, roles, emojis and members received from the gateway.
     api : :class:`shitcord.http.API`
         The client that wraps around the Discord REST API.
     ws : :class:`shitcord.gateway.DiscordWebSocketClient`
@@ -106,6 +125,7 @@ class Client:
     def __init__(self, config: ClientConfig):
         self.config = config
         self.emitter = EventEmitter()
+        self.state = State(**(self.config.state_limits or {}))
 
         # these attributes will be set later
         self.api = None
@@ -136,7 +156,8 @@ class Client:
         if not token:
             raise RuntimeError('No token provided.')
 
-        self.api = API(token)
+        self.api = API(token, session=self.config.session, transport=self.config.transport,
+                       response_cache=self.config.response_cache, limiter=self.config.limiter)
         # test the passed token
         try:
             # TODO: Wrap this into an object
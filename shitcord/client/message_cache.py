@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import collections
+
+__all__ = ['MessageCache']
+
+# Approximate sizes in bytes as measured by benchmarks.model_memory.
+MESSAGE_SIZE = 1000
+EMBED_SIZE = 512
+ATTACHMENT_SIZE = 400
+
+
+def estimate_size(message):
+    """Returns the approximate amount of bytes a message takes up in memory."""
+
+    return MESSAGE_SIZE + len(message.content or '') + EMBED_SIZE * len(message.embeds) + ATTACHMENT_SIZE * len(message.attachments)
+
+
+class MessageCache:
+    """Keeps the most recent messages of every channel.
+
+    Every channel has a ring buffer that holds its latest `per_channel` messages.
+    All messages are indexed by their ID. When there are more than `max_messages` messages
+    or they take up more than approximately `max_bytes` bytes, the oldest messages of
+    the channels that were least recently active are dropped first.
+
+    Messages that are updated by MESSAGE_UPDATE events are updated in place, so the cache
+    always holds the latest version. The previous one is passed to the listeners of the event.
+
+    Parameters
+    ----------
+    per_channel : int, optional
+        The maximum amount of messages per channel. Defaults to 100.
+    max_messages : int, optional
+        The maximum amount of messages across all channels. Defaults to 5000. ``None`` means no limit.
+    max_bytes : int, optional
+        The approximate maximum amount of bytes of all messages. No limit by default.
+
+    Raises
+    ------
+    ValueError
+        Will be raised if `per_channel` is less than 1.
+
+    Attributes
+    ----------
+    size : int
+        The approximate amount of bytes of the cached messages.
+    evictions : int
+        The amount of messages that were dropped to stay within the limits.
+    """
+
+    def __init__(self, *, per_channel=100, max_messages=5000, max_bytes=None):
+        if per_channel < 1:
+            raise ValueError('A channel must be able to hold at least one message.')
+
+        self.per_channel = per_channel
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+
+        self.size = 0
+        self.evictions = 0
+
+        # Maps channel IDs to ring buffers of message IDs, least recently active channel first.
+        self._channels = collections.OrderedDict()
+        # Maps message IDs to (message, size) pairs.
+        self._messages = {}
+
+    def __repr__(self):
+        return '<shitcord.MessageCache messages={} channels={} size={}>'.format(len(self._messages), len(self._channels), self.size)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __contains__(self, message_id):
+        return message_id in self._messages
+
+    @property
+    def stats(self):
+        """Returns a dict containing statistics about the cache."""
+
+        return {
+            'size': len(self._messages),
+            'bytes': self.size,
+            'channels': len(self._channels),
+            'evictions': self.evictions,
+        }
+
+    def get(self, message_id):
+        """Returns a cached :class:`shitcord.models.Message` or ``None``."""
+
+        entry = self._messages.get(int(message_id))
+        return entry[0] if entry is not None else None
+
+    def get_channel_messages(self, channel_id):
+        """Returns a list of the cached messages of a channel, oldest first."""
+
+        buffer = self._channels.get(int(channel_id), ())
+        return [self._messages[message_id][0] for message_id in buffer]
+
+    def add(self, message):
+        """Adds a message to the ring buffer of its channel."""
+
+        if message.id in self._messages:
+            self.refresh(message)
+            return
+
+        buffer = self._channels.get(message.channel_id)
+        if buffer is None:
+            buffer = self._channels[message.channel_id] = collections.deque(maxlen=self.per_channel)
+        else:
+            self._channels.move_to_end(message.channel_id)
+
+        if len(buffer) == buffer.maxlen:
+            self._discard(buffer.popleft())
+            self.evictions += 1
+
+        buffer.append(message.id)
+        size = estimate_size(message)
+        self._messages[message.id] = (message, size)
+        self.size += size
+
+        self._evict()
+
+    def refresh(self, message):
+        """Accounts for the new size of a cached message that was updated in place."""
+
+        entry = self._messages.get(message.id)
+        if entry is None:
+            return
+
+        size = estimate_size(message)
+        self._messages[message.id] = (message, size)
+        self.size += size - entry[1]
+
+        self._evict()
+
+    def pop(self, message_id):
+        """Removes a message from the cache and returns it or ``None`` if it wasn't cached."""
+
+        message = self._discard(int(message_id))
+        if message is None:
+            return None
+
+        buffer = self._channels.get(message.channel_id)
+        if buffer is not None:
+            buffer.remove(message.id)
+            if not buffer:
+                del self._channels[message.channel_id]
+
+        return message
+
+    def remove_channel(self, channel_id):
+        """Removes all messages of a channel."""
+
+        for message_id in self._channels.pop(int(channel_id), ()):
+            self._discard(message_id)
+
+    def clear(self):
+        """Removes all messages."""
+
+        self._channels.clear()
+        self._messages.clear()
+        self.size = 0
+
+    def _discard(self, message_id):
+        entry = self._messages.pop(message_id, None)
+        if entry is None:
+            return None
+
+        self.size -= entry[1]
+        return entry[0]
+
+    def _over_budget(self):
+        if self.max_messages is not None and len(self._messages) > self.max_messages:
+            return True
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def _evict(self):
+        while self._channels and self._over_budget():
+            channel_id, buffer = next(iter(self._channels.items()))
+            self._discard(buffer.popleft())
+            self.evictions += 1
+
+            if not buffer:
+                del self._channels[channel_id]
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import logging
+
+from .message_cache import MessageCache
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['State']
+
+
+class _Index:
+    """Maps IDs to models and evicts the least recently updated ones beyond `max_size`."""
+
+    __slots__ = ('items', 'max_size', 'evictions', 'on_evict')
+
+    def __init__(self, max_size, on_evict=None):
+        self.items = collections.OrderedDict()
+        self.max_size = max_size
+        self.evictions = 0
+        self.on_evict = on_evict
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key):
+        return self.items.get(key)
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+
+        if self.max_size is not None:
+            while len(self.items) > self.max_size:
+                key, value = self.items.popitem(last=False)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(key, value)
+
+    def pop(self, key):
+        return self.items.pop(key, None)
+
+    def values(self):
+        return self.items.values()
+
+
+def _replace(items, item):
+    # Keeps the order of the list, which is usually the order in the client.
+    replaced = [item if other.id == item.id else other for other in items]
+    if not any(other.id == item.id for other in items):
+        replaced.append(item)
+    return replaced
+
+
+class State:
+    """Keeps the guilds, channels, users, roles, emojis, members and messages the Discord Gateway sends.
+
+    The state is filled by the READY and GUILD_CREATE events and updated by the events that
+    create, update or delete these entities, before the listeners of an event are called.
+    Every entity can be looked up by its ID without a request to the REST API.
+
+    The channels, roles and emojis of a cached guild are kept in sync with the state.
+    Its members aren't, since a large guild has too many of them for a list. They are moved
+    into the member index instead, which leaves :attr:`shitcord.models.Guild.members` empty,
+    and :meth:`get_members` returns them.
+
+    Every index can be limited in size. Once an index is full, the entities that weren't
+    created or updated for the longest time are dropped. Limits are mostly useful for
+    users and members, which make up the bulk of the state of large bots.
+
+    Recent messages are kept in a :class:`MessageCache`. The listeners of MESSAGE_DELETE and
+    MESSAGE_DELETE_BULK events find the deleted messages in the ``message`` and ``messages``
+    attributes of the event, if they were cached.
+
+    Parameters
+    ----------
+    max_guilds : int, optional
+        The maximum amount of cached guilds. Unlimited by default.
+    max_channels : int, optional
+        The maximum amount of cached channels. Unlimited by default.
+    max_users : int, optional
+        The maximum amount of cached users. Unlimited by default.
+    max_members : int, optional
+        The maximum amount of cached members across all guilds. Unlimited by default.
+    max_roles : int, optional
+        The maximum amount of cached roles. Unlimited by default.
+    max_emojis : int, optional
+        The maximum amount of cached emojis. Unlimited by default.
+    messages_per_channel : int, optional
+        The maximum amount of cached messages per channel. Defaults to 100.
+    max_messages : int, optional
+        The maximum amount of cached messages across all channels. Defaults to 5000.
+    max_message_bytes : int, optional
+        The approximate maximum amount of bytes of all cached messages. Unlimited by default.
+
+    Attributes
+    ----------
+    user : :class:`shitcord.models.User`
+        The user of the bot. ``None`` before READY was received.
+    messages : :class:`MessageCache`
+        The cache of recent messages.
+    """
+
+    def __init__(self, *, max_guilds=None, max_channels=None, max_users=None, max_members=None, max_roles=None, max_emojis=None,
+                 messages_per_channel=100, max_messages=5000, max_message_bytes=None):
+        self.user = None
+        self.messages = MessageCache(per_channel=messages_per_channel, max_messages=max_messages, max_bytes=max_message_bytes)
+
+        self._guilds = _Index(max_guilds, self._evict_guild)
+        self._channels = _Index(max_channels)
+        self._users = _Index(max_users)
+        self._members = _Index(max_members, self._evict_member)
+        self._roles = _Index(max_roles)
+        self._emojis = _Index(max_emojis)
+
+        # Maps guild IDs to dicts mapping user IDs to members.
+        self._guild_members = collections.defaultdict(dict)
+
+        self._handlers = {
+            'ready': self._handle_ready,
+            'channel_create': self._handle_channel_create,
+            'channel_update': self._handle_channel_update,
+            'channel_delete': self._handle_channel_delete,
+            'guild_create': self._handle_guild_create,
+            'guild_update': self._handle_guild_update,
+            'guild_delete': self._handle_guild_delete,
+            'guild_emojis_update': self._handle_guild_emojis_update,
+            'guild_member_add': self._handle_guild_member_add,
+            'guild_member_remove': self._handle_guild_member_remove,
+            'guild_member_update': self._handle_guild_member_update,
+            'guild_members_chunk': self._handle_guild_members_chunk,
+            'guild_role_create': self._handle_guild_role_update,
+            'guild_role_update': self._handle_guild_role_update,
+            'guild_role_delete': self._handle_guild_role_delete,
+            'message_create': self._handle_message_create,
+            'message_update': self._handle_message_update,
+            'message_delete': self._handle_message_delete,
+            'message_delete_bulk': self._handle_message_delete_bulk,
+        }
+
+    def __repr__(self):
+        return '<shitcord.State guilds={} channels={} users={} members={}>'.format(
+            len(self._guilds), len(self._channels), len(self._users), len(self._members))
+
+    @property
+    def stats(self):
+        """Returns a dict containing the amount of cached and evicted entities per index."""
+
+        indexes = {
+            'guilds': self._guilds,
+            'channels': self._channels,
+            'users': self._users,
+            'members': self._members,
+            'roles': self._roles,
+            'emojis': self._emojis,
+        }
+
+        stats = {name: {'size': len(index), 'evictions': index.evictions} for name, index in indexes.items()}
+        stats['messages'] = self.messages.stats
+        return stats
+
+    @property
+    def guilds(self):
+        """Returns a list of all cached guilds."""
+
+        return list(self._guilds.values())
+
+    def get_guild(self, guild_id):
+        """Returns a cached :class:`shitcord.models.Guild` or ``None``.
+
+        Guilds that are unavailable due to an outage are :class:`shitcord.models.PartialGuild` objects.
+        """
+
+        return self._guilds.get(int(guild_id))
+
+    def get_channel(self, channel_id):
+        """Returns a cached guild or private channel or ``None``."""
+
+        return self._channels.get(int(channel_id))
+
+    def get_user(self, user_id):
+        """Returns a cached :class:`shitcord.models.User` or ``None``."""
+
+        return self._users.get(int(user_id))
+
+    def get_role(self, role_id):
+        """Returns a cached :class:`shitcord.models.Role` or ``None``."""
+
+        return self._roles.get(int(role_id))
+
+    def get_emoji(self, emoji_id):
+        """Returns a cached :class:`shitcord.models.Emoji` or ``None``."""
+
+        return self._emojis.get(int(emoji_id))
+
+    def get_member(self, guild_id, user_id):
+        """Returns a cached :class:`shitcord.models.Member` of a guild or ``None``."""
+
+        return self._members.get((int(guild_id), int(user_id)))
+
+    def get_members(self, guild_id):
+        """Returns a list of the cached members of a guild."""
+
+        return list(self._guild_members.get(int(guild_id), {}).values())
+
+    def get_message(self, message_id):
+        """Returns a cached :class:`shitcord.models.Message` or ``None``."""
+
+        return self.messages.get(message_id)
+
+    def apply(self, event, parsed, http):
+        """Updates the state with a dispatched Gateway event.
+
+        Parameters
+        ----------
+        event : str
+            The name of the event, e.g. ``guild_create``.
+        parsed
+            The event as returned by :func:`shitcord.gateway.parse_event`.
+        http : :class:`shitcord.http.API`
+            The API the models of the state should use.
+        """
+
+        handler = self._handlers.get(event)
+        if handler is not None:
+            handler(parsed, http)
+
+    def clear(self):
+        """Removes everything from the state, e.g. when a new session starts."""
+
+        for index in (self._guilds, self._channels, self._users, self._members, self._roles, self._emojis):
+            index.items.clear()
+        self._guild_members.clear()
+        self.messages.clear()
+
+    # Indexing
+
+    def _put_channel(self, channel):
+        self._channels.put(channel.id, channel)
+
+    def _put_member(self, guild_id, member):
+        member.guild_id = guild_id
+        self._members.put((guild_id, member.id), member)
+        self._guild_members[guild_id][member.id] = member
+
+        # A member is a user as well and the most recently received one is the most accurate.
+        self._users.put(member.id, member)
+
+    def _remove_member(self, guild_id, user_id):
+        self._members.pop((guild_id, user_id))
+        self._evict_member((guild_id, user_id), None)
+
+    def _evict_member(self, key, _):
+        guild_id, user_id = key
+        members = self._guild_members.get(guild_id)
+        if members is not None:
+            members.pop(user_id, None)
+
+    def _put_guild(self, guild):
+        self._guilds.put(guild.id, guild)
+
+        for channel in guild.channels:
+            self._put_channel(channel)
+        for role in guild.roles:
+            self._roles.put(role.id, role)
+        for emoji in guild.emojis:
+            self._emojis.put(emoji.id, emoji)
+
+    def _remove_guild(self, guild_id, *, messages=False):
+        self._evict_guild(guild_id, self._guilds.pop(guild_id), messages=messages)
+
+    def _evict_guild(self, guild_id, guild, *, messages=True):
+        if not isinstance(guild, models.Guild):
+            return
+
+        for channel in guild.channels:
+            self._channels.pop(channel.id)
+            if messages:
+                self.messages.remove_channel(channel.id)
+        for role in guild.roles:
+            self._roles.pop(role.id)
+        for emoji in guild.emojis:
+            self._emojis.pop(emoji.id)
+        for user_id in self._guild_members.pop(guild_id, {}):
+            self._members.pop((guild_id, user_id))
+
+    # Event handlers
+
+    def _handle_ready(self, data, http):
+        self.clear()
+        self.user = models.User(data['user'], http)
+        self._users.put(self.user.id, self.user)
+
+        # Guilds are unavailable until their GUILD_CREATE arrives.
+        for guild in data.get('guilds', []):
+            self._guilds.put(int(guild['id']), models.PartialGuild(guild, http))
+
+        for channel in data.get('private_channels', []):
+            self._put_channel(models._channel_from_payload(channel, http))
+
+    def _handle_guild_create(self, guild, _):
+        if guild.id in self._guilds.items:
+            self._remove_guild(guild.id)
+
+        self._put_guild(guild)
+        for member in guild.members:
+            self._put_member(guild.id, member)
+        guild.members = []
+
+        logger.debug('Cached guild %s with %s channels and %s members.', guild.id, len(guild.channels), len(self._guild_members[guild.id]))
+
+    def _handle_guild_update(self, event, _):
+        guild = event.after
+        if event.before is not None:
+            # The cached guild was updated in place.
+            self._guilds.put(guild.id, guild)
+        elif guild is not None:
+            self._put_guild(guild)
+
+    def _handle_guild_delete(self, guild, _):
+        # A guild that is affected by an outage will be sent again once it is available, so its messages are kept.
+        self._remove_guild(guild.id, messages=not guild.unavailable)
+
+        if guild.unavailable:
+            self._guilds.put(guild.id, guild)
+
+    def _handle_channel_create(self, channel, _):
+        self._put_channel(channel)
+
+        guild = self._guilds.get(getattr(channel, 'guild_id', None))
+        if isinstance(guild, models.Guild):
+            guild.channels = _replace(guild.channels, channel)
+
+    def _handle_channel_update(self, event, http):
+        if event.before is not None:
+            self._put_channel(event.after)
+        elif event.after is not None:
+            self._handle_channel_create(event.after, http)
+
+    def _handle_channel_delete(self, channel, _):
+        self._channels.pop(channel.id)
+        self.messages.remove_channel(channel.id)
+
+        guild = self._guilds.get(getattr(channel, 'guild_id', None))
+        if isinstance(guild, models.Guild):
+            guild.channels = [other for other in guild.channels if other.id != channel.id]
+
+    def _handle_guild_emojis_update(self, event, _):
+        guild = self._guilds.get(event.guild_id)
+        if isinstance(guild, models.Guild):
+            for emoji in guild.emojis:
+                self._emojis.pop(emoji.id)
+            guild.emojis = event.emojis
+
+        for emoji in event.emojis:
+            self._emojis.put(emoji.id, emoji)
+
+    def _handle_guild_member_add(self, member, _):
+        guild_id = int(member.guild_id)
+        self._put_member(guild_id, member)
+
+        guild = self._guilds.get(guild_id)
+        if isinstance(guild, models.Guild) and guild.member_count is not None:
+            guild.member_count += 1
+
+    def _handle_guild_member_remove(self, event, _):
+        guild_id = int(event.guild_id)
+        self._remove_member(guild_id, event.user.id)
+
+        guild = self._guilds.get(guild_id)
+        if isinstance(guild, models.Guild) and guild.member_count:
+            guild.member_count -= 1
+
+    def _handle_guild_member_update(self, event, _):
+        if event.after is not None:
+            self._put_member(int(event.data['guild_id']), event.after)
+
+    def _handle_guild_members_chunk(self, event, _):
+        for member in event.members:
+            self._put_member(event.guild_id, member)
+
+    def _handle_guild_role_update(self, event, _):
+        role = event.role
+        self._roles.put(role.id, role)
+
+        guild = self._guilds.get(event.guild_id)
+        if isinstance(guild, models.Guild):
+            guild.roles = _replace(guild.roles, role)
+
+    def _handle_guild_role_delete(self, event, _):
+        self._roles.pop(event.role_id)
+
+        guild = self._guilds.get(event.guild_id)
+        if isinstance(guild, models.Guild):
+            guild.roles = [role for role in guild.roles if role.id != event.role_id]
+
+    def _handle_message_create(self, message, _):
+        self.messages.add(message)
+
+    def _handle_message_update(self, event, _):
+        if event.before is not None:
+            # The cached message was updated in place, but its size may have changed.
+            self.messages.refresh(event.after)
+
+    def _handle_message_delete(self, event, _):
+        event.message = self.messages.pop(event.id)
+
+    def _handle_message_delete_bulk(self, event, _):
+        messages = (self.messages.pop(message_id) for message_id in event.ids)
+        event.messages = [message for message in messages if message is not None]
@@ -88,6 +88,8 @@ class DiscordWebSocketClient(WebSocketClient):
         A rate limiter for the Discord Gateway.
     emitter : :class:`EventEmitter`
         An event emitter for emitting received gateway events.
+    state : :class:`shitcord.client.State`
+        The state that is updated with received gateway events.
     token : str
         The bot token.
     """
@@ -148,6 +150,7 @@ class DiscordWebSocketClient(WebSocketClient):
 
         cls.api = client.api
         cls.emitter = client.emitter
+        cls.state = client.state
         cls.token = client.api.token
 
         return cls(*gateway_data, **client.config.to_dict())
@@ -237,9 +240,15 @@ class DiscordWebSocketClient(WebSocketClient):
         if event == 'ready':
             self.session_id = payload['session_id']
 
-        # TODO: Caching & Updating already cached models.
+        cache = self.api.http.cache
+        if cache is not None:
+            cache.invalidate_event(event, payload)
 
-        name, handler = parse_event(event, payload, self.api.get_api())
+        api = self.api.get_api()
+        name, handler = parse_event(event, payload, api, self.state)
+
+        # Listeners should see the state with the event applied.
+        self.state.apply(name, handler, api)
 
         await self.emitter.emit(name, handler)
 
@@ -2,6 +2,6 @@
 
 from .event_models import *
 from .parser import parse_event, _resolve_alias
-from .parsers import ModelParser, NullParser
+from .parsers import ModelParser, NullParser, UpdateParser
 
-__all__ = ['parse_event', '_resolve_alias', 'ModelParser', 'NullParser']
+__all__ = ['parse_event', '_resolve_alias', 'ModelParser', 'NullParser', 'UpdateParser']
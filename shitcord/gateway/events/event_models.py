@@ -1,26 +1,32 @@
 # -*- coding: utf-8 -*-
 
+import datetime
+
 from ...utils import parse_time
 
 from ... import models
 
 
 class MessageDelete:
-    __slots__ = ('id', 'channel_id', 'guild_id')
+    __slots__ = ('id', 'channel_id', 'guild_id', 'message')
 
     def __init__(self, data, _):
-        self.id = data['id']
+        self.id = int(data['id'])
         self.channel_id = int(data['channel_id'])
         self.guild_id = int(data['guild_id']) if data.get('guild_id') else None
+        # The deleted message if it was cached.
+        self.message = None
 
 
 class MessageDeleteBulk:
-    __slots__ = ('ids', 'channel_id', 'guild_id')
+    __slots__ = ('ids', 'channel_id', 'guild_id', 'messages')
 
     def __init__(self, data, _):
         self.ids = [int(id) for id in data['ids']]
         self.channel_id = int(data['channel_id'])
         self.guild_id = int(data['guild_id']) if data.get('guild_id') else None
+        # The deleted messages that were cached.
+        self.messages = []
 
 
 class MessageReaction:
@@ -62,7 +68,8 @@ class TypingStart:
         self.channel_id = data['channel_id']
         self.guild_id = int(data['guild_id']) if data.get('guild_id') else None
         self.user_id = data['user_id']
-        self.timestamp = parse_time(data['timestamp'])
+        # Unlike everywhere else, this is a Unix timestamp in seconds.
+        self.timestamp = datetime.datetime.fromtimestamp(data['timestamp'], datetime.timezone.utc)
 
 
 class VoiceServerUpdate:
@@ -102,7 +109,7 @@ class GuildBanRemove:
     __slots__ = ('guild_id', 'user')
 
     def __init__(self, data, http):
-        self.guild_id = int(data['guild.id'])
+        self.guild_id = int(data['guild_id'])
         self.user = models.User(data['user'], http)
 
 
@@ -110,7 +117,7 @@ class GuildEmojisUpdate:
     __slots__ = ('guild_id', 'emojis')
 
     def __init__(self, data, http):
-        self.guild_id = int(data['guild.id'])
+        self.guild_id = int(data['guild_id'])
         self.emojis = [models.Emoji(self.guild_id, emoji, http) for emoji in data['emojis']]
 
 
@@ -129,14 +136,20 @@ class GuildMemberRemove:
         self.user = models.User(data['user'], http)
 
 
-class GuildMemberUpdate:
-    __slots__ = ('guild_id', 'roles', 'user', 'nick')
+class ModelUpdate:
+    """The event of a model that was updated.
 
-    def __init__(self, data, http):
-        self.guild_id = data['guild_id']
-        self.roles = [int(role_id) for role_id in data.get('roles', [])]
-        self.user = models.User(data['user'], http)
-        self.nick = data['nick']
+    `before` is a shallow copy of the cached model before the update or ``None`` if it wasn't cached.
+    `after` is the updated model or ``None`` if it wasn't cached and the payload was partial.
+    `data` is the raw payload that only contains the changed fields of partial updates.
+    """
+
+    __slots__ = ('before', 'after', 'data')
+
+    def __init__(self, before, after, data):
+        self.before = before
+        self.after = after
+        self.data = data
 
 
 class GuildMembersChunk:
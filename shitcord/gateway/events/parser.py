@@ -1,9 +1,30 @@
 # -*- coding: utf-8 -*-
 
 from .event_models import *
-from .parsers import ModelParser, NullParser
+from .parsers import ModelParser, NullParser, UpdateParser
 from ... import models
 
+
+def _cached_channel(state, data):
+    channel = state.get_channel(data['id'])
+    if channel is not None and channel.type == data.get('type'):
+        return channel
+    return None
+
+
+def _cached_guild(state, data):
+    guild = state.get_guild(data['id'])
+    return guild if isinstance(guild, models.Guild) else None
+
+
+def _cached_message(state, data):
+    return state.get_message(data['id'])
+
+
+def _cached_member(state, data):
+    return state.get_member(data['guild_id'], data['user']['id'])
+
+
 event_parsers = dict(
     # Gateway stuff
     hello=NullParser(),
@@ -13,21 +34,21 @@ event_parsers = dict(
 
     # Channel stuff
     channel_create=ModelParser(models._channel_from_payload),
-    channel_update=ModelParser(models._channel_from_payload),
+    channel_update=UpdateParser(models._channel_from_payload, _cached_channel),
     channel_delete=ModelParser(models._channel_from_payload),
     channel_pins_update=ModelParser(ChannelPinsUpdate),
 
     # Guild stuff
     guild_create=ModelParser(models.Guild),
-    guild_update=ModelParser(models.Guild),
-    guild_delete=ModelParser(models.Guild),
+    guild_update=UpdateParser(models.Guild, _cached_guild),
+    guild_delete=ModelParser(models.PartialGuild),
     guild_ban_add=ModelParser(GuildBanAdd),
     guild_ban_remove=ModelParser(GuildBanRemove),
     guild_emojis_update=ModelParser(GuildEmojisUpdate),
     guild_integrations_update=ModelParser(GuildIntegrationsUpdate),
     guild_member_add=ModelParser(models.Member),
     guild_member_remove=ModelParser(GuildMemberRemove),
-    guild_member_update=ModelParser(GuildMemberUpdate),
+    guild_member_update=UpdateParser(models.Member, _cached_member),
     guild_members_chunk=ModelParser(GuildMembersChunk),
     guild_role_create=ModelParser(GuildRoleCreate),
     guild_role_update=ModelParser(GuildRoleUpdate),
@@ -35,7 +56,7 @@ event_parsers = dict(
 
     # Message stuff
     message_create=ModelParser(models.Message),
-    message_update=ModelParser(models.Message),
+    message_update=UpdateParser(models.Message, _cached_message),
     message_delete=ModelParser(MessageDelete),
     message_delete_bulk=ModelParser(MessageDeleteBulk),
     message_reaction_add=ModelParser(MessageReaction),
@@ -74,9 +95,9 @@ def _resolve_alias(event):
     return event
 
 
-def parse_event(event, data, http):
+def parse_event(event, data, http, state=None):
     real_event = _resolve_alias(event)
     if real_event not in event_parsers:
         return
 
-    return real_event, event_parsers[real_event].parse(data, http)
+    return real_event, event_parsers[real_event].parse(data, http, state)
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import copy
 from abc import ABC, abstractmethod
 
+from .event_models import ModelUpdate
+
 
 class Parser(ABC):
     @abstractmethod
-    def parse(self, data, http):
+    def parse(self, data, http, state=None):
         pass
 
 
@@ -13,10 +16,41 @@ class ModelParser(Parser):
     def __init__(self, model):
         self.model = model
 
-    def parse(self, data, http):
+    def parse(self, data, http, state=None):
         return self.model(data, http)
 
 
 class NullParser(Parser):
-    def parse(self, data, http):
+    def parse(self, data, http, state=None):
         return data
+
+
+class UpdateParser(Parser):
+    """Merges the payload of an update event into the cached model it belongs to.
+
+    `lookup` is called with the state and the payload and returns the cached model or ``None``.
+    The previous values are kept in a shallow copy, which is cheap since updates rebind attributes.
+    Models that aren't cached are created from the payload, if it is complete enough.
+    """
+
+    def __init__(self, model, lookup=None):
+        self.model = model
+        self.lookup = lookup
+
+    def parse(self, data, http, state=None):
+        cached = None
+        if state is not None and self.lookup is not None:
+            cached = self.lookup(state, data)
+
+        if cached is None:
+            try:
+                after = self.model(data, http)
+            except (KeyError, TypeError):
+                # Partial payloads, e.g. embed unfurls, can't become a model on their own.
+                # Missing nested objects like the author of a message show up as TypeError.
+                after = None
+            return ModelUpdate(None, after, data)
+
+        before = copy.copy(cached)
+        cached._update(data)
+        return ModelUpdate(before, cached, data)
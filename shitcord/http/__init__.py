@@ -1,10 +1,26 @@
 # -*- coding: utf-8 -*-
 
 from .api import API
-from .errors import ShitRequestFailed
+from .bulk import BulkOperation
+from .cache import ResponseCache
+from .cassette import Cassette
+from .cdn import CDNClient
+from .circuit import CircuitBreaker
+from .coalesce import RequestCoalescer
+from .errors import CassetteError, CDNError, CircuitOpen, ShitRequestFailed
 from .http import HTTP
+from .iterators import *
+from .metrics import Histogram, HTTPMetrics, RouteMetrics
+from .multipart import MultipartWriter
+from .priority import Priority, request_priority
+from .purge import ChannelPurge, PurgePlanner
 from .rate_limit import CooldownBucket, Limiter
 from .rest_shit import *
-from .routes import Endpoints
+from .send_queue import MessageQueue
+from .retry import RetryPolicy
+from .shared_limiter import LimiterCoordinator, SharedLimiter
+from .routes import Endpoints, Methods, Route
+from .transport import AsksTransport, H11Transport, Response, Transport
+from .webhook_client import WebhookClient
 
 __all__ = ['RESTShit', 'rest_shit']
@@ -7,6 +7,10 @@ from contextlib import contextmanager
 import contextvars
 
 from .http import HTTP
+from .iterators import AuditLogIterator, GuildIterator, HistoryIterator, MemberIterator, ReactionIterator
+from .multipart import MultipartWriter
+from .priority import get_request_priority, Priority
+from .purge import ChannelPurge
 from .routes import Endpoints
 from .. import models
 
@@ -18,10 +22,25 @@ def optional(**kwargs):
 
 
 class API:
-    """This class represents a wrapper for all endpoints of the Discord REST API."""
-
-    def __init__(self, token):
-        self.http = HTTP(token)
+    """This class represents a wrapper for all endpoints of the Discord REST API.
+
+    Parameters
+    ----------
+    token : str
+        The token to authorize requests with.
+    http : :class:`shitcord.http.HTTP`, optional
+        An already existing HTTP client to share. If given, `token` and any other keyword arguments are ignored.
+    priority : :class:`shitcord.http.Priority`, optional
+        The default priority of the requests made through this instance. Requests within
+        :func:`shitcord.http.request_priority` use the priority given there instead.
+        Defaults to :attr:`Priority.NORMAL`.
+    kwargs
+        Keyword arguments that are passed to the :class:`shitcord.http.HTTP` client.
+    """
+
+    def __init__(self, token=None, *, http=None, priority=Priority.NORMAL, **kwargs):
+        self.http = http or HTTP(token, **kwargs)
+        self.priority = Priority(priority)
         self._storage = contextvars.ContextVar('_storage', default=[])
 
     @property
@@ -29,6 +48,10 @@ class API:
         return self.http._token
 
     async def make_request(self, route, fmt=None, **kwargs):
+        if kwargs.get('priority') is None:
+            priority = get_request_priority()
+            kwargs['priority'] = priority if priority is not None else self.priority
+
         response = await self.http.make_request(route, fmt, **kwargs)
         self._capture_response(response)
 
@@ -52,17 +75,39 @@ class API:
         finally:
             self._storage.set([])
 
-    def get_api(self):
+    def get_api(self, *, priority=None):
         """Returns a new instance of :class:`API`.
 
         The main reason for this is to not pass cached response data to the models.
+        The new instance shares the HTTP client, so rate limits and in-flight requests
+        are still tracked in one place. It has the same default priority unless another one is given.
         """
 
-        return API(self.token)
+        return API(http=self.http, priority=self.priority if priority is None else priority)
 
     # --- Channel ------------------------------------------------------------------- #
 
-    async def create_message(self, channel_id, content=None, nonce=None, tts=False, files=None, embed=None):
+    async def get_channel_messages(self, channel_id, around=None, before=None, after=None, limit=None):
+        params = optional(**{
+            'around': around,
+            'before': before,
+            'after': after,
+            'limit': limit,
+        })
+
+        messages = await self.make_request(Endpoints.GET_CHANNEL_MESSAGES, dict(channel=channel_id), params=params)
+        return [models.Message(message, self.get_api()) for message in messages]
+
+    def iter_channel_messages(self, channel_id, *, limit=100, before=None, after=None, prefetch=1):
+        """Returns a :class:`shitcord.http.HistoryIterator` over the messages of a channel."""
+
+        return HistoryIterator(self, channel_id, limit=limit, before=before, after=after, prefetch=prefetch)
+
+    async def get_channel_message(self, channel_id, message_id):
+        message = await self.make_request(Endpoints.GET_CHANNEL_MESSAGE, dict(channel=channel_id, message=message_id))
+        return models.Message(message, self.get_api())
+
+    async def create_message(self, channel_id, content=None, nonce=None, tts=False, files=None, embed=None, progress=None):
         payload = {
             'tts': tts,
         }
@@ -77,22 +122,85 @@ class API:
             payload['nonce'] = nonce
 
         if files:
+            body = MultipartWriter(progress=progress)
+            body.add_field('payload_json', json.dumps(payload), content_type='application/json')
+
             if len(files) == 1:
-                attachments = {
-                    'file': tuple(files[0]),
-                }
+                body.add_file('file', files[0])
             else:
-                attachments = {
-                    'file{}'.format(index): tuple(file) for index, file in enumerate(files)
-                }
+                for index, file in enumerate(files):
+                    body.add_file('file{}'.format(index), file)
 
             message = await self.make_request(Endpoints.CREATE_MESSAGE, dict(channel=channel_id),
-                                              files=attachments, data={'payload_json': json.dumps(payload)})
+                                              data=body, headers={'Content-Type': body.content_type})
             return models.Message(message, self.get_api())
 
         message = await self.make_request(Endpoints.CREATE_MESSAGE, dict(channel=channel_id), json=payload)
         return models.Message(message, self.get_api())
 
+    async def delete_message(self, channel_id, message_id, reason=None):
+        return await self.make_request(Endpoints.DELETE_MESSAGE, dict(channel=channel_id, message=message_id), reason=reason)
+
+    async def bulk_delete_messages(self, channel_id, message_ids, reason=None):
+        payload = {
+            'messages': [str(message_id) for message_id in message_ids],
+        }
+
+        return await self.make_request(Endpoints.BULK_DELETE_MESSAGES, dict(channel=channel_id), json=payload, reason=reason)
+
+    def purge_channel(self, channel_id, **kwargs):
+        """Returns a :class:`shitcord.http.ChannelPurge` that deletes the messages of a channel."""
+
+        return ChannelPurge(self, channel_id, **kwargs)
+
+    async def get_reactions(self, channel_id, message_id, emoji, before=None, after=None, limit=None):
+        users = await self.make_request(
+            Endpoints.GET_REACTIONS,
+            dict(channel=channel_id, message=message_id, emoji=emoji),
+            params=optional(before=before, after=after, limit=limit)
+        )
+        return [models.User(user, self.get_api()) for user in users]
+
+    def iter_reactions(self, channel_id, message_id, emoji, *, limit=None, after=None, prefetch=1):
+        """Returns a :class:`shitcord.http.ReactionIterator` over the users that reacted to a message."""
+
+        return ReactionIterator(self, channel_id, message_id, emoji, limit=limit, after=after, prefetch=prefetch)
+
+    # --- Guild --------------------------------------------------------------------- #
+
+    async def list_guild_members(self, guild_id, limit=None, after=None):
+        members = await self.make_request(Endpoints.LIST_GUILD_MEMBERS, dict(guild=guild_id), params=optional(limit=limit, after=after))
+        return [models.Member(member, self.get_api()) for member in members]
+
+    def iter_guild_members(self, guild_id, *, limit=None, after=None, prefetch=1):
+        """Returns a :class:`shitcord.http.MemberIterator` over the members of a guild."""
+
+        return MemberIterator(self, guild_id, limit=limit, after=after, prefetch=prefetch)
+
+    async def get_guild_bans(self, guild_id):
+        bans = await self.make_request(Endpoints.GET_GUILD_BANS, dict(guild=guild_id))
+        return [(ban['reason'], models.User(ban['user'], self.get_api())) for ban in bans]
+
+    async def add_guild_member_role(self, guild_id, member_id, role_id, reason=None):
+        return await self.make_request(Endpoints.ADD_GUILD_MEMBER_ROLE, dict(guild=guild_id, member=member_id, role=role_id), reason=reason)
+
+    async def remove_guild_member_role(self, guild_id, member_id, role_id, reason=None):
+        return await self.make_request(Endpoints.REMOVE_GUILD_MEMBER_ROLE, dict(guild=guild_id, member=member_id, role=role_id), reason=reason)
+
+    async def remove_guild_member(self, guild_id, member_id, reason=None):
+        return await self.make_request(Endpoints.REMOVE_GUILD_MEMBER, dict(guild=guild_id, member=member_id), reason=reason)
+
+    async def create_guild_ban(self, guild_id, user_id, delete_message_days=None, reason=None):
+        params = optional(**{
+            'delete-message-days': delete_message_days,
+            'reason': reason,
+        })
+
+        return await self.make_request(Endpoints.CREATE_GUILD_BAN, dict(guild=guild_id, user=user_id), params=params, reason=reason)
+
+    async def remove_guild_ban(self, guild_id, user_id, reason=None):
+        return await self.make_request(Endpoints.REMOVE_GUILD_BAN, dict(guild=guild_id, user=user_id), reason=reason)
+
     # --- Audit Log ----------------------------------------------------------------- #
 
     async def get_guild_audit_log(self, guild_id, user_id=None, action_type=None, before=None, after=None):
@@ -106,6 +214,11 @@ class API:
         entries = await self.make_request(Endpoints.GET_GUILD_AUDIT_LOG, dict(guild=guild_id), params=params)
         return entries  # TODO: Audit Log model
 
+    def iter_guild_audit_log(self, guild_id, *, user_id=None, action_type=None, limit=100, before=None, prefetch=1):
+        """Returns a :class:`shitcord.http.AuditLogIterator` over the entries of a guild's audit log."""
+
+        return AuditLogIterator(self, guild_id, user_id=user_id, action_type=action_type, limit=limit, before=before, prefetch=prefetch)
+
     # --- Emoji --------------------------------------------------------------------- #
 
     async def list_guild_emojis(self, guild_id):
@@ -165,7 +278,11 @@ class API:
     async def get_current_user_guilds(self, before=None, after=None, limit=None):
         guilds = await self.make_request(Endpoints.GET_CURRENT_USER_GUILDS, params=optional(before=before, after=after, limit=limit))
         return [models.PartialGuild(guild, self.get_api()) for guild in guilds]
-        pass
+
+    def iter_current_user_guilds(self, *, limit=None, before=None, after=None, prefetch=1):
+        """Returns a :class:`shitcord.http.GuildIterator` over the guilds of the current user."""
+
+        return GuildIterator(self, limit=limit, before=before, after=after, prefetch=prefetch)
 
     async def leave_guild(self, guild_id):
         return await self.make_request(Endpoints.LEAVE_GUILD, dict(guild=guild_id))
@@ -247,7 +364,7 @@ class API:
             Endpoints.EXECUTE_WEBHOOK,
             dict(webhook=webhook_id, token=webhook_token),
             json=optional(**data),
-            params={'wait': wait}
+            **({'params': {'wait': 'true'}} if wait else {})
         )
 
         if wait:
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import time
+
+import trio
+
+from .priority import Priority, request_priority
+from .routes import Endpoints
+from .window import RateLimitWindow
+from ..utils.compat import CancelScope
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['BulkOperation']
+
+
+class BulkOperation:
+    """Performs the same request for a lot of targets as fast as the rate limits allow.
+
+    All requests of an operation go to the same rate limit bucket. The operation starts with
+    a single request to learn the bucket's limits from the :class:`shitcord.http.Limiter` and
+    from then on keeps as many requests in flight as the current rate limit window has left.
+    Requests are counted against the window when they are started, so concurrent requests
+    don't exhaust the bucket before their responses arrive.
+
+    Failed requests don't stop the operation. They are collected in :attr:`failed` instead.
+
+    When a checkpoint file is given, the IDs of the finished targets are written to it every
+    few seconds and when the operation stops, even if it was cancelled. Running an operation
+    with the same checkpoint again skips these targets.
+
+    .. code-block:: python3
+
+        operation = BulkOperation.add_role(api, guild_id, role_id, member_ids, checkpoint='raid.json')
+        await operation.run()
+        print(operation.succeeded, operation.failed)
+
+    Parameters
+    ----------
+    api : :class:`shitcord.http.API`
+        The API client to make the requests with.
+    route : tuple
+        The endpoint all requests are made to.
+    fmt : dict
+        The parameters of `route` that are the same for all targets.
+    call : Callable
+        A coroutine function that takes a target ID and makes the request for it.
+    targets : Iterable
+        The IDs of the targets or objects with an ``id`` attribute. Consumed lazily,
+        so this can be a generator or an asynchronous iterable as well.
+    max_concurrency : int, optional
+        The maximum amount of requests in flight, regardless of the rate limits. Defaults to 50.
+    checkpoint : str, optional
+        The path of a file to store the progress in.
+    checkpoint_interval : float, optional
+        The seconds between writes of the checkpoint file. Defaults to 5.
+    progress : Callable, optional
+        Called with the amount of finished targets and the total amount of targets,
+        or ``None`` if `targets` has no length, after every request.
+    priority : :class:`shitcord.http.Priority`, optional
+        The priority of the requests. Defaults to :attr:`Priority.BULK`, so the operation
+        doesn't hold up other requests to the same bucket.
+
+    Attributes
+    ----------
+    succeeded : int
+        The amount of targets the request succeeded for.
+    failed : dict
+        A dict mapping the IDs of targets the request failed for to the exception it raised, e.g.
+        :class:`shitcord.http.ShitRequestFailed` or :class:`shitcord.http.CircuitOpen`.
+    skipped : int
+        The amount of targets that were skipped because they were finished according to the checkpoint.
+    """
+
+    def __init__(self, api, route, fmt, call, targets, *, max_concurrency=50, checkpoint=None, checkpoint_interval=5.0, progress=None,
+                 priority=Priority.BULK):
+        self.api = api
+        # Only major parameters make up the bucket, so the target-specific ones can be left out.
+        self.bucket = api.http.get_bucket(route, fmt)
+        self.call = call
+        self.targets = targets
+        self.total = len(targets) if hasattr(targets, '__len__') else None
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.progress = progress
+        self.priority = priority
+
+        self.succeeded = 0
+        self.failed = {}
+        self.skipped = 0
+
+        self._finished = set()
+        self._window = RateLimitWindow()
+        self._capacity = trio.CapacityLimiter(max_concurrency)
+        self._cancel_scope = None
+        self._last_save = 0.0
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load_checkpoint()
+
+    def __repr__(self):
+        return '<shitcord.http.BulkOperation bucket={0.bucket} succeeded={0.succeeded} failed={1}>'.format(self, len(self.failed))
+
+    @classmethod
+    def add_role(cls, api, guild_id, role_id, member_ids, *, reason=None, **kwargs):
+        """Creates an operation that adds a role to members."""
+
+        async def call(member_id):
+            await api.add_guild_member_role(guild_id, member_id, role_id, reason=reason)
+
+        return cls(api, Endpoints.ADD_GUILD_MEMBER_ROLE, dict(guild=guild_id), call, member_ids, **kwargs)
+
+    @classmethod
+    def remove_role(cls, api, guild_id, role_id, member_ids, *, reason=None, **kwargs):
+        """Creates an operation that removes a role from members."""
+
+        async def call(member_id):
+            await api.remove_guild_member_role(guild_id, member_id, role_id, reason=reason)
+
+        return cls(api, Endpoints.REMOVE_GUILD_MEMBER_ROLE, dict(guild=guild_id), call, member_ids, **kwargs)
+
+    @classmethod
+    def kick(cls, api, guild_id, member_ids, *, reason=None, **kwargs):
+        """Creates an operation that kicks members."""
+
+        async def call(member_id):
+            await api.remove_guild_member(guild_id, member_id, reason=reason)
+
+        return cls(api, Endpoints.REMOVE_GUILD_MEMBER, dict(guild=guild_id), call, member_ids, **kwargs)
+
+    @classmethod
+    def ban(cls, api, guild_id, user_ids, *, delete_message_days=None, reason=None, **kwargs):
+        """Creates an operation that bans users."""
+
+        async def call(user_id):
+            await api.create_guild_ban(guild_id, user_id, delete_message_days=delete_message_days, reason=reason)
+
+        return cls(api, Endpoints.CREATE_GUILD_BAN, dict(guild=guild_id), call, user_ids, **kwargs)
+
+    @classmethod
+    def unban(cls, api, guild_id, user_ids, *, reason=None, **kwargs):
+        """Creates an operation that unbans users."""
+
+        async def call(user_id):
+            await api.remove_guild_ban(guild_id, user_id, reason=reason)
+
+        return cls(api, Endpoints.REMOVE_GUILD_BAN, dict(guild=guild_id), call, user_ids, **kwargs)
+
+    @property
+    def finished(self):
+        """The amount of targets that were processed, including failed ones."""
+
+        return self.succeeded + len(self.failed)
+
+    def load_checkpoint(self):
+        """Loads the IDs of the finished targets from the checkpoint file."""
+
+        with open(self.checkpoint, 'r', encoding='utf-8') as fp:
+            data = json.load(fp)
+
+        self._finished = set(data['finished'])
+        logger.debug('Resuming bulk operation on %s with %s finished targets.', self.bucket, len(self._finished))
+
+    def save_checkpoint(self):
+        """Writes the IDs of the finished targets to the checkpoint file.
+
+        Targets the request failed for aren't considered finished, so they are retried on resume.
+        """
+
+        if self.checkpoint is None:
+            return
+
+        # Replacing the file keeps the old checkpoint intact if we're interrupted while writing.
+        path = self.checkpoint + '.tmp'
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump({'finished': list(self._finished)}, fp)
+        os.replace(path, self.checkpoint)
+
+        self._last_save = trio.current_time()
+
+    def cancel(self):
+        """Stops the operation. Requests in flight are cancelled and the checkpoint is saved."""
+
+        if self._cancel_scope is not None:
+            self._cancel_scope.cancel()
+
+    def _update_window(self, failed=False):
+        # The limiter holds the latest headers of our bucket.
+        bucket = self.api.http.limiter.buckets.get(self.bucket)
+        if bucket is None or bucket.limit is None:
+            if failed:
+                # The request might not have reached Discord, so let the next one find out about the limits.
+                self._window.release(time.time())
+            else:
+                self._window.update(None, 0, 0.0, time.time())
+        elif bucket.reset is not None:
+            # Without a reset, the bucket's window has passed and there is nothing new to learn.
+            # The reset is on Discord's clock, so it's taken relative to the date of the response.
+            now = time.time()
+            self._window.update(bucket.limit, bucket.remaining, now + (bucket.reset - bucket.date).total_seconds(), now)
+
+    async def _reserve(self):
+        while True:
+            delay = self._window.acquire(time.time())
+            if delay <= 0:
+                return
+
+            await trio.sleep(delay)
+
+    async def _perform(self, target_id, borrower):
+        failed = False
+        try:
+            await self.call(target_id)
+        except Exception as error:
+            # Timeouts and connection errors only fail the affected target, just like error responses.
+            logger.debug('Bulk request for %s to %s failed: %s', target_id, self.bucket, error)
+            self.failed[target_id] = error
+            failed = True
+        else:
+            self.succeeded += 1
+            self._finished.add(target_id)
+        finally:
+            self._capacity.release_on_behalf_of(borrower)
+            self._update_window(failed)
+
+        if self.progress is not None:
+            self.progress(self.finished, self.total)
+
+        if trio.current_time() - self._last_save >= self.checkpoint_interval:
+            self.save_checkpoint()
+
+    async def _iter_targets(self):
+        if hasattr(self.targets, '__aiter__'):
+            async for target in self.targets:
+                yield target
+        else:
+            for target in self.targets:
+                yield target
+
+    async def run(self):
+        """|coro|
+
+        Performs the requests for all targets that weren't finished yet.
+
+        Returns
+        -------
+        bool
+            Whether the operation went through all targets without being cancelled.
+        """
+
+        self._last_save = trio.current_time()
+
+        with CancelScope() as scope, request_priority(self.priority):
+            self._cancel_scope = scope
+            try:
+                async with trio.open_nursery() as nursery:
+                    async for target in self._iter_targets():
+                        target_id = int(getattr(target, 'id', target))
+                        if target_id in self._finished:
+                            self.skipped += 1
+                            continue
+
+                        # A target might show up twice, so every request borrows its own token.
+                        borrower = object()
+                        await self._capacity.acquire_on_behalf_of(borrower)
+                        await self._reserve()
+                        nursery.start_soon(self._perform, target_id, borrower)
+            finally:
+                self.save_checkpoint()
+                self._cancel_scope = None
+
+        return not scope.cancel_called
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import copy
+import logging
+import time
+
+from .routes import Endpoints
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ResponseCache']
+
+# The default amount of seconds responses from read endpoints stay fresh.
+DEFAULT_TTLS = {
+    Endpoints.GET_GUILD: 60,
+    Endpoints.GET_GUILD_CHANNELS: 60,
+    Endpoints.GET_GUILD_MEMBER: 60,
+    Endpoints.GET_GUILD_ROLES: 60,
+    Endpoints.GET_GUILD_VOICE_REGIONS: 3600,
+    Endpoints.GET_CHANNEL: 60,
+    Endpoints.LIST_GUILD_EMOJIS: 60,
+    Endpoints.GET_GUILD_EMOJI: 60,
+    Endpoints.GET_CURRENT_USER: 300,
+    Endpoints.GET_USER: 300,
+    Endpoints.LIST_VOICE_REGIONS: 3600,
+    Endpoints.GET_CHANNEL_WEBHOOKS: 60,
+    Endpoints.GET_GUILD_WEBHOOKS: 60,
+    Endpoints.GET_WEBHOOK: 60,
+    Endpoints.GET_CURRENT_APPLICATION_INFO: 3600,
+}
+
+
+def _get_header(headers, name):
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+class _CacheEntry:
+    __slots__ = ('route', 'url', 'fmt', 'data', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, route, url, fmt, data, expires, etag, last_modified):
+        self.route = route
+        self.url = url
+        self.fmt = fmt
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self):
+        return time.monotonic() < self.expires
+
+    @property
+    def revalidatable(self):
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCache:
+    """Represents an opt-in cache for responses from read endpoints of the Discord REST API.
+
+    Responses stay fresh for a TTL that can be configured per endpoint. Stale responses
+    that came with an ``ETag`` or a ``Last-Modified`` header are revalidated using conditional
+    requests. Successful writes through the same HTTP client invalidate the cached responses of the
+    same guild, channel or webhook, and gateway events invalidate those of the corresponding entities.
+
+    Parameters
+    ----------
+    ttls : dict, optional
+        A dict mapping endpoints from :class:`shitcord.http.Endpoints` to their TTL in seconds.
+        These are merged with the default TTLs. A TTL of ``None`` disables caching for an endpoint.
+    cache_size : int, optional
+        The total amount of responses that can be in the cache at the same time. Defaults to 1000.
+    """
+
+    def __init__(self, ttls=None, *, cache_size=1000):
+        self.cache_size = cache_size
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+
+        # Maps request keys to entries, least recently used first.
+        self._cache = collections.OrderedDict()
+        # Maps (parameter, value) pairs of the route formatting to the keys of the corresponding entries.
+        self._index = collections.defaultdict(set)
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __repr__(self):
+        return '<shitcord.http.ResponseCache size={} hits={} misses={}>'.format(len(self), self.hits, self.misses)
+
+    @property
+    def stats(self):
+        """Returns a dict containing statistics about the cache."""
+
+        return {
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def get_ttl(self, route):
+        """Returns the TTL for a given endpoint or ``None`` if its responses shouldn't be cached."""
+
+        return self.ttls.get(route)
+
+    def lookup(self, key):
+        """Looks up the entry for a request key.
+
+        A fresh entry will be counted as a hit, anything else as a miss.
+        """
+
+        entry = self._cache.get(key)
+        if entry is None or not entry.fresh:
+            self.misses += 1
+            return entry
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return entry
+
+    def get_data(self, entry):
+        """Returns a copy of the data of an entry so models can't modify the cached data."""
+
+        return copy.deepcopy(entry.data)
+
+    def get_validators(self, entry):
+        """Returns the headers that are necessary for revalidating a stale entry."""
+
+        headers = {}
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        return headers
+
+    def store(self, key, route, url, fmt, data, headers):
+        """Stores the response to a request.
+
+        Parameters
+        ----------
+        key : tuple
+            The key identifying the request.
+        route : tuple
+            The endpoint the request was made to.
+        url : str
+            The URL the request was made to.
+        fmt : dict
+            The keys and values the route was formatted with.
+        data : dict, list
+            The parsed response.
+        headers : dict
+            The response headers.
+        """
+
+        ttl = self.get_ttl(route)
+        if ttl is None:
+            return
+
+        self.remove(key)
+
+        fmt = {param: str(value) for param, value in fmt.items()}
+        self._cache[key] = _CacheEntry(route, url, fmt, data, time.monotonic() + ttl,
+                                       _get_header(headers, 'ETag'), _get_header(headers, 'Last-Modified'))
+        for item in fmt.items():
+            self._index[item].add(key)
+
+        self._cleanse()
+
+    def revalidate(self, key):
+        """Marks a stale entry as fresh again after the Discord API responded with 304 Not Modified.
+
+        Returns
+        -------
+        A copy of the entry's data.
+        """
+
+        entry = self._cache[key]
+        entry.expires = time.monotonic() + self.get_ttl(entry.route)
+        self._cache.move_to_end(key)
+        self.revalidations += 1
+
+        return self.get_data(entry)
+
+    def remove(self, key):
+        """Removes an entry from the cache."""
+
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return False
+
+        for item in entry.fmt.items():
+            keys = self._index[item]
+            keys.discard(key)
+            if not keys:
+                del self._index[item]
+
+        return True
+
+    def _cleanse(self):
+        while len(self._cache) > self.cache_size:
+            self.remove(next(iter(self._cache)))
+            self.evictions += 1
+
+    def clear(self):
+        """Removes all entries from the cache."""
+
+        self._cache.clear()
+        self._index.clear()
+
+    def invalidate(self, route=None, **fmt):
+        """Invalidates all cached responses for the given entity.
+
+        Parameters
+        ----------
+        route : tuple, optional
+            If given, only responses of this endpoint will be invalidated.
+        fmt
+            The keys and values the routes of the responses were formatted with, e.g. ``guild=1234``.
+
+        Returns
+        -------
+        int
+            The amount of invalidated responses.
+        """
+
+        if fmt:
+            items = [(param, str(value)) for param, value in fmt.items()]
+            keys = set.intersection(*(self._index.get(item, set()) for item in items))
+        else:
+            keys = set(self._cache)
+
+        if route is not None:
+            keys = {key for key in keys if self._cache[key].route == route}
+
+        for key in keys:
+            self.remove(key)
+
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_url(self, url):
+        """Invalidates all cached responses that were made to the given URL."""
+
+        keys = [key for key, entry in self._cache.items() if entry.url == url]
+        for key in keys:
+            self.remove(key)
+
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_event(self, event, data):
+        """Invalidates cached responses for the entities a gateway event dispatch affects.
+
+        Parameters
+        ----------
+        event : str
+            The lowercased name of the event.
+        data : dict
+            The raw payload of the event.
+        """
+
+        if event in ('guild_update', 'guild_delete'):
+            self.invalidate(guild=data['id'])
+
+        elif event.startswith('guild_role_') or event == 'guild_emojis_update':
+            self.invalidate(guild=data['guild_id'])
+
+        elif event in ('guild_member_add', 'guild_member_update', 'guild_member_remove'):
+            self.invalidate(guild=data['guild_id'], member=data['user']['id'])
+
+        elif event in ('channel_create', 'channel_update', 'channel_delete'):
+            self.invalidate(channel=data['id'])
+            if data.get('guild_id'):
+                self.invalidate(Endpoints.GET_GUILD_CHANNELS, guild=data['guild_id'])
+
+        elif event == 'webhooks_update':
+            self.invalidate(channel=data['channel_id'])
+            self.invalidate(Endpoints.GET_GUILD_WEBHOOKS, guild=data['guild_id'])
+
+        elif event == 'user_update':
+            self.invalidate(Endpoints.GET_CURRENT_USER)
+            self.invalidate(Endpoints.GET_USER, user=data['id'])
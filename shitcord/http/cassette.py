@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import collections
+import email.utils
+import json
+import logging
+import math
+import re
+import time
+from urllib.parse import urlencode
+
+import trio
+
+from .errors import CassetteError
+from .transport import Response, _Headers
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Cassette']
+
+# Headers that are never written to a cassette.
+_SECRET_HEADERS = ('authorization', 'cookie', 'set-cookie')
+# Webhook and interaction tokens are part of the path and are replaced in keys.
+_SECRET_PATH = re.compile(r'(/(?:webhooks|interactions)/\d+/)[^/?]+')
+
+
+def _redact(key):
+    return _SECRET_PATH.sub(r'\1<token>', key)
+
+
+class CassetteResponse(Response):
+    """Represents a response that is replayed from a :class:`shitcord.http.Cassette`."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<shitcord.http.CassetteResponse status_code={}>'.format(self.status_code)
+
+
+class Cassette:
+    """Records requests to the Discord API to a file and replays them without any network access.
+
+    A cassette replaces the transport of :class:`shitcord.http.HTTP`. While recording, every request
+    is performed by the real transport and the response, including its rate limit headers and the
+    time it took, is stored. While replaying, requests are matched by their method, URL and query
+    parameters and answered from the cassette in the order they were recorded. Neither the
+    ``Authorization`` header nor webhook or interaction tokens in URLs are written to the cassette.
+
+    Rate limit headers are shifted to the time of the replay, so the :class:`shitcord.http.Limiter`
+    behaves the same way it did during the recording.
+
+    .. code-block:: python3
+
+        # Record a real run...
+        with Cassette('members.json', record=True) as cassette:
+            api = API(token, cassette=cassette)
+            members = await api.list_guild_members(guild_id, limit=1000)
+
+        # ...and replay it in CI without any delays.
+        api = API('token', cassette=Cassette('members.json', time_scale=0))
+        members = await api.list_guild_members(guild_id, limit=1000)
+
+    Parameters
+    ----------
+    path : str
+        The path of the cassette file.
+    record : bool, optional
+        Whether to record a new cassette instead of replaying an existing one. Defaults to ``False``.
+    time_scale : float, optional
+        A factor for the recorded durations, rate limit windows and retry backoffs during a replay.
+        ``1`` replays with the original timing, ``0`` without any delays. Defaults to 1.
+        The jitter of retry backoffs is seeded, so replays are deterministic.
+    repeat : bool, optional
+        Whether the last recorded response for a request should be replayed again once all
+        recorded responses for it were used up. Otherwise a :class:`shitcord.http.CassetteError`
+        will be raised. Defaults to ``False``.
+
+    Attributes
+    ----------
+    session : :class:`shitcord.http.Transport`
+        The transport that performs the actual requests while recording.
+    interactions : list
+        The recorded interactions.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, *, record=False, time_scale=1.0, repeat=False):
+        self.path = path
+        self.record = record
+        self.time_scale = time_scale
+        self.repeat = repeat
+
+        self.session = None
+        self.interactions = []
+        self._started = None
+        self._queues = {}
+
+        if not record:
+            self.load()
+
+    def __repr__(self):
+        return '<shitcord.http.Cassette path={0.path!r} record={0.record} interactions={1}>'.format(self, len(self.interactions))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.record:
+            self.save()
+
+    def attach(self, session):
+        """Attaches the transport that performs the actual requests while recording.
+
+        Returns
+        -------
+        :class:`shitcord.http.Cassette`
+            The cassette itself, to be used as transport by the HTTP client.
+        """
+
+        self.session = session
+        return self
+
+    @staticmethod
+    def create_key(method, url, params=None):
+        """Creates the key a request is matched by. Tokens in the URL are redacted."""
+
+        if params:
+            url += '?' + urlencode(sorted((key, str(value)) for key, value in params.items()))
+
+        return _redact('{} {}'.format(method, url))
+
+    def load(self):
+        """Loads the interactions from the cassette file."""
+
+        with open(self.path, 'r', encoding='utf-8') as fp:
+            data = json.load(fp)
+
+        if data.get('version') != self.VERSION:
+            raise CassetteError('Unsupported cassette version {}.'.format(data.get('version')))
+
+        self.interactions = data['interactions']
+        self._queues = collections.defaultdict(collections.deque)
+        for interaction in self.interactions:
+            # Cassettes recorded by older versions might still contain tokens.
+            self._queues[_redact(interaction['key'])].append(interaction)
+
+    def save(self):
+        """Writes the recorded interactions to the cassette file."""
+
+        with open(self.path, 'w', encoding='utf-8') as fp:
+            json.dump({'version': self.VERSION, 'interactions': self.interactions}, fp, indent=1)
+
+        logger.debug('Saved %s interactions to cassette %s.', len(self.interactions), self.path)
+
+    async def request(self, method, url, **kwargs):
+        """|coro|
+
+        Either performs and records a request or replays the response to it.
+        """
+
+        if self.record:
+            return await self._record(method, url, **kwargs)
+        return await self._replay(method, url, **kwargs)
+
+    async def _record(self, method, url, **kwargs):
+        if self.session is None:
+            raise CassetteError('A transport must be attached to record a cassette.')
+
+        started = trio.current_time()
+        if self._started is None:
+            self._started = started
+
+        response = await self.session.request(method, url, **kwargs)
+
+        interaction = {
+            'key': self.create_key(method, url, kwargs.get('params')),
+            'offset': started - self._started,
+            'duration': trio.current_time() - started,
+            'recorded_at': time.time(),
+            'status_code': response.status_code,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() not in _SECRET_HEADERS},
+        }
+
+        try:
+            interaction['body'] = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            interaction['body_base64'] = base64.b64encode(response.content).decode('ascii')
+
+        self.interactions.append(interaction)
+        return response
+
+    def _next_interaction(self, key):
+        queue = self._queues.get(key)
+        if not queue:
+            raise CassetteError('No recorded response for {}.'.format(key))
+
+        if len(queue) == 1 and self.repeat:
+            return queue[0]
+        return queue.popleft()
+
+    def _shift_headers(self, interaction):
+        headers = _Headers(interaction['headers'])
+        now = time.time()
+
+        date = headers.get('Date')
+        recorded_at = email.utils.parsedate_to_datetime(date).timestamp() if date else interaction['recorded_at']
+        headers['Date'] = email.utils.formatdate(now, usegmt=True)
+
+        reset = headers.get('X-RateLimit-Reset')
+        if reset is not None:
+            reset_after = (float(reset) - recorded_at) * self.time_scale
+            # Without any delays, a bucket should never be considered exhausted.
+            headers['X-RateLimit-Reset'] = str(math.ceil(now + reset_after) if self.time_scale else int(now) - 1)
+
+        return headers
+
+    async def _replay(self, method, url, **kwargs):
+        key = self.create_key(method, url, kwargs.get('params'))
+        interaction = self._next_interaction(key)
+
+        if self.time_scale:
+            await trio.sleep(interaction['duration'] * self.time_scale)
+
+        if 'body_base64' in interaction:
+            content = base64.b64decode(interaction['body_base64'])
+        else:
+            content = interaction['body'].encode('utf-8')
+
+        headers = self._shift_headers(interaction)
+        if interaction['status_code'] == 429 and self.time_scale != 1:
+            # The time to wait for has to be scaled just like the rate limit windows.
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None:
+                headers['Retry-After'] = str(float(retry_after) * self.time_scale)
+
+            try:
+                data = json.loads(content)
+            except ValueError:
+                # A 429 from a proxy or Cloudflare might not be JSON. It is replayed as it was recorded.
+                data = None
+
+            if isinstance(data, dict):
+                data['retry_after'] = data.get('retry_after', 0) * self.time_scale
+                content = json.dumps(data).encode('utf-8')
+
+        return CassetteResponse(interaction['status_code'], headers, content)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import logging
+import os
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import trio
+
+from .errors import CDNError
+from .transport import H11Transport
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CDNClient']
+
+_UNSAFE_CHARACTERS = re.compile(r'[^\w.@-]')
+MAX_NAME_LENGTH = 200
+PARTIAL_SUFFIX = '.part'
+
+
+class CDNClient:
+    """Downloads avatars, icons, emojis and attachments from Discord's CDN and caches them on disk.
+
+    Assets on the CDN never change: a new avatar or icon gets a new hash and an attachment
+    gets a new ID. So the file an asset is cached in is named after the path of its URL,
+    which contains the hash, and the requested size. Cached files are served without
+    asking the CDN again.
+
+    Downloads share a pool of keep-alive connections and are streamed into the cache directory.
+    At most `max_concurrency` downloads run at the same time. Concurrent requests for the same
+    asset wait for a single download. When the cache grows larger than `max_size` bytes,
+    the least recently used files are removed.
+
+    Only one client should use a cache directory at a time.
+
+    .. code-block:: python3
+
+        async with CDNClient('cache/cdn') as cdn:
+            avatar = await cdn.read(user.avatar_url)
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory to cache the assets in. Will be created if it doesn't exist.
+    max_size : int, optional
+        The maximum amount of bytes the cached files may take up. Defaults to 256 MiB.
+    max_concurrency : int, optional
+        The maximum amount of downloads at the same time. Defaults to 10.
+    transport : :class:`shitcord.http.Transport`, optional
+        The transport to download with. Defaults to a :class:`shitcord.http.H11Transport`
+        with a connection for every concurrent download.
+
+    Attributes
+    ----------
+    size : int
+        The amount of bytes the cached files take up.
+    hits : int
+        The amount of requests that were served from the cache.
+    misses : int
+        The amount of requests that needed a download.
+    evictions : int
+        The amount of files that were removed to stay within `max_size`.
+    """
+
+    def __init__(self, cache_dir, *, max_size=256 * 1024 * 1024, max_concurrency=10, transport=None):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.transport = transport or H11Transport(max_connections=max_concurrency)
+
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Maps the names of cached files to their sizes, least recently used first.
+        self._entries = collections.OrderedDict()
+        self._downloads = {}
+        self._capacity = trio.CapacityLimiter(max_concurrency)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def __repr__(self):
+        return '<shitcord.http.CDNClient cache_dir={0.cache_dir!r} size={0.size} entries={1}>'.format(self, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @property
+    def stats(self):
+        """Returns a dict containing statistics about the cache."""
+
+        return {
+            'size': self.size,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    @staticmethod
+    def get_cache_key(url):
+        """Returns the name of the file an asset is cached in.
+
+        Query parameters other than ``size`` don't change the asset and are ignored.
+        """
+
+        parts = urlsplit(url)
+        name = parts.path.strip('/').replace('/', '-')
+        root, extension = os.path.splitext(name)
+
+        size = parse_qs(parts.query).get('size')
+        if size:
+            root += '@' + size[0]
+
+        name = _UNSAFE_CHARACTERS.sub('_', root + extension)
+        if len(name) > MAX_NAME_LENGTH:
+            # Attachment file names can be arbitrarily long.
+            name = hashlib.sha1(name.encode('utf-8')).hexdigest() + _UNSAFE_CHARACTERS.sub('_', extension[:16])
+
+        return name
+
+    def _get_path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+
+            if entry.name.endswith(PARTIAL_SUFFIX):
+                # A download that was interrupted.
+                os.remove(entry.path)
+                continue
+
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self.size += size
+
+        self._evict()
+        logger.debug('Loaded %s cached CDN assets with %s bytes from %s.', len(self._entries), self.size, self.cache_dir)
+
+    def _evict(self):
+        # The most recently added file stays, even if it alone exceeds the budget.
+        while self.size > self.max_size and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+            try:
+                os.remove(self._get_path(name))
+            except FileNotFoundError:
+                pass
+
+    def _lookup(self, name):
+        if name not in self._entries:
+            return False
+
+        try:
+            # The modification time keeps the order of use across restarts.
+            os.utime(self._get_path(name))
+        except FileNotFoundError:
+            self.size -= self._entries.pop(name)
+            return False
+
+        self._entries.move_to_end(name)
+        return True
+
+    async def _download(self, url, name):
+        path = self._get_path(name)
+        partial = path + PARTIAL_SUFFIX
+        size = 0
+
+        async with self._capacity:
+            try:
+                async with await trio.open_file(partial, 'wb') as fp:
+                    async def write(chunk):
+                        nonlocal size
+                        size += len(chunk)
+                        await fp.write(chunk)
+
+                    response = await self.transport.download(url, write)
+            except BaseException:
+                os.remove(partial)
+                raise
+
+            if not 200 <= response.status_code < 300:
+                os.remove(partial)
+                raise CDNError(url, response)
+
+            os.replace(partial, path)
+
+        logger.debug('Downloaded %s bytes from %s.', size, url)
+        self._entries[name] = size
+        self.size += size
+        self._evict()
+
+    async def get_path(self, url):
+        """|coro|
+
+        Returns the path of the cached file of an asset and downloads it first if necessary.
+
+        The file may be removed once other assets are downloaded and the cache exceeds its size,
+        so it should be opened right away.
+
+        Parameters
+        ----------
+        url : str
+            The CDN URL of the asset, e.g. :attr:`shitcord.models.User.avatar_url`.
+
+        Returns
+        -------
+        str
+            The path of the cached file.
+
+        Raises
+        ------
+        CDNError
+            Will be raised if the CDN didn't respond with the asset.
+        """
+
+        name = self.get_cache_key(url)
+
+        while True:
+            if self._lookup(name):
+                self.hits += 1
+                return self._get_path(name)
+
+            download = self._downloads.get(name)
+            if download is None:
+                break
+
+            # Somebody else is downloading the asset already. If that fails, we try ourselves.
+            await download.wait()
+
+        self.misses += 1
+        download = self._downloads[name] = trio.Event()
+        try:
+            await self._download(url, name)
+        finally:
+            del self._downloads[name]
+            download.set()
+
+        return self._get_path(name)
+
+    async def read(self, url):
+        """|coro|
+
+        Returns the content of an asset from the cache and downloads it first if necessary.
+
+        Parameters
+        ----------
+        url : str
+            The CDN URL of the asset.
+
+        Returns
+        -------
+        bytes
+            The content of the asset.
+
+        Raises
+        ------
+        CDNError
+            Will be raised if the CDN didn't respond with the asset.
+        """
+
+        while True:
+            path = await self.get_path(url)
+            try:
+                async with await trio.open_file(path, 'rb') as fp:
+                    return await fp.read()
+            except FileNotFoundError:
+                # The file was evicted in the meantime.
+                continue
+
+    async def aclose(self):
+        """|coro|
+
+        Closes the connections of the client.
+        """
+
+        await self.transport.aclose()
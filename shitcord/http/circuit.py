@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import logging
+
+import trio
+
+from .errors import CircuitOpen
+from .metrics import HTTPMetrics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CircuitBreaker']
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class _Circuit:
+    __slots__ = ('state', 'outcomes', 'failures', 'opened_at', 'probes', 'times_opened', 'rejected')
+
+    def __init__(self):
+        self.state = CLOSED
+        # (time, failed) pairs of the requests within the window.
+        self.outcomes = collections.deque()
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def trim(self, now, window):
+        while self.outcomes and self.outcomes[0][0] < now - window:
+            _, failed = self.outcomes.popleft()
+            self.failures -= failed
+
+    def reset(self):
+        self.outcomes.clear()
+        self.failures = 0
+
+
+class CircuitBreaker:
+    """Stops requests to endpoints that keep failing, so callers don't pile up on them during outages.
+
+    The breaker tracks the outcome of every request per endpoint within a sliding window.
+    Server errors and connection failures count as failures; rate limits and client errors don't.
+    Once the failure rate within the window reaches `failure_rate`, the circuit of the endpoint
+    opens and requests to it fail right away with :class:`shitcord.http.CircuitOpen`.
+
+    After `recovery_timeout` seconds, the circuit becomes half-open and lets `probes` requests
+    through. If they succeed, the circuit closes again, otherwise it opens for another round.
+
+    Parameters
+    ----------
+    failure_rate : float, optional
+        The share of failed requests within the window that opens a circuit. Defaults to 0.5.
+    min_requests : int, optional
+        The minimum amount of requests within the window before a circuit can open. Defaults to 10.
+    window : float, optional
+        The seconds of the sliding window. Defaults to 30.
+    recovery_timeout : float, optional
+        The seconds a circuit stays open before it is probed. Defaults to 15.
+    probes : int, optional
+        The amount of requests that are let through while a circuit is half-open. Defaults to 1.
+    per_bucket : bool, optional
+        Whether every rate limit bucket gets its own circuit instead of every endpoint.
+        Outages usually affect an endpoint as a whole, so this defaults to ``False``.
+
+    Attributes
+    ----------
+    circuits : dict
+        A dict mapping endpoints to the state of their circuit.
+    """
+
+    def __init__(self, *, failure_rate=0.5, min_requests=10, window=30.0, recovery_timeout=15.0, probes=1, per_bucket=False):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.probes = probes
+        self.per_bucket = per_bucket
+
+        self.circuits = collections.defaultdict(_Circuit)
+
+    def __repr__(self):
+        return '<shitcord.http.CircuitBreaker failure_rate={0.failure_rate} open={1}>'.format(
+            self, sum(circuit.state != CLOSED for circuit in self.circuits.values()))
+
+    def get_key(self, route, bucket):
+        """Returns the key of the circuit a request belongs to."""
+
+        if self.per_bucket:
+            return ' '.join(bucket) if isinstance(bucket, tuple) else bucket
+        return HTTPMetrics.get_key(route)
+
+    def check(self, key):
+        """Lets a request through or raises if its circuit is open.
+
+        Every request that was let through must be followed by a call to
+        :meth:`record_success`, :meth:`record_failure` or :meth:`record_cancel`.
+
+        Raises
+        ------
+        CircuitOpen
+            Will be raised if the circuit is open or all probes of a half-open circuit are in flight.
+        """
+
+        circuit = self.circuits[key]
+        if circuit.state == CLOSED:
+            return
+
+        now = trio.current_time()
+        if circuit.state == OPEN:
+            retry_after = circuit.opened_at + self.recovery_timeout - now
+            if retry_after > 0:
+                circuit.rejected += 1
+                raise CircuitOpen(key, retry_after)
+
+            logger.info('Probing endpoint %s for recovery.', key)
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+
+        if circuit.probes >= self.probes:
+            circuit.rejected += 1
+            raise CircuitOpen(key, 0.0)
+
+        circuit.probes += 1
+
+    def _open(self, key, circuit, now):
+        if circuit.state != OPEN:
+            logger.warning('Too many requests to %s failed. Failing fast for %s seconds.', key, self.recovery_timeout)
+            circuit.times_opened += 1
+
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.reset()
+
+    def record_success(self, key):
+        """Records a request that got a response which doesn't indicate an outage."""
+
+        circuit = self.circuits[key]
+        now = trio.current_time()
+
+        if circuit.state == HALF_OPEN:
+            logger.info('Endpoint %s recovered.', key)
+            circuit.state = CLOSED
+            circuit.reset()
+            return
+
+        circuit.outcomes.append((now, False))
+        circuit.trim(now, self.window)
+
+    def record_failure(self, key):
+        """Records a request that failed with a server error or didn't get a response at all."""
+
+        circuit = self.circuits[key]
+        now = trio.current_time()
+
+        if circuit.state == HALF_OPEN:
+            self._open(key, circuit, now)
+            return
+
+        circuit.outcomes.append((now, True))
+        circuit.failures += 1
+        circuit.trim(now, self.window)
+
+        total = len(circuit.outcomes)
+        if total >= self.min_requests and circuit.failures / total >= self.failure_rate:
+            self._open(key, circuit, now)
+
+    def record_cancel(self, key):
+        """Records a request that was let through, but cancelled before it got a response."""
+
+        circuit = self.circuits[key]
+        if circuit.state == HALF_OPEN:
+            circuit.probes = max(circuit.probes - 1, 0)
+
+    def snapshot(self):
+        """Returns a dict mapping endpoints to the state of their circuit."""
+
+        now = trio.current_time()
+        snapshot = {}
+        for key, circuit in self.circuits.items():
+            circuit.trim(now, self.window)
+            snapshot[key] = {
+                'state': circuit.state,
+                'requests': len(circuit.outcomes),
+                'failures': circuit.failures,
+                'times_opened': circuit.times_opened,
+                'rejected': circuit.rejected,
+                'retry_after': max(circuit.opened_at + self.recovery_timeout - now, 0.0) if circuit.state == OPEN else 0.0,
+            }
+
+        return snapshot
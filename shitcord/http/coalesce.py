@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import logging
+
+import trio
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['RequestCoalescer']
+
+
+class _Call:
+    """Represents a request that is currently in flight and the callers waiting for it."""
+
+    __slots__ = ('done', 'result', 'error', 'aborted', 'waiters')
+
+    def __init__(self):
+        self.done = trio.Event()
+        self.result = None
+        self.error = None
+        self.aborted = False
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """Coalesces identical requests that are in flight at the same time.
+
+    The first caller for a key performs the actual request while every other
+    caller for the same key waits for it and shares the response. Every waiter
+    receives its own deep copy of the response data, so models that modify the
+    data while being constructed don't affect each other.
+
+    .. warning:: This should only be used for idempotent requests.
+
+    Attributes
+    ----------
+    coalesced : int
+        The total amount of requests that were saved by coalescing.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    @staticmethod
+    def create_key(method, url, params=None):
+        """Creates a hashable key that identifies a request."""
+
+        if params:
+            params = tuple(sorted((key, str(value)) for key, value in params.items()))
+
+        return method, url, params or None
+
+    async def run(self, key, func, *args, **kwargs):
+        """|coro|
+
+        Either performs ``func(*args, **kwargs)`` or waits for an identical request that is already in flight.
+
+        Parameters
+        ----------
+        key
+            The key identifying the request. See :meth:`create_key`.
+        func : Callable
+            The coroutine function that performs the actual request.
+
+        Returns
+        -------
+        The result of the request.
+        """
+
+        call = self._calls.get(key)
+        if call is not None:
+            call.waiters += 1
+            self.coalesced += 1
+            logger.debug('Coalescing request %s with an identical request in flight.', key)
+
+            await call.done.wait()
+            if call.aborted:
+                # The request was cancelled in the task that made it. That doesn't concern us, so try again.
+                return await self.run(key, func, *args, **kwargs)
+            if call.error is not None:
+                raise call.error
+
+            return copy.deepcopy(call.result)
+
+        call = self._calls[key] = _Call()
+        try:
+            call.result = result = await func(*args, **kwargs)
+        except Exception as error:
+            call.error = error
+            raise
+        except BaseException:
+            call.aborted = True
+            raise
+        finally:
+            del self._calls[key]
+            call.done.set()
+
+        if call.waiters:
+            # The waiters get their copies from the original, so hand out another one to keep it untouched.
+            return copy.deepcopy(result)
+        return result
@@ -106,3 +106,46 @@ class ShitRequestFailed(Exception):
             self.failed += '\nHere\'s a bunch of errors for you. Have fun with that crap:\n' + '\n'.join(error_list)
 
         super().__init__(self.failed.format(self))
+
+
+class CassetteError(Exception):
+    """An error that will be raised when a request can't be replayed from a cassette."""
+
+
+class CircuitOpen(Exception):
+    """An error that will be raised when requests to an endpoint fail fast because it keeps failing.
+
+    Attributes
+    ----------
+    key : str
+        The endpoint or bucket whose circuit is open.
+    retry_after : float
+        The seconds until the endpoint will be probed again.
+    """
+
+    def __init__(self, key, retry_after):
+        self.key = key
+        self.retry_after = retry_after
+
+        super().__init__('Requests to {} are failing, not trying again for {:.2f} seconds.'.format(key, retry_after))
+
+
+class CDNError(Exception):
+    """An error that will be raised when an asset couldn't be downloaded from the CDN.
+
+    Attributes
+    ----------
+    url : str
+        The URL of the asset.
+    response : :class:`shitcord.http.Response`
+        The response of the CDN.
+    status_code : int
+        The status code of the response.
+    """
+
+    def __init__(self, url, response):
+        self.url = url
+        self.response = response
+        self.status_code = response.status_code
+
+        super().__init__('Downloading {} failed with HTTP code {}.'.format(url, response.status_code))
@@ -3,44 +3,79 @@
 import shitcord
 
 import logging
+import math
 import sys
-from random import randint
 from urllib.parse import quote
 
 import trio
-import asks
 
-from .errors import ShitRequestFailed
+from .circuit import CircuitBreaker
+from .coalesce import RequestCoalescer
+from .errors import CircuitOpen, ShitRequestFailed
+from .metrics import HTTPMetrics
+from .priority import get_request_priority, Priority
 from .rate_limit import Limiter
+from .retry import RetryPolicy
+from .routes import MAJOR_PARAMETERS, Route
+from .transport import AsksTransport
 
 logger = logging.getLogger(__name__)
-asks.init(trio)
 
 
 class HTTP:
-    """Represents an HTTP client that wraps around the asks library and performs requests to the Discord API."""
+    """Represents an HTTP client that performs requests to the Discord API.
+
+    The connections are handled by a :class:`shitcord.http.Transport`, which is an
+    :class:`shitcord.http.AsksTransport` unless a `transport` keyword argument is given.
+    """
 
     BASE_URL = 'https://discordapp.com/api/v7'
+    MAJOR_PARAMETERS = MAJOR_PARAMETERS
     MAX_RETRIES = 5
+    DEFAULT_TIMEOUT = 120.0
 
     LOG_SUCCESS = 'Gratz! {bucket} ({url}) has received {text}!'
     LOG_FAILED = 'Request to {bucket} failed with status code {code}: {error}. Retrying after {seconds} seconds.'
 
     def __init__(self, token, **kwargs):
         self._token = token
-        self._session = kwargs.get('session', asks.Session())
-        self.limiter = Limiter()
+        self.transport = kwargs.get('transport') or AsksTransport(kwargs.get('session'))
+        self._session = self.transport
+        if kwargs.get('cassette') is not None:
+            # The cassette either records what the transport does or replaces it entirely.
+            self._session = kwargs['cassette'].attach(self.transport)
+        self.base_url = kwargs.get('base_url', self.BASE_URL)
+        self.limiter = kwargs.get('limiter') or Limiter()
+        self.metrics = HTTPMetrics()
+        self.retry_policy = kwargs.get('retry_policy') or RetryPolicy(max_retries=self.MAX_RETRIES)
+        if kwargs.get('cassette') is not None and not kwargs['cassette'].record:
+            # Replays back off on the cassette's time scale and with the same jitter every time.
+            self.retry_policy.backoff_scale = kwargs['cassette'].time_scale
+            self.retry_policy.random.seed(0)
+        self.coalescer = RequestCoalescer() if kwargs.get('coalesce_requests', True) else None
+        self.circuit_breaker = kwargs.get('circuit_breaker', CircuitBreaker())
+        self.cache = kwargs.get('response_cache')
+        self.timeout = kwargs.get('timeout', self.DEFAULT_TIMEOUT)
 
         self.headers = {
             'User-Agent': self.create_user_agent(),
-            'Authorization': kwargs.get('application_type', 'Bot').strip() + ' ' + self._token,
         }
+        if self._token is not None:
+            # Webhooks are executed with their own token as part of the URL.
+            self.headers['Authorization'] = kwargs.get('application_type', 'Bot').strip() + ' ' + self._token
 
     async def make_request(self, route, fmt=None, **kwargs):
         """Makes a request to a given endpoint with a set of arguments.
 
         This makes the request for you, handles the rate limits as well as
-        non-success status codes and attempts up to 5 requests on failure.
+        non-success status codes and retries failed requests according to
+        the :class:`shitcord.http.RetryPolicy` of this client.
+
+        The whole call, including the time spent waiting for the rate limiter, connecting,
+        sending and reading, has to finish within `timeout` seconds. Deadlines of enclosing
+        cancel scopes, e.g. ``with trio.fail_after(5): await api.get_channel(channel_id)``,
+        apply as well, so API methods can be given a deadline without an extra argument.
+        Retries that couldn't finish before the deadline aren't attempted.
 
         Parameters
         ----------
@@ -50,8 +85,12 @@ class HTTP:
             The necessary keys and values to dynamically format the route.
         headers : dict, optional
             The headers to use for the request.
-        retries : int, optional
-            The amount of retries that have been made yet.
+        timeout : float, optional
+            The seconds the request may take. Defaults to the `timeout` of the client,
+            which is 120 seconds unless specified otherwise. ``None`` disables the deadline.
+        priority : :class:`shitcord.http.Priority`, optional
+            The lane the request waits in while its bucket is exhausted. Defaults to the priority
+            set by :func:`shitcord.http.request_priority` or :attr:`Priority.NORMAL`.
 
         Returns
         -------
@@ -61,64 +100,208 @@ class HTTP:
         Raises
         ------
         ShitRequestFailed
-            Will be raised on request failure or when the total amount of possible retries was exceeded.
+            Will be raised on request failure or when the retry budget of the request was exhausted.
+        CircuitOpen
+            Will be raised if the endpoint keeps failing and the :class:`shitcord.http.CircuitBreaker`
+            of this client doesn't let requests through right now.
+        trio.TooSlowError
+            Will be raised if the request didn't finish in time.
         """
 
+        if kwargs.get('priority') is None:
+            priority = get_request_priority()
+            kwargs['priority'] = priority if priority is not None else Priority.NORMAL
+
+        timeout = kwargs.pop('timeout', self.timeout)
+        deadline = trio.current_time() + timeout if timeout is not None else math.inf
+
+        with trio.fail_at(deadline):
+            return await self._make_request(route, fmt, **kwargs)
+
+    async def _make_request(self, route, fmt, **kwargs):
         fmt = fmt or {}
-        retries = kwargs.pop('retries', 0)
-        bucket_fmt = {key: value if key in ('guild', 'channel') else '' for key, value in fmt.items()}
 
         # Prepare the headers
         if 'headers' in kwargs:
             kwargs['headers'].update(self.headers)
         else:
-            kwargs['headers'] = self.headers
+            kwargs['headers'] = self.headers.copy()
+
+        reason = kwargs.pop('reason', None)
+        if reason:
+            kwargs['headers']['X-Audit-Log-Reason'] = quote(reason, '/ ')
+
+        route = Route.compile(route)
+        method = route.method.value
+        bucket = route.get_bucket(fmt)
+        url = self.base_url + route.format(fmt)
+
+        if method != 'GET':
+            data = await self._request(route, bucket, method, url, **kwargs)
+
+            # Writes are likely to change whatever we've cached for the same entity. Reads of related
+            # entities only share the major parameters, e.g. modifying a role changes the guild's roles.
+            if self.cache is not None:
+                major = {param: value for param, value in fmt.items() if param in MAJOR_PARAMETERS}
+                if major:
+                    self.cache.invalidate(**major)
+                elif fmt:
+                    self.cache.invalidate(**fmt)
+                else:
+                    self.cache.invalidate_url(url)
+
+            return data
+
+        key = RequestCoalescer.create_key(method, url, kwargs.get('params'))
+
+        if self.cache is not None and self.cache.get_ttl(route) is not None:
+            entry = self.cache.lookup(key)
+            if entry is not None:
+                if entry.fresh:
+                    return self.cache.get_data(entry)
+
+                if entry.revalidatable:
+                    kwargs['headers'].update(self.cache.get_validators(entry))
+
+            kwargs['cache'] = (key, route, fmt)
+
+        if self.coalescer is not None:
+            # Identical GET requests that are in flight at the same time can share a single response.
+            return await self.coalescer.run(key, self._request, route, bucket, method, url, **kwargs)
+
+        return await self._request(route, bucket, method, url, **kwargs)
+
+    async def _request(self, route, bucket, method, url, *, cache=None, priority=Priority.NORMAL, **kwargs):
+        retries = 0
+        started = trio.current_time()
+
+        breaker = self.circuit_breaker
+        circuit = breaker.get_key(route, bucket) if breaker is not None else None
+
+        while True:
+            logger.debug('Performing request to bucket %s with headers %s', bucket, kwargs['headers'])
+
+            if breaker is not None:
+                try:
+                    breaker.check(circuit)
+                except CircuitOpen:
+                    self.metrics.record_rejected(route)
+                    raise
+
+            try:
+                response = await self._send(route, bucket, priority, method, url, **kwargs)
+            except Exception:
+                if breaker is not None:
+                    breaker.record_failure(circuit)
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.record_cancel(circuit)
+                raise
+
+            status = response.status_code
+            if breaker is not None:
+                if status >= 500:
+                    breaker.record_failure(circuit)
+                else:
+                    breaker.record_success(circuit)
 
-        if kwargs.get('reason'):
-            kwargs['headers']['X-Audit-Log-Reason'] = quote(kwargs['reason'], '/ ')
+            if status == 304 and cache is not None:
+                # Our cached response is still up to date.
+                key = cache[0]
+                if key in self.cache:
+                    return self.cache.revalidate(key)
 
-        method = route[0].value
-        bucket_endpoint = route[1].format(**bucket_fmt)
-        bucket = (method, bucket_endpoint)
-        url = self.BASE_URL + route[1].format(**fmt)
+                # The entry was invalidated in the meantime, so we need the full response again.
+                kwargs['headers'].pop('If-None-Match', None)
+                kwargs['headers'].pop('If-Modified-Since', None)
+                continue
 
-        logger.debug('Performing request to bucket %s with headers %s', bucket, kwargs['headers'])
+            data = response._actual_response = self.parse_response(response)
 
-        duration = await self.limiter.chill(bucket)
+            if 200 <= status < 300:
+                # These status codes indicate successful requests. So just return the JSON response.
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(self.LOG_SUCCESS.format(bucket=bucket, url=url, text=data))
+                if cache is not None:
+                    key, route, fmt = cache
+                    self.cache.store(key, route, url, fmt, data, response.headers)
+
+                return data
+
+            if not self.retry_policy.should_retry(status):
+                # These status codes are only caused by the dumb user and won't disappear with another request.
+                # It'd be just a waste of performance to attempt sending another request.
+                raise ShitRequestFailed(response, data, bucket)
+
+            # Some retarded shit happened here. Let's try that again.
+            retries += 1
+            backoff = self.retry_policy.get_delay(retries, response, data)
+            if self.retry_policy.exceeds(retries, trio.current_time() - started, backoff):
+                raise ShitRequestFailed(response, data, bucket, retries=retries - 1)
+
+            if trio.current_time() + backoff >= trio.current_effective_deadline():
+                # There's no point in sleeping if the deadline passes before the retry.
+                raise ShitRequestFailed(response, data, bucket, retries=retries - 1)
+
+            self.retry_policy.record(bucket)
+            self.metrics.record_retry(route)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(self.LOG_FAILED.format(bucket=bucket, code=status, error=response.content, seconds=backoff))
+            await trio.sleep(backoff)
+
+    async def _send(self, route, bucket, priority, method, url, **kwargs):
+        waited = trio.current_time()
+        duration = await self.limiter.chill(bucket, priority)
         if duration > 0:
             logger.debug('Bucket %s has been cooled down!', bucket)
+        self.metrics.record_wait(route, trio.current_time() - waited)
 
+        if trio.current_effective_deadline() <= trio.current_time():
+            # We ran out of time in the limiter. The request won't be made, so give its slot back.
+            self.limiter.release(bucket)
+            await trio.sleep(0)
+
+        sent = trio.current_time()
         response = await self._session.request(method, url, **kwargs)
-        data = response._actual_response = self.parse_response(response)
-        status = response.status_code
+        self.metrics.record_response(route, response, trio.current_time() - sent)
 
         self.limiter.update_bucket(bucket, response)
+        return response
 
-        if 200 <= status < 300:
-            # These status codes indicate successful requests. So just return the JSON response.
-            logger.debug(self.LOG_SUCCESS.format(bucket=bucket, url=url, text=data))
-            return data
+    def get_stats(self):
+        """Returns a dict containing the metrics of this client that can be serialized to JSON.
 
-        elif status != 429 and 400 <= status < 500:
-            # These status codes are only caused by the dumb user and won't disappear with another request.
-            # It'd be just a waste of performance to attempt sending another request.
-            raise ShitRequestFailed(response, data, bucket)
+        This includes the per-endpoint metrics, the live state of the rate limit buckets
+        and circuit breakers as well as statistics about coalesced requests and the response cache.
+        """
 
-        else:
-            # Some retarded shit happened here. Let's try that again.
-            retries += 1
-            if retries > self.MAX_RETRIES:
-                raise ShitRequestFailed(response, data, bucket, retries=self.MAX_RETRIES)
+        return {
+            'routes': self.metrics.snapshot(),
+            'buckets': self.limiter.snapshot(),
+            'retries': sum(self.retry_policy.retries.values()),
+            'coalesced': self.coalescer.coalesced if self.coalescer is not None else 0,
+            'cache': self.cache.stats if self.cache is not None else None,
+            'circuits': self.circuit_breaker.snapshot() if self.circuit_breaker is not None else {},
+        }
 
-            backoff = randint(100, 50000) / 1000.0
-            logger.debug(self.LOG_FAILED.format(bucket=bucket, code=status, error=response.content, seconds=backoff))
-            await trio.sleep(backoff)
+    @classmethod
+    def get_bucket(cls, route, fmt=None):
+        """Returns the rate limit bucket for a request to the given endpoint.
+
+        Parameters
+        ----------
+        route : tuple
+            A tuple containing the HTTP method to use as well as the route to make the request to.
+        fmt : dict, optional
+            The keys and values to format the route with. Parameters that aren't given are treated as empty.
+        """
 
-            return await self.make_request(route, fmt, retries=retries, **kwargs)
+        return Route.compile(route).get_bucket(fmt or {})
 
     @staticmethod
     def parse_response(response):
-        if response.headers['Content-Type'] == 'application/json':
+        if response.headers.get('Content-Type') == 'application/json':
             return response.json()
         return response.text.encode('utf-8')
 
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import logging
+
+import trio
+
+from .routes import Endpoints
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['AuditLogIterator', 'GuildIterator', 'HistoryIterator', 'MemberIterator', 'ReactionIterator']
+
+
+class _PaginatedIterator:
+    """Represents a base class for asynchronous iterators over paginated endpoints of the Discord REST API.
+
+    The iterator keeps track of the snowflake cursor and fetches page after page
+    until either the requested amount of items was yielded or the API ran out of them.
+
+    When used as an asynchronous context manager, the next pages are prefetched in the
+    background while the current page is being processed. The look-ahead is bounded by
+    `prefetch` and pauses while the route's rate limit bucket is about to be exhausted.
+
+    .. code-block:: python3
+
+        # Fetches one page after another.
+        async for message in api.iter_channel_messages(channel_id, limit=500):
+            ...
+
+        # Prefetches the next page while the current one is being processed.
+        async with api.iter_channel_messages(channel_id, limit=None) as messages:
+            async for message in messages:
+                ...
+
+    Parameters
+    ----------
+    api : :class:`shitcord.http.API`
+        The API client to make the requests with.
+    limit : int, optional
+        The total amount of items to yield. ``None`` to yield everything.
+    before : int, optional
+        Only yield items with IDs lower than this.
+    after : int, optional
+        Only yield items with IDs greater than this.
+    prefetch : int, optional
+        The maximum amount of pages that are fetched ahead of time. Defaults to 1.
+    """
+
+    #: The endpoint this iterator paginates.
+    ROUTE = None
+    #: The maximum amount of items the endpoint returns per request.
+    PAGE_SIZE = 100
+
+    def __init__(self, api, *, limit=None, before=None, after=None, prefetch=1):
+        self._api = api
+        self.limit = limit
+        self.before = int(before) if before is not None else None
+        self.after = int(after) if after is not None else None
+        self.prefetch = max(prefetch, 1)
+
+        # Paginate forwards only if the caller explicitly asked for items after a given ID.
+        self.reverse = self.after is None or self.before is not None
+
+        self._buffer = collections.deque()
+        self._done = limit is not None and limit <= 0
+
+        # Only used for prefetching.
+        self._nursery_manager = None
+        self._nursery = None
+        self._receive = None
+        self._demand = trio.Event()
+
+    def __repr__(self):
+        return '<shitcord.{0.__class__.__name__} limit={0.limit} before={0.before} after={0.after}>'.format(self)
+
+    @property
+    def fmt(self):
+        """The keys and values the route gets formatted with."""
+
+        raise NotImplementedError
+
+    async def _fetch(self, limit):
+        """Fetches a page of raw items with the current cursor."""
+
+        raise NotImplementedError
+
+    def _convert(self, item):
+        """Converts a raw item into the object that should be yielded."""
+
+        return item
+
+    def _get_params(self, limit):
+        params = {'limit': limit}
+        if self.reverse:
+            if self.before is not None:
+                params['before'] = self.before
+        elif self.after is not None:
+            params['after'] = self.after
+
+        return params
+
+    def _advance(self, page):
+        ids = [int(item['id']) for item in page]
+        if self.reverse:
+            self.before = min(ids)
+        else:
+            self.after = max(ids)
+
+    def _get_id(self, item):
+        return int(item['id'])
+
+    def _filter(self, page):
+        # Endpoints that only support one direction still have to respect the other boundary.
+        if self.reverse and self.after is not None:
+            return [item for item in page if self._get_id(item) > self.after]
+        if not self.reverse and self.before is not None:
+            return [item for item in page if self._get_id(item) < self.before]
+        return page
+
+    async def _next_page(self):
+        if self._done:
+            return []
+
+        limit = self.PAGE_SIZE
+        if self.limit is not None:
+            limit = min(limit, self.limit)
+
+        page = await self._fetch(limit)
+        if len(page) < limit:
+            self._done = True
+
+        if page:
+            self._advance(page)
+            filtered = self._filter(page)
+            if len(filtered) < len(page):
+                self._done = True
+            page = filtered
+
+        if self.limit is not None:
+            self.limit -= len(page)
+            if self.limit <= 0:
+                self._done = True
+
+        return page
+
+    def _bucket_exhausted(self):
+        http = self._api.http
+        bucket = http.limiter.buckets.get(http.get_bucket(self.ROUTE, self.fmt))
+        if bucket is None or bucket.reset is None:
+            return False
+
+        return bucket.remaining <= 1 and bucket.get_current_time <= bucket.reset
+
+    async def _prefetch(self, send_channel):
+        async with send_channel:
+            while not self._done:
+                # Don't spend the last request of the bucket on look-ahead while
+                # the caller still has a page left to process.
+                while send_channel.statistics().current_buffer_used and self._bucket_exhausted():
+                    self._demand = trio.Event()
+                    await self._demand.wait()
+
+                page = await self._next_page()
+                if not page:
+                    break
+
+                await send_channel.send(page)
+
+    async def __aenter__(self):
+        self._nursery_manager = trio.open_nursery()
+        self._nursery = await self._nursery_manager.__aenter__()
+
+        send_channel, self._receive = trio.open_memory_channel(self.prefetch)
+        self._nursery.start_soon(self._prefetch, send_channel)
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # The caller might leave early, so there's no need to fetch anything else.
+        self._nursery.cancel_scope.cancel()
+        return await self._nursery_manager.__aexit__(*exc_info)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._buffer:
+            if self._receive is not None:
+                try:
+                    page = await self._receive.receive()
+                except trio.EndOfChannel:
+                    page = []
+                self._demand.set()
+            else:
+                page = await self._next_page()
+
+            if not page:
+                raise StopAsyncIteration
+
+            self._buffer.extend(page)
+
+        return self._convert(self._buffer.popleft())
+
+    async def flatten(self):
+        """|coro|
+
+        Returns a list of all items this iterator yields.
+        """
+
+        items = []
+        async for item in self:
+            items.append(item)
+
+        return items
+
+
+class HistoryIterator(_PaginatedIterator):
+    """Iterates over the messages of a channel.
+
+    Messages are yielded from newest to oldest unless only `after` is specified.
+    See :class:`_PaginatedIterator` for the general behavior of iterators.
+    """
+
+    ROUTE = Endpoints.GET_CHANNEL_MESSAGES
+    PAGE_SIZE = 100
+
+    def __init__(self, api, channel_id, **kwargs):
+        super().__init__(api, **kwargs)
+        self.channel_id = channel_id
+
+    @property
+    def fmt(self):
+        return dict(channel=self.channel_id)
+
+    async def _fetch(self, limit):
+        page = await self._api.make_request(self.ROUTE, self.fmt, params=self._get_params(limit))
+
+        # Make sure the order is consistent with the direction we paginate in.
+        return sorted(page, key=self._get_id, reverse=self.reverse)
+
+    def _convert(self, item):
+        return models.Message(item, self._api.get_api())
+
+
+class MemberIterator(_PaginatedIterator):
+    """Iterates over the members of a guild in ascending order of their user IDs.
+
+    See :class:`_PaginatedIterator` for the general behavior of iterators.
+    """
+
+    ROUTE = Endpoints.LIST_GUILD_MEMBERS
+    PAGE_SIZE = 1000
+
+    def __init__(self, api, guild_id, *, limit=None, after=None, prefetch=1):
+        super().__init__(api, limit=limit, after=after or 0, prefetch=prefetch)
+        self.guild_id = guild_id
+
+    @property
+    def fmt(self):
+        return dict(guild=self.guild_id)
+
+    def _get_id(self, item):
+        return int(item['user']['id'])
+
+    def _advance(self, page):
+        self.after = max(map(self._get_id, page))
+
+    async def _fetch(self, limit):
+        return await self._api.make_request(self.ROUTE, self.fmt, params=self._get_params(limit))
+
+    def _convert(self, item):
+        return models.Member(item, self._api.get_api())
+
+
+class ReactionIterator(_PaginatedIterator):
+    """Iterates over the users that reacted to a message with a given emoji in ascending order of their IDs.
+
+    See :class:`_PaginatedIterator` for the general behavior of iterators.
+    """
+
+    ROUTE = Endpoints.GET_REACTIONS
+    PAGE_SIZE = 100
+
+    def __init__(self, api, channel_id, message_id, emoji, *, limit=None, after=None, prefetch=1):
+        super().__init__(api, limit=limit, after=after or 0, prefetch=prefetch)
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.emoji = emoji
+
+    @property
+    def fmt(self):
+        return dict(channel=self.channel_id, message=self.message_id, emoji=self.emoji)
+
+    async def _fetch(self, limit):
+        return await self._api.make_request(self.ROUTE, self.fmt, params=self._get_params(limit))
+
+    def _convert(self, item):
+        return models.User(item, self._api.get_api())
+
+
+class AuditLogIterator(_PaginatedIterator):
+    """Iterates over the entries of a guild's audit log from newest to oldest.
+
+    See :class:`_PaginatedIterator` for the general behavior of iterators.
+    """
+
+    ROUTE = Endpoints.GET_GUILD_AUDIT_LOG
+    PAGE_SIZE = 100
+
+    def __init__(self, api, guild_id, *, user_id=None, action_type=None, limit=None, before=None, after=None, prefetch=1):
+        super().__init__(api, limit=limit, before=before, after=after, prefetch=prefetch)
+        self.reverse = True  # The audit log can only be paginated backwards.
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.action_type = action_type
+
+    @property
+    def fmt(self):
+        return dict(guild=self.guild_id)
+
+    async def _fetch(self, limit):
+        params = self._get_params(limit)
+        if self.user_id is not None:
+            params['user_id'] = self.user_id
+        if self.action_type is not None:
+            params['action_type'] = self.action_type
+
+        audit_log = await self._api.make_request(self.ROUTE, self.fmt, params=params)
+        return audit_log['audit_log_entries']  # TODO: Audit Log model
+
+
+class GuildIterator(_PaginatedIterator):
+    """Iterates over the guilds the current user is in.
+
+    Guilds are yielded in ascending order of their IDs unless `before` is specified.
+    See :class:`_PaginatedIterator` for the general behavior of iterators.
+    """
+
+    ROUTE = Endpoints.GET_CURRENT_USER_GUILDS
+    PAGE_SIZE = 100
+
+    def __init__(self, api, *, limit=None, before=None, after=None, prefetch=1):
+        super().__init__(api, limit=limit, before=before, after=after, prefetch=prefetch)
+        if self.before is None and self.after is None:
+            self.after = 0
+            self.reverse = False
+
+    @property
+    def fmt(self):
+        return {}
+
+    async def _fetch(self, limit):
+        page = await self._api.make_request(self.ROUTE, params=self._get_params(limit))
+        return sorted(page, key=self._get_id, reverse=self.reverse)
+
+    def _convert(self, item):
+        return models.PartialGuild(item, self._api.get_api())
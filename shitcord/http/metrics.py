@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import collections
+
+__all__ = ['HTTPMetrics', 'Histogram', 'RouteMetrics']
+
+# The upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+
+class Histogram:
+    """A histogram with fixed bucket bounds.
+
+    Observing a value costs a binary search over the bounds, no matter how many values were observed.
+
+    Parameters
+    ----------
+    bounds : tuple, optional
+        The sorted upper bounds of the buckets. The last one should be infinity.
+
+    Attributes
+    ----------
+    counts : list
+        The amount of observed values per bucket.
+    count : int
+        The total amount of observed values.
+    sum : float
+        The sum of all observed values.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self):
+        return '<shitcord.http.Histogram count={0.count} mean={0.mean}>'.format(self)
+
+    @property
+    def mean(self):
+        """The mean of all observed values."""
+
+        return self.sum / self.count if self.count else 0.0
+
+    def observe(self, value):
+        """Adds a value to the histogram."""
+
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percent):
+        """Estimates a percentile of the observed values.
+
+        Returns
+        -------
+        float
+            The upper bound of the bucket the percentile falls into.
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+
+        return self.bounds[-1]
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(bound): count for bound, count in zip(self.bounds, self.counts)},
+        }
+
+
+class RouteMetrics:
+    """The metrics of all requests to a single endpoint.
+
+    Attributes
+    ----------
+    requests : int
+        The amount of requests that were sent, including retries.
+    statuses : :class:`collections.Counter`
+        The amount of responses per status code.
+    latency : :class:`shitcord.http.Histogram`
+        The time it took to receive the responses.
+    limiter_wait : :class:`shitcord.http.Histogram`
+        The time requests spent waiting in the rate limiter before being sent.
+    bytes_received : int
+        The total size of the response bodies.
+    retries : int
+        The amount of requests that were retried.
+    rate_limited : int
+        The amount of 429 responses.
+    rejected : int
+        The amount of requests that failed fast because the endpoint's circuit was open.
+    """
+
+    __slots__ = ('requests', 'statuses', 'latency', 'limiter_wait', 'bytes_received', 'retries', 'rate_limited', 'rejected')
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses = collections.Counter()
+        self.latency = Histogram()
+        self.limiter_wait = Histogram()
+        self.bytes_received = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rejected = 0
+
+    def __repr__(self):
+        return '<shitcord.http.RouteMetrics requests={0.requests} retries={0.retries} rate_limited={0.rate_limited}>'.format(self)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'statuses': dict(self.statuses),
+            'latency': self.latency.to_dict(),
+            'limiter_wait': self.limiter_wait.to_dict(),
+            'bytes_received': self.bytes_received,
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'rejected': self.rejected,
+        }
+
+
+class HTTPMetrics:
+    """Collects per-endpoint metrics of the requests an HTTP client makes.
+
+    Endpoints are identified by their method and route template,
+    e.g. ``GET /channels/{channel}/messages``.
+
+    Attributes
+    ----------
+    routes : dict
+        A dict mapping endpoints to their :class:`shitcord.http.RouteMetrics`.
+    """
+
+    def __init__(self):
+        self.routes = collections.defaultdict(RouteMetrics)
+
+    def __repr__(self):
+        return '<shitcord.http.HTTPMetrics routes={}>'.format(len(self.routes))
+
+    def __getitem__(self, route):
+        return self.routes[self.get_key(route)]
+
+    @staticmethod
+    def get_key(route):
+        """Returns the key the metrics of an endpoint are stored with."""
+
+        key = getattr(route, 'key', None)
+        if key is None:
+            key = '{} {}'.format(route[0].value, route[1])
+        return key
+
+    def record_wait(self, route, seconds):
+        """Records the time a request to an endpoint waited for the rate limiter."""
+
+        self[route].limiter_wait.observe(seconds)
+
+    def record_response(self, route, response, seconds):
+        """Records a response received from an endpoint.
+
+        Parameters
+        ----------
+        route : tuple
+            The endpoint the request was made to.
+        response
+            The response object.
+        seconds : float
+            The time it took to receive the response.
+        """
+
+        metrics = self[route]
+        status = response.status_code
+
+        metrics.requests += 1
+        metrics.statuses[status] += 1
+        metrics.latency.observe(seconds)
+        metrics.bytes_received += len(response.content or b'')
+        if status == 429:
+            metrics.rate_limited += 1
+
+    def record_retry(self, route):
+        """Records that a request to an endpoint will be retried."""
+
+        self[route].retries += 1
+
+    def record_rejected(self, route):
+        """Records a request to an endpoint that failed fast because its circuit was open."""
+
+        self[route].rejected += 1
+
+    def reset(self):
+        """Discards all collected metrics."""
+
+        self.routes.clear()
+
+    def snapshot(self):
+        """Returns the collected metrics as a dict that can be serialized to JSON."""
+
+        return {key: metrics.to_dict() for key, metrics in self.routes.items()}
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+import io
+import mimetypes
+import os
+import uuid
+
+import trio
+
+__all__ = ['MultipartWriter']
+
+
+def _get_size(source):
+    """Returns the amount of bytes that are left to read from a source."""
+
+    if isinstance(source, str):
+        return os.stat(source).st_size
+
+    if isinstance(source, io.BytesIO):
+        return len(source.getbuffer()) - source.tell()
+
+    try:
+        return memoryview(source).nbytes
+    except TypeError:
+        pass
+
+    # Any other file-like object.
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END) - position
+    source.seek(position)
+    return size
+
+
+class _Part:
+    __slots__ = ('preamble', 'source', 'size', 'offset')
+
+    def __init__(self, preamble, source, size, offset):
+        self.preamble = preamble
+        self.source = source
+        self.size = size
+        self.offset = offset
+
+
+class MultipartWriter:
+    """Builds a ``multipart/form-data`` request body without loading the whole body into memory.
+
+    Files are read in chunks while the body is written. Files given as :class:`bytes`,
+    :class:`bytearray`, :class:`memoryview`, :class:`mmap.mmap` or :class:`io.BytesIO`
+    are sliced without copying them at all. Transports pass the chunks on to the connection
+    as they are written, so the progress callback follows what was actually sent.
+
+    Parameters
+    ----------
+    chunk_size : int, optional
+        The amount of bytes that are read from a file at once. Defaults to 64 KiB.
+    progress : Callable, optional
+        A callable that will be called with the amount of bytes written so far and
+        the total amount of bytes of the body whenever a chunk was written.
+
+    Attributes
+    ----------
+    boundary : str
+        The boundary that separates the parts of the body.
+    """
+
+    def __init__(self, *, chunk_size=65536, progress=None):
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+        self._parts = []
+        self._closing = '--{}--\r\n'.format(self.boundary).encode('utf-8')
+
+    def __len__(self):
+        return sum(len(part.preamble) + part.size + 2 for part in self._parts) + len(self._closing)
+
+    def __repr__(self):
+        return '<shitcord.http.MultipartWriter parts={} size={}>'.format(len(self._parts), len(self))
+
+    @property
+    def content_type(self):
+        """The value for the ``Content-Type`` header of the request."""
+
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def _add_part(self, name, source, size, *, filename=None, content_type=None):
+        disposition = 'form-data; name="{}"'.format(name)
+        if filename is not None:
+            disposition += '; filename="{}"'.format(filename.replace('"', '\\"'))
+
+        preamble = '--{}\r\nContent-Disposition: {}\r\n'.format(self.boundary, disposition)
+        if content_type is not None:
+            preamble += 'Content-Type: {}\r\n'.format(content_type)
+        preamble += '\r\n'
+
+        # File-like objects need to be rewound if the body is written more than once, e.g. on retries.
+        offset = source.tell() if hasattr(source, 'tell') else None
+        self._parts.append(_Part(preamble.encode('utf-8'), source, size, offset))
+
+    def add_field(self, name, value, *, content_type=None):
+        """Adds a regular form field.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field.
+        value : str, bytes
+            The value of the field.
+        content_type : str, optional
+            An optional content type of the field, e.g. ``application/json``.
+        """
+
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+
+        self._add_part(name, value, len(value), content_type=content_type)
+        return self
+
+    def add_file(self, name, file):
+        """Adds a file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field.
+        file : :class:`shitcord.models.File`
+            The file to add. Its ``fp`` can be a path, a file-like object opened in binary mode
+            or any object supporting the buffer protocol.
+        """
+
+        content_type = mimetypes.guess_type(file.filename or '')[0] or 'application/octet-stream'
+        self._add_part(name, file.fp, _get_size(file.fp), filename=file.filename or name, content_type=content_type)
+        return self
+
+    async def _write_source(self, part, write):
+        source = part.source
+        if isinstance(source, str):
+            async with await trio.open_file(source, 'rb') as fp:
+                await self._write_file(fp, write)
+            return
+
+        if isinstance(source, io.BytesIO):
+            view = source.getbuffer()[part.offset:]
+        else:
+            try:
+                view = memoryview(source)
+            except TypeError:
+                source.seek(part.offset)
+                await self._write_file(trio.wrap_file(source), write)
+                return
+
+        view = view.cast('B')
+        for offset in range(0, len(view), self.chunk_size):
+            await write(view[offset:offset + self.chunk_size])
+
+    async def _write_file(self, fp, write):
+        while True:
+            chunk = await fp.read(self.chunk_size)
+            if not chunk:
+                break
+
+            await write(chunk)
+
+    async def write_to(self, write):
+        """|coro|
+
+        Writes the body chunk by chunk.
+
+        Parameters
+        ----------
+        write : Callable
+            A coroutine function that will be called with every chunk of the body,
+            e.g. ``stream.send_all``.
+        """
+
+        total = len(self)
+        written = 0
+
+        async def _write(chunk):
+            nonlocal written
+            await write(chunk)
+
+            written += len(chunk)
+            if self.progress is not None:
+                self.progress(written, total)
+
+        for part in self._parts:
+            await _write(part.preamble)
+            await self._write_source(part, _write)
+            await _write(b'\r\n')
+
+        await _write(self._closing)
+
+    async def read(self):
+        """|coro|
+
+        Returns the whole body as :class:`bytes`.
+
+        This is only meant for HTTP clients that can't stream request bodies. Chunks of
+        in-memory sources are views, so they aren't copied before the final body is joined
+        together. Chunks of files are, so reading a body with files takes about twice their size.
+        """
+
+        chunks = []
+
+        async def _write(chunk):
+            chunks.append(chunk)
+
+        await self.write_to(_write)
+        return b''.join(chunks)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import contextvars
+import enum
+from contextlib import contextmanager
+
+import trio
+
+__all__ = ['Priority', 'request_priority']
+
+_current_priority = contextvars.ContextVar('_current_priority', default=None)
+
+
+class Priority(enum.IntEnum):
+    """The lanes requests wait in when their rate limit bucket is exhausted.
+
+    Lower values are served first.
+    """
+
+    INTERACTIVE = 0  # noqa
+    NORMAL      = 1  # noqa
+    BULK        = 2  # noqa
+
+
+@contextmanager
+def request_priority(priority):
+    """A contextmanager that sets the priority of all requests made within it.
+
+    This applies to tasks that are started within it as well and takes precedence over
+    the default priority of an :class:`shitcord.http.API`, but not over a `priority`
+    that is passed to :meth:`shitcord.http.HTTP.make_request` explicitly.
+
+    .. code-block:: python3
+
+        with request_priority(Priority.BULK):
+            await sync_all_members(api)
+    """
+
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def get_request_priority():
+    """Returns the priority set by :func:`request_priority` or ``None``."""
+
+    return _current_priority.get()
+
+
+class _Waiter:
+    __slots__ = ('priority', 'since', 'woken')
+
+    def __init__(self, priority, since):
+        self.priority = priority
+        self.since = since
+        self.woken = trio.Event()
+
+
+class _Lanes:
+    """Queues the requests that wait for a bucket, one FIFO per priority.
+
+    The first waiter of every lane ages by one priority level every `aging` seconds,
+    so bulk requests are still served when interactive ones keep coming in.
+    Once a waiter reached the top, it is served in order of arrival with the interactive ones.
+    """
+
+    __slots__ = ('lanes', 'aging')
+
+    def __init__(self, aging):
+        self.lanes = [collections.deque() for _ in Priority]
+        self.aging = aging
+
+    def __len__(self):
+        return sum(map(len, self.lanes))
+
+    def __bool__(self):
+        return any(self.lanes)
+
+    def push(self, priority):
+        waiter = _Waiter(int(priority), trio.current_time())
+        self.lanes[waiter.priority].append(waiter)
+        return waiter
+
+    def remove(self, waiter):
+        self.lanes[waiter.priority].remove(waiter)
+
+    def head(self):
+        """Returns the waiter to serve next or ``None``."""
+
+        now = trio.current_time()
+        best = None
+        best_rank = None
+        for lane in self.lanes:
+            if not lane:
+                continue
+
+            # Waiters within a lane are ordered by age, so only the first one can win.
+            # Aged waiters compete with the top lane by arrival, which bounds how long they wait.
+            waiter = lane[0]
+            rank = (max(waiter.priority - (now - waiter.since) / self.aging, 0), waiter.since)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = waiter, rank
+
+        return best
+
+    def wake_head(self):
+        waiter = self.head()
+        if waiter is not None:
+            waiter.woken.set()
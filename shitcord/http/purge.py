@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import logging
+
+import trio
+
+from .bulk import BulkOperation
+from .priority import Priority, request_priority
+from .routes import Endpoints
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ChannelPurge', 'PurgePlanner']
+
+# Discord refuses to bulk delete messages older than this. The margin accounts for
+# clock skew and the time a batch spends waiting for the rate limiter.
+MAX_BULK_DELETE_AGE = datetime.timedelta(days=14)
+BULK_DELETE_MARGIN = datetime.timedelta(minutes=5)
+
+BULK_DELETE_MIN = 2
+BULK_DELETE_MAX = 100
+
+
+def get_bulk_delete_cutoff():
+    """Returns the lowest message ID that can still be deleted in bulk."""
+
+    return models.Snowflake.create_snowflake(datetime.datetime.now(datetime.timezone.utc) - MAX_BULK_DELETE_AGE + BULK_DELETE_MARGIN)
+
+
+class PurgePlanner:
+    """Splits a stream of message IDs into bulk deletes and single deletes.
+
+    Only the creation time encoded in a snowflake decides whether a message can be deleted
+    in bulk, so the planner doesn't need anything but the IDs. Young messages are packed into
+    batches of up to 100 IDs, old messages and batches that would only contain a single message
+    have to be deleted one by one.
+
+    Parameters
+    ----------
+    cutoff : int, optional
+        The lowest ID that can be deleted in bulk. Defaults to the current cutoff.
+
+    Attributes
+    ----------
+    batch : list
+        The IDs of the young messages that weren't planned yet.
+    """
+
+    __slots__ = ('cutoff', 'batch')
+
+    def __init__(self, cutoff=None):
+        self.cutoff = cutoff if cutoff is not None else get_bulk_delete_cutoff()
+        self.batch = []
+
+    def __repr__(self):
+        return '<shitcord.http.PurgePlanner cutoff={0.cutoff} pending={1}>'.format(self, len(self.batch))
+
+    def add(self, message_id):
+        """Adds a message ID to the plan.
+
+        Returns
+        -------
+        list
+            The deletions that are ready, as tuples of ``('bulk', ids)`` or ``('single', id)``.
+        """
+
+        message_id = int(message_id)
+        if message_id < self.cutoff:
+            return self.flush() + [('single', message_id)]
+
+        self.batch.append(message_id)
+        if len(self.batch) >= BULK_DELETE_MAX:
+            return self.flush()
+
+        return []
+
+    def flush(self):
+        """Plans the remaining young messages.
+
+        Returns
+        -------
+        list
+            The deletions for the remaining messages.
+        """
+
+        batch, self.batch = self.batch, []
+        if len(batch) >= BULK_DELETE_MIN:
+            return [('bulk', batch)]
+
+        return [('single', message_id) for message_id in batch]
+
+
+class ChannelPurge:
+    """Deletes the messages of a channel with as few requests as possible.
+
+    Messages are streamed from a :class:`shitcord.http.HistoryIterator`, so only a few pages
+    of them are held in memory at once, and split by a :class:`shitcord.http.PurgePlanner`.
+    Messages younger than 14 days are deleted 100 at a time. Older ones are handed to a
+    :class:`shitcord.http.BulkOperation` that deletes them one by one on their own rate limit
+    bucket, so they don't hold up the bulk deletes.
+
+    .. code-block:: python3
+
+        purge = ChannelPurge(api, channel_id, check=lambda message: message.author.id == spammer_id)
+        await purge.run()
+        print(purge.deleted, purge.failed)
+
+    Parameters
+    ----------
+    api : :class:`shitcord.http.API`
+        The API client to make the requests with.
+    channel_id : int
+        The ID of the channel to purge.
+    limit : int, optional
+        The amount of messages to go through. ``None`` for the whole history.
+    before : int, optional
+        Only delete messages with IDs lower than this.
+    after : int, optional
+        Only delete messages with IDs greater than this.
+    check : Callable, optional
+        Called with every :class:`shitcord.models.Message`. Only messages it returns ``True`` for are deleted.
+    reason : str, optional
+        The reason for the audit log.
+    max_concurrency : int, optional
+        The maximum amount of single deletes in flight. Defaults to 10.
+    progress : Callable, optional
+        Called with the amount of deleted messages and ``None`` after every deletion.
+    priority : :class:`shitcord.http.Priority`, optional
+        The priority of the requests. Defaults to :attr:`Priority.BULK`.
+
+    Attributes
+    ----------
+    deleted : int
+        The amount of deleted messages.
+    bulk_requests : int
+        The amount of bulk delete requests that were made.
+    failed : list
+        The IDs of the messages that couldn't be deleted.
+    """
+
+    SINGLE_QUEUE_SIZE = 100
+
+    def __init__(self, api, channel_id, *, limit=None, before=None, after=None, check=None, reason=None,
+                 max_concurrency=10, progress=None, priority=Priority.BULK):
+        self.api = api
+        self.channel_id = channel_id
+        self.limit = limit
+        self.before = before
+        self.after = after
+        self.check = check
+        self.reason = reason
+        self.max_concurrency = max_concurrency
+        self.progress = progress
+        self.priority = priority
+
+        self.deleted = 0
+        self.bulk_requests = 0
+        self.failed = []
+
+    def __repr__(self):
+        return '<shitcord.http.ChannelPurge channel_id={0.channel_id} deleted={0.deleted} failed={1}>'.format(self, len(self.failed))
+
+    def _report(self, amount):
+        self.deleted += amount
+        if self.progress is not None:
+            self.progress(self.deleted, None)
+
+    async def _delete_single(self, message_id):
+        await self.api.delete_message(self.channel_id, message_id, reason=self.reason)
+        self._report(1)
+
+    async def _delete_bulk(self, message_ids, singles):
+        # The batch might have aged while waiting, so check the IDs against the current cutoff again.
+        cutoff = get_bulk_delete_cutoff()
+        for message_id in [message_id for message_id in message_ids if message_id < cutoff]:
+            message_ids.remove(message_id)
+            await singles.send(message_id)
+
+        if len(message_ids) < BULK_DELETE_MIN:
+            for message_id in message_ids:
+                await singles.send(message_id)
+            return
+
+        try:
+            await self.api.bulk_delete_messages(self.channel_id, message_ids, reason=self.reason)
+        except Exception as error:
+            # Timeouts and connection errors only fail this batch, just like error responses.
+            logger.debug('Bulk deleting %s messages in channel %s failed: %s', len(message_ids), self.channel_id, error)
+            self.failed.extend(message_ids)
+        else:
+            self.bulk_requests += 1
+            self._report(len(message_ids))
+
+    async def _plan(self, singles):
+        planner = PurgePlanner()
+
+        async def dispatch(deletions):
+            for kind, value in deletions:
+                if kind == 'bulk':
+                    await self._delete_bulk(value, singles)
+                else:
+                    await singles.send(value)
+
+        async with singles:
+            async with self.api.iter_channel_messages(self.channel_id, limit=self.limit, before=self.before,
+                                                      after=self.after, prefetch=2) as messages:
+                async for message in messages:
+                    if self.check is None or self.check(message):
+                        await dispatch(planner.add(message.id))
+
+            await dispatch(planner.flush())
+
+    async def run(self):
+        """|coro|
+
+        Deletes the messages.
+
+        Returns
+        -------
+        int
+            The amount of deleted messages.
+        """
+
+        send_channel, receive_channel = trio.open_memory_channel(self.SINGLE_QUEUE_SIZE)
+        singles = BulkOperation(self.api, Endpoints.DELETE_MESSAGE, dict(channel=self.channel_id), self._delete_single,
+                                receive_channel, max_concurrency=self.max_concurrency, priority=self.priority)
+
+        with request_priority(self.priority):
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(singles.run)
+                await self._plan(send_channel)
+
+        self.failed.extend(singles.failed)
+        return self.deleted
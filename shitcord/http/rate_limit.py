@@ -2,15 +2,41 @@
 
 import datetime
 import logging
+import math
 import time
 from collections import OrderedDict
 from email.utils import parsedate_to_datetime
 
 import trio
 
+from .priority import Priority, _Lanes
+
 logger = logging.getLogger(__name__)
 
 
+def _get_retry_after(response):
+    # The header is in seconds, the retry_after of the body in milliseconds.
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None:
+        return float(retry_after)
+
+    try:
+        return response.json()['retry_after'] / 1000
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _get_reset_after(headers):
+    # X-RateLimit-Reset is a timestamp in whole seconds on Discord's clock, so compare it to the Date header.
+    reset_after = headers.get('X-RateLimit-Reset-After')
+    if reset_after is not None:
+        return float(reset_after)
+
+    date = headers.get('Date')
+    now = parsedate_to_datetime(date).timestamp() if date else time.time()
+    return max(float(headers.get('X-RateLimit-Reset')) - now, 0.0)
+
+
 class CooldownBucket:
     """This class wraps around a bucket to handle rate limits.
 
@@ -29,6 +55,9 @@ class CooldownBucket:
         The bucket this :class:`shitcord.http.CooldownBucket` should handle.
     date : datetime.datetime
         A datetime object representing the time the current headers were received.
+    limit : int
+        The amount of requests that can be made to the bucket per rate limit window.
+        ``None`` until the bucket's headers were received.
     remaining : int
         The amount of requests that can be still made to the bucket before exhausting
         a rate limit.
@@ -36,20 +65,27 @@ class CooldownBucket:
         The interval in seconds after which the rate limits for this bucket will reset.
     cooled_down : :class:`trio.Event`
         An event used for indicating the current cooldown state of the bucket.
+    waiters : int
+        The amount of tasks that are currently blocked by the cooldown of this bucket.
+    queue
+        The requests that wait for the bucket, one queue per :class:`shitcord.http.Priority`.
     """
 
-    __slots__ = ('bucket', 'date', 'remaining', 'reset', 'cooled_down')
+    __slots__ = ('bucket', 'date', 'limit', 'remaining', 'reset', 'cooled_down', 'waiters', 'queue')
 
-    def __init__(self, bucket, response):
+    def __init__(self, bucket, response, *, aging=10.0):
         self.bucket = bucket
+        self.queue = _Lanes(aging)
 
         # these will be set later
         self.date = None
+        self.limit = None
         self.remaining = 0
         self.reset = None
 
         self.cooled_down = trio.Event()
         self.cooled_down.set()
+        self.waiters = 0
 
         self.update(response)
 
@@ -79,7 +115,46 @@ class CooldownBucket:
     def will_rate_limit(self):
         """Whether the next request will cause a rate limit or not."""
 
-        return self.get_current_time <= self.reset and self.remaining == 0
+        return self.reset is not None and self.get_current_time <= self.reset and self.remaining == 0
+
+    @property
+    def awaiting_window(self):
+        """Whether all requests of a window we opened ourselves were made and the bucket waits
+        for a response to learn when the window resets."""
+
+        return self.reset is None and self.limit is not None and self.remaining == 0
+
+    @property
+    def available(self):
+        """Whether a request can be made to the bucket right now."""
+
+        return not self.cooling_down and not self.will_rate_limit and not self.awaiting_window
+
+    @property
+    def window(self):
+        """The length of the last rate limit window in seconds, or one second if unknown."""
+
+        if self.reset is None or self.date is None:
+            return 1.0
+        return max((self.reset - self.date).total_seconds(), 1.0)
+
+    def take(self):
+        """Counts a request that is made to the bucket against the current window."""
+
+        if self.reset is not None and self.get_current_time > self.reset:
+            # The window is over, so the next one starts with the full limit.
+            self.reset = None
+            self.remaining = self.limit or 0
+
+        if self.remaining > 0:
+            self.remaining -= 1
+
+    def give_back(self):
+        """Returns a request that was counted by :meth:`take`, but won't be made."""
+
+        if self.limit is not None:
+            self.remaining = min(self.remaining + 1, self.limit)
+            self.queue.wake_head()
 
     def update(self, response):
         """Updates the current APIResponse object with response headers
@@ -88,6 +163,10 @@ class CooldownBucket:
 
         headers = response.headers
 
+        if 'X-RateLimit-Global' in headers:
+            self._update_global(response)
+            return
+
         # Rate limit headers is basically all or nothing.
         # If one of the rate limit headers is missing, any
         # other rate limit headers also won't be included.
@@ -95,9 +174,51 @@ class CooldownBucket:
         if 'X-RateLimit-Remaining' not in headers:
             return
 
+        remaining = int(headers.get('X-RateLimit-Remaining'))
+        reset = datetime.datetime.fromtimestamp(int(headers.get('X-RateLimit-Reset')), datetime.timezone.utc)
+
+        if self.date is not None and (self.reset is None or reset <= self.reset):
+            # Still the same window. Responses of concurrent requests arrive in any order
+            # and requests we let through since then aren't counted by Discord yet.
+            remaining = min(remaining, self.remaining)
+
         self.date = parsedate_to_datetime(headers.get('Date'))
-        self.remaining = int(headers.get('X-RateLimit-Remaining'))
-        self.reset = datetime.datetime.fromtimestamp(int(headers.get('X-RateLimit-Reset')), datetime.timezone.utc)
+        self.limit = int(headers.get('X-RateLimit-Limit', 1))
+        self.remaining = remaining
+        self.reset = reset
+
+        self.queue.wake_head()
+
+    def _update_global(self, response):
+        # A global rate limit only comes with a 429 that says how long to wait.
+        retry_after = _get_retry_after(response)
+        if retry_after is None:
+            return
+
+        date = response.headers.get('Date')
+        self.date = parsedate_to_datetime(date) if date else self.get_current_time
+        self.remaining = 0
+        self.reset = self.date + datetime.timedelta(seconds=retry_after)
+
+        logger.warning('Hit the global rate limit. Requests are held back for %s seconds.', retry_after)
+        self.queue.wake_head()
+
+    def snapshot(self):
+        """Returns a dict describing the current state of the bucket."""
+
+        reset_after = None
+        if self.reset is not None:
+            reset_after = max((self.reset - self.get_current_time).total_seconds(), 0.0)
+
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset': self.reset.timestamp() if self.reset is not None else None,
+            'reset_after': reset_after,
+            'cooling_down': self.cooling_down,
+            'waiters': self.waiters,
+            'queued': [len(lane) for lane in self.queue.lanes],
+        }
 
     async def wait(self):
         """|coro|
@@ -111,7 +232,12 @@ class CooldownBucket:
         """
 
         start = time.time()
-        await self.cooled_down.wait()
+        self.waiters += 1
+        try:
+            await self.cooled_down.wait()
+        finally:
+            self.waiters -= 1
+
         return time.time() - start
 
     async def cooldown(self):
@@ -123,14 +249,81 @@ class CooldownBucket:
         if self.reset < self.get_current_time:
             raise ValueError('Cannot cooldown for a negative time period.')
 
-        self.cooled_down.clear()
+        # Events can't be cleared in newer versions of trio, so waiters get a fresh one.
+        self.cooled_down = trio.Event()
         delay = (self.reset - self.date).total_seconds() + .5
         logger.debug('Cooling down bucket %s for %s seconds.', self, delay)
-        await trio.sleep(delay)
-        self.cooled_down.set()
+        self.waiters += 1
+        try:
+            await trio.sleep(delay)
+        except BaseException:
+            # Waiters must not be stuck if our request was cancelled. One of them will take over.
+            logger.debug('Cooldown of bucket %s was cancelled.', self)
+            raise
+        else:
+            # The window is over. We know how many requests the next one allows,
+            # but not when it resets until the next response says so.
+            self.reset = None
+            self.remaining = self.limit or 0
+        finally:
+            self.waiters -= 1
+            self.cooled_down.set()
+            self.queue.wake_head()
 
         return delay
 
+    async def acquire(self, priority=Priority.NORMAL):
+        """|coro|
+
+        Waits in the lane of the given priority until a request can be made to the bucket
+        and counts it against the current window.
+
+        Waiting requests are served by priority and in order of arrival within a priority.
+        The waiter that is served next cools the bucket down if necessary.
+
+        Returns
+        -------
+        float
+            The duration we waited for.
+        """
+
+        if not self.queue and self.available:
+            self.take()
+            return 0.0
+
+        start = time.time()
+        waiter = self.queue.push(priority)
+        self.waiters += 1
+        try:
+            while True:
+                timeout = math.inf
+                if self.queue.head() is waiter:
+                    if self.available:
+                        self.take()
+                        break
+
+                    if not self.cooling_down and self.will_rate_limit:
+                        await self.cooldown()
+                        continue
+
+                    if self.awaiting_window:
+                        # The requests we let through might all fail without a response.
+                        timeout = self.window
+
+                waiter.woken = trio.Event()
+                with trio.move_on_after(timeout) as scope:
+                    await waiter.woken.wait()
+
+                if scope.cancelled_caught and self.awaiting_window:
+                    logger.debug('No response from bucket %s arrived within its window, assuming a new one.', self)
+                    self.remaining = self.limit
+        finally:
+            self.waiters -= 1
+            self.queue.remove(waiter)
+            self.queue.wake_head()
+
+        return time.time() - start
+
 
 class Limiter:
     """Represents a Limiter for handling per-bucket rate limits.
@@ -141,16 +334,27 @@ class Limiter:
     exhausted, the limiter blocks until the limit resets before making another request to
     the same bucket. This also handles global rate limits and returns the total cooldown duration.
 
+    Requests that have to wait are queued by their :class:`shitcord.http.Priority`, per bucket
+    and for the global rate limit. A waiting request moves up one priority every `aging`
+    seconds, so bulk requests don't starve while interactive ones keep coming in.
+
+    Parameters
+    ----------
+    aging : float, optional
+        The seconds after which a waiting request is treated like one of the next higher priority.
+        Defaults to 10.
+
     Attributes
     ----------
     buckets : :class:`collections.OrderedDict`
         An OrderedDict to keep track of the buckets.
     """
 
-    def __init__(self):
+    def __init__(self, *, aging=10.0):
         self.buckets = OrderedDict()
+        self.aging = aging
 
-    async def chill(self, bucket):
+    async def chill(self, bucket, priority=Priority.NORMAL):
         """|coro|
 
         Checks if it's safe to make a request to the given bucket.
@@ -164,19 +368,34 @@ class Limiter:
         ----------
         bucket : tuple
             The bucket to check.
+        priority : :class:`shitcord.http.Priority`, optional
+            The lane to wait in if the bucket or the global rate limit is exhausted.
         """
 
-        return await self._get_limit_duration('global_rate_limit') + await self._get_limit_duration(bucket)
+        return await self._get_limit_duration('global_rate_limit', priority) + await self._get_limit_duration(bucket, priority)
 
-    async def _get_limit_duration(self, bucket):
-        if bucket in self.buckets:
-            if self.buckets[bucket].cooling_down:
-                return await self.buckets[bucket].wait()
+    async def _get_limit_duration(self, bucket, priority=Priority.NORMAL):
+        state = self.buckets.get(bucket)
+        if state is None:
+            return 0
+
+        return await state.acquire(priority)
+
+    def release(self, bucket):
+        """Gives back a request that was allowed by :meth:`chill` but won't be made."""
 
-            if self.buckets[bucket].will_rate_limit:
-                return await self.buckets[bucket].cooldown()
+        state = self.buckets.get(bucket)
+        if state is not None:
+            state.give_back()
+
+    def snapshot(self):
+        """Returns a dict mapping the known buckets to their current state.
+
+        See :meth:`shitcord.http.CooldownBucket.snapshot` for the state of a single bucket.
+        """
 
-        return 0
+        return {' '.join(bucket) if isinstance(bucket, tuple) else bucket: state.snapshot()
+                for bucket, state in self.buckets.items()}
 
     def update_bucket(self, bucket, response):
         """Updates a :class:`shitcord.http.CooldownBucket` for a given bucket.
@@ -195,4 +414,4 @@ class Limiter:
         if bucket in self.buckets:
             self.buckets[bucket].update(response)
         else:
-            self.buckets[bucket] = CooldownBucket(bucket, response)
+            self.buckets[bucket] = CooldownBucket(bucket, response, aging=self.aging)
@@ -61,6 +61,10 @@ class RESTShit:
         You can specify an optional timeout if you want to limit how long
         a request can take.
 
+        The timeout is a deadline for the whole request. Time spent waiting
+        for the rate limiter counts against it just like the time it takes
+        to send the request and read the response.
+
         Parameters
         ----------
         timeout : int, float, optional
@@ -76,19 +80,12 @@ class RESTShit:
             For the case you provided a timeout and the RESTShit timed out, this exception will be raised.
         """
 
-        await self._lock.acquire()
-
-        async def _release_lock():
-            result = await self.callback(*self.args, **self.kwargs)
-            self._lock.release()
-            self.result = result
-
-        async with trio.open_nursery() as nursery:
-            if timeout is not None:
-                async with trio.fail_after(timeout):
-                    nursery.start_soon(_release_lock)
+        async with self._lock:
+            if timeout is None:
+                self.result = await maybe_awaitable(self.callback, *self.args, **self.kwargs)
             else:
-                nursery.start_soon(_release_lock)
+                with trio.fail_after(timeout):
+                    self.result = await maybe_awaitable(self.callback, *self.args, **self.kwargs)
 
         return self.result
 
@@ -194,7 +191,7 @@ class RESTShit:
         if timeout is None:
             return await maybe_awaitable(callback, *args, **kwargs)
         else:
-            async with trio.fail_after(timeout):
+            with trio.fail_after(timeout):
                 return await maybe_awaitable(callback, *args, **kwargs)
 
 
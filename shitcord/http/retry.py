@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import random
+
+__all__ = ['RetryPolicy']
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request to the Discord API should be retried.
+
+    For 429 responses, the delay the Discord API asks for is honoured exactly.
+    Server errors (5xx) are retried using a capped exponential backoff with full jitter.
+    A request is given up once the amount of retries or the overall deadline would be exceeded.
+
+    Parameters
+    ----------
+    max_retries : int, optional
+        The total amount of retries that are allowed per request. Defaults to 5.
+    base : float, optional
+        The base delay in seconds for the exponential backoff. Defaults to 0.5.
+    cap : float, optional
+        The maximum delay in seconds a single backoff can take. Defaults to 16.
+    deadline : float, optional
+        The total amount of seconds a request including all of its retries may take. Defaults to 60.
+    backoff_scale : float, optional
+        A factor for the backoff delays of server errors. Defaults to 1.
+    seed : int, optional
+        The seed for the jitter of the backoff. Random by default.
+
+    Attributes
+    ----------
+    retries : :class:`collections.Counter`
+        The amount of retries that were made per bucket.
+    """
+
+    def __init__(self, *, max_retries=5, base=0.5, cap=16.0, deadline=60.0, backoff_scale=1.0, seed=None):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.deadline = deadline
+        self.backoff_scale = backoff_scale
+        self.random = random.Random(seed)
+
+        self.retries = collections.Counter()
+
+    def __repr__(self):
+        return '<shitcord.http.RetryPolicy max_retries={0.max_retries} cap={0.cap} deadline={0.deadline}>'.format(self)
+
+    @staticmethod
+    def should_retry(status):
+        """Whether a request with the given status code is worth another attempt."""
+
+        return status == 429 or status >= 500
+
+    @staticmethod
+    def get_retry_after(response, data):
+        """Returns the delay in seconds a 429 response asks for or ``None`` if it doesn't specify one."""
+
+        # The JSON body is more precise than the header. In API v7, it's given in milliseconds.
+        if isinstance(data, dict) and data.get('retry_after') is not None:
+            return data['retry_after'] / 1000.0
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        return None
+
+    def get_delay(self, attempt, response, data):
+        """Computes the delay in seconds before the given attempt should be made.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the retry that is about to be made, starting with 1.
+        response
+            The response of the failed request.
+        data : dict, bytes
+            The parsed body of the failed request.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+
+        if response.status_code == 429:
+            retry_after = self.get_retry_after(response, data)
+            if retry_after is not None:
+                return retry_after
+
+        return self.random.uniform(0, min(self.cap, self.base * 2 ** attempt)) * self.backoff_scale
+
+    def exceeds(self, attempt, elapsed, delay):
+        """Whether retrying after `delay` seconds would exceed the retry budget of a request.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the retry that is about to be made, starting with 1.
+        elapsed : float
+            The seconds that passed since the first attempt was made.
+        delay : float
+            The delay in seconds before the retry would be made.
+        """
+
+        return attempt > self.max_retries or elapsed + delay > self.deadline
+
+    def record(self, bucket):
+        """Records a retry for the given bucket."""
+
+        self.retries[bucket] += 1
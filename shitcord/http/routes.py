@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import operator
+import string
 from enum import Enum
 
+# The parameters that make up a rate limit bucket together with the route.
+MAJOR_PARAMETERS = ('guild', 'channel', 'webhook')
+
 
 class Methods(Enum):
     GET    = 'GET'  # noqa
@@ -11,125 +16,240 @@ class Methods(Enum):
     DELETE = 'DELETE'  # noqa
 
 
+class Route(tuple):
+    """An endpoint of the Discord API that is compiled for building requests.
+
+    Routes are ``(method, path)`` tuples, so they can be unpacked, indexed and compared with
+    plain tuples as before. When a route is created, its path is split into literal parts and
+    parameters once, so building the URL and the rate limit bucket of a request only takes
+    a lookup and a string substitution instead of parsing the path for every request.
+
+    Parameters
+    ----------
+    method : :class:`Methods`
+        The HTTP method of the endpoint.
+    path : str
+        The path of the endpoint with parameters in braces, e.g. ``/channels/{channel}``.
+
+    Attributes
+    ----------
+    method : :class:`Methods`
+        The HTTP method of the endpoint.
+    path : str
+        The path of the endpoint.
+    key : str
+        The method and path joined by a space. Used as key for per-endpoint metrics.
+    fields : tuple
+        The names of the parameters in the order they appear in the path.
+    """
+
+    _compiled = {}
+
+    def __new__(cls, method, path):
+        self = super().__new__(cls, (method, path))
+
+        template = []
+        bucket_template = []
+        fields = []
+        major = []
+        for literal, field, _, _ in string.Formatter().parse(path):
+            literal = literal.replace('%', '%%')
+            template.append(literal)
+            bucket_template.append(literal)
+            if field is not None:
+                fields.append(field)
+                template.append('%s')
+                # Minor parameters are left out of the bucket.
+                if field in MAJOR_PARAMETERS:
+                    major.append(field)
+                    bucket_template.append('%s')
+
+        self.method = method
+        self.path = path
+        self.key = '{} {}'.format(method.value, path)
+        self.fields = tuple(fields)
+
+        self._template = ''.join(template)
+        self._getter = _tuple_getter(fields)
+        self._bucket_template = ''.join(bucket_template)
+        self._major = tuple(major)
+        self._bucket = (method.value, self._bucket_template % ()) if not major else None
+
+        return self
+
+    def __reduce__(self):
+        return type(self), (self.method, self.path)
+
+    def __repr__(self):
+        return '<shitcord.http.Route {}>'.format(self.key)
+
+    @classmethod
+    def compile(cls, route):
+        """Returns the :class:`Route` for a ``(method, path)`` tuple.
+
+        Routes are returned as they are, tuples are compiled once and cached.
+        """
+
+        if isinstance(route, cls):
+            return route
+
+        compiled = cls._compiled.get(route)
+        if compiled is None:
+            compiled = cls._compiled[route] = cls(*route)
+        return compiled
+
+    def format(self, fmt):
+        """Returns the path with the parameters filled in from the dict `fmt`.
+
+        Raises
+        ------
+        KeyError
+            Will be raised if `fmt` lacks a parameter of the path.
+        """
+
+        return self._template % self._getter(fmt)
+
+    def get_bucket(self, fmt):
+        """Returns the rate limit bucket for a request with the parameters from the dict `fmt`.
+
+        Only the major parameters ``guild``, ``channel`` and ``webhook`` are part of the bucket.
+        Missing parameters are treated as empty.
+        """
+
+        if self._bucket is not None:
+            return self._bucket
+
+        return self.method.value, self._bucket_template % tuple([fmt.get(field, '') for field in self._major])
+
+
+def _tuple_getter(fields):
+    if len(fields) > 1:
+        return operator.itemgetter(*fields)
+    if fields:
+        field = fields[0]
+        return lambda fmt: (fmt[field],)
+    return lambda fmt: ()
+
+
 class Endpoints:
     # Guild
     GUILD                             = '/guilds'  # noqa
-    CREATE_GUILD                      = (Methods.POST, GUILD)  # noqa
-    GET_GUILD                         = (Methods.GET, GUILD + '/{guild}')  # noqa
-    MODIFY_GUILD                      = (Methods.PATCH, GUILD + '/{guild}')  # noqa
-    DELETE_GUILD                      = (Methods.DELETE, GUILD + '/{guild}')  # noqa
-    GET_GUILD_CHANNELS                = (Methods.GET, GUILD + '/{guild}/channels')  # noqa
-    CREATE_GUILD_CHANNEL              = (Methods.POST, GUILD + '/{guild}/channels')  # noqa
-    MODIFY_GUILD_CHANNEL_POSITIONS    = (Methods.PATCH, '/{guild}/channels')  # noqa
-    GET_GUILD_MEMBER                  = (Methods.GET, GUILD + '/{guild}/members/{member}')  # noqa
-    LIST_GUILD_MEMBERS                = (Methods.GET, GUILD + '/{guild}/members')  # noqa
-    ADD_GUILD_MEMBER                  = (Methods.PUT, GUILD + '/{guild}/members/{member}')  # noqa
-    MODIFY_GUILD_MEMBER               = (Methods.PATCH, GUILD + '/{guild}/members/{member}')  # noqa
-    MODIFY_CURRENT_USER_NICK          = (Methods.PATCH, GUILD + '/{guild}/members/@me/nick')  # noqa
-    ADD_GUILD_MEMBER_ROLE             = (Methods.PUT, GUILD + '/{guild}/members/{member}/roles/{role}')  # noqa
-    REMOVE_GUILD_MEMBER_ROLE          = (Methods.DELETE, GUILD + '/{guild}/members/{member}/roles/{role}')  # noqa
-    REMOVE_GUILD_MEMBER               = (Methods.DELETE, GUILD + '/{guild}/members/{member}')  # noqa
-    GET_GUILD_BANS                    = (Methods.GET, GUILD + '/{guild}/bans')  # noqa
-    GET_GUILD_BAN                     = (Methods.GET, GUILD + '/{guild}/bans/{user}')  # noqa
-    CREATE_GUILD_BAN                  = (Methods.PUT, GUILD + '/{guild}/bans/{user}')  # noqa
-    REMOVE_GUILD_BAN                  = (Methods.DELETE, GUILD + '/{guild}/bans/{user}')  # noqa
-    GET_GUILD_ROLES                   = (Methods.GET, GUILD + '/{guild}/roles')  # noqa
-    CREATE_GUILD_ROLE                 = (Methods.POST, GUILD + '/{guild}/roles')  # noqa
-    MODIFY_GUILD_ROLE_POSITIONS       = (Methods.PATCH, GUILD + '/{guild}/roles')  # noqa
-    MODIFY_GUILD_ROLE                 = (Methods.PATCH, GUILD + '/{guild}/roles/{role}')  # noqa
-    DELETE_GUILD_ROLE                 = (Methods.DELETE, GUILD + '/{guild}/roles/{role}')  # noqa
-    GET_GUILD_PRUNE_COUNT             = (Methods.GET, GUILD + '/{guild}/prune')  # noqa
-    BEGIN_GUILD_PRUNE                 = (Methods.POST, GUILD + '/{guild}/prune')  # noqa
-    GET_GUILD_VOICE_REGIONS           = (Methods.GET, GUILD + '/{guild}/regions')  # noqa
-    GET_GUILD_INVITES                 = (Methods.GET, GUILD + '/{guild}/invites')  # noqa
-    GET_GUILD_INTEGRATIONS            = (Methods.GET, GUILD + '/{guild}/integrations')  # noqa
-    CREATE_GUILD_INTEGRATION          = (Methods.POST, GUILD + '/{guild}/integrations')  # noqa
-    MODIFY_GUILD_INTEGRATION          = (Methods.PATCH, GUILD + '/{guild}/integrations/{integration}')  # noqa
-    DELETE_GUILD_INTEGRATION          = (Methods.DELETE, GUILD + '/{guild}/integrations/{integration}')  # noqa
-    SYNC_GUILD_INTEGRATION            = (Methods.POST, GUILD + '/{guild}/integrations/{integration}/sync')  # noqa
-    GET_GUILD_EMBED                   = (Methods.GET, GUILD + '/{guild}/embed')  # noqa
-    MODIFY_GUILD_EMBED                = (Methods.PATCH, GUILD + '/{guild}/embed')  # noqa
-    GET_GUILD_VANITY_URL              = (Methods.GET, GUILD + '/{guild}/vanity-url')  # noqa
+    CREATE_GUILD                      = Route(Methods.POST, GUILD)  # noqa
+    GET_GUILD                         = Route(Methods.GET, GUILD + '/{guild}')  # noqa
+    MODIFY_GUILD                      = Route(Methods.PATCH, GUILD + '/{guild}')  # noqa
+    DELETE_GUILD                      = Route(Methods.DELETE, GUILD + '/{guild}')  # noqa
+    GET_GUILD_CHANNELS                = Route(Methods.GET, GUILD + '/{guild}/channels')  # noqa
+    CREATE_GUILD_CHANNEL              = Route(Methods.POST, GUILD + '/{guild}/channels')  # noqa
+    MODIFY_GUILD_CHANNEL_POSITIONS    = Route(Methods.PATCH, '/{guild}/channels')  # noqa
+    GET_GUILD_MEMBER                  = Route(Methods.GET, GUILD + '/{guild}/members/{member}')  # noqa
+    LIST_GUILD_MEMBERS                = Route(Methods.GET, GUILD + '/{guild}/members')  # noqa
+    ADD_GUILD_MEMBER                  = Route(Methods.PUT, GUILD + '/{guild}/members/{member}')  # noqa
+    MODIFY_GUILD_MEMBER               = Route(Methods.PATCH, GUILD + '/{guild}/members/{member}')  # noqa
+    MODIFY_CURRENT_USER_NICK          = Route(Methods.PATCH, GUILD + '/{guild}/members/@me/nick')  # noqa
+    ADD_GUILD_MEMBER_ROLE             = Route(Methods.PUT, GUILD + '/{guild}/members/{member}/roles/{role}')  # noqa
+    REMOVE_GUILD_MEMBER_ROLE          = Route(Methods.DELETE, GUILD + '/{guild}/members/{member}/roles/{role}')  # noqa
+    REMOVE_GUILD_MEMBER               = Route(Methods.DELETE, GUILD + '/{guild}/members/{member}')  # noqa
+    GET_GUILD_BANS                    = Route(Methods.GET, GUILD + '/{guild}/bans')  # noqa
+    GET_GUILD_BAN                     = Route(Methods.GET, GUILD + '/{guild}/bans/{user}')  # noqa
+    CREATE_GUILD_BAN                  = Route(Methods.PUT, GUILD + '/{guild}/bans/{user}')  # noqa
+    REMOVE_GUILD_BAN                  = Route(Methods.DELETE, GUILD + '/{guild}/bans/{user}')  # noqa
+    GET_GUILD_ROLES                   = Route(Methods.GET, GUILD + '/{guild}/roles')  # noqa
+    CREATE_GUILD_ROLE                 = Route(Methods.POST, GUILD + '/{guild}/roles')  # noqa
+    MODIFY_GUILD_ROLE_POSITIONS       = Route(Methods.PATCH, GUILD + '/{guild}/roles')  # noqa
+    MODIFY_GUILD_ROLE                 = Route(Methods.PATCH, GUILD + '/{guild}/roles/{role}')  # noqa
+    DELETE_GUILD_ROLE                 = Route(Methods.DELETE, GUILD + '/{guild}/roles/{role}')  # noqa
+    GET_GUILD_PRUNE_COUNT             = Route(Methods.GET, GUILD + '/{guild}/prune')  # noqa
+    BEGIN_GUILD_PRUNE                 = Route(Methods.POST, GUILD + '/{guild}/prune')  # noqa
+    GET_GUILD_VOICE_REGIONS           = Route(Methods.GET, GUILD + '/{guild}/regions')  # noqa
+    GET_GUILD_INVITES                 = Route(Methods.GET, GUILD + '/{guild}/invites')  # noqa
+    GET_GUILD_INTEGRATIONS            = Route(Methods.GET, GUILD + '/{guild}/integrations')  # noqa
+    CREATE_GUILD_INTEGRATION          = Route(Methods.POST, GUILD + '/{guild}/integrations')  # noqa
+    MODIFY_GUILD_INTEGRATION          = Route(Methods.PATCH, GUILD + '/{guild}/integrations/{integration}')  # noqa
+    DELETE_GUILD_INTEGRATION          = Route(Methods.DELETE, GUILD + '/{guild}/integrations/{integration}')  # noqa
+    SYNC_GUILD_INTEGRATION            = Route(Methods.POST, GUILD + '/{guild}/integrations/{integration}/sync')  # noqa
+    GET_GUILD_EMBED                   = Route(Methods.GET, GUILD + '/{guild}/embed')  # noqa
+    MODIFY_GUILD_EMBED                = Route(Methods.PATCH, GUILD + '/{guild}/embed')  # noqa
+    GET_GUILD_VANITY_URL              = Route(Methods.GET, GUILD + '/{guild}/vanity-url')  # noqa
 
     # Channel
     CHANNEL                           = '/channels/{channel}'  # noqa
-    GET_CHANNEL                       = (Methods.GET, CHANNEL)  # noqa
-    MODIFY_CHANNEL                    = (Methods.PATCH, CHANNEL)  # noqa
-    DELETE_CHANNEL                    = (Methods.DELETE, CHANNEL)  # noqa
-    GET_CHANNEL_MESSAGES              = (Methods.GET, CHANNEL + '/messages')  # noqa
-    GET_CHANNEL_MESSAGE               = (Methods.GET, CHANNEL + '/messages/{message}')  # noqa
-    CREATE_MESSAGE                    = (Methods.POST, CHANNEL + '/messages')  # noqa
-    CREATE_REACTION                   = (Methods.PUT, CHANNEL + '/messages/{message}/reactions/{emoji}/@me')  # noqa
-    DELETE_OWN_REACTION               = (Methods.DELETE, CHANNEL + '/messages/{message}/reactions/{emoji}/@me')  # noqa
-    DELETE_USER_REACTION              = (Methods.DELETE, CHANNEL + '/messages/{message}/reactions/{emoji}/{user}')  # noqa
-    GET_REACTIONS                     = (Methods.GET, CHANNEL + '/messages/{message}/reactions/{emoji}')  # noqa
-    DELETE_ALL_REACTIONS              = (Methods.DELETE, CHANNEL + '/messages/{message}/reactions')  # noqa
-    EDIT_MESSAGE                      = (Methods.PATCH, CHANNEL + '/messages/{message}')  # noqa
-    DELETE_MESSAGE                    = (Methods.DELETE, CHANNEL + '/messages/{message}')  # noqa
-    BULK_DELETE_MESSAGES              = (Methods.POST, CHANNEL + '/messages/bulk-delete')  # noqa
-    EDIT_CHANNEL_PERMISSIONS          = (Methods.PUT, CHANNEL + '/permissions/{permission}')  # noqa
-    GET_CHANNEL_INVITES               = (Methods.GET, CHANNEL + '/invites')  # noqa
-    CREATE_CHANNEL_INVITE             = (Methods.POST, CHANNEL + '/invites')  # noqa
-    DELETE_CHANNEL_PERMISSION         = (Methods.DELETE, CHANNEL + '/permissions/{permission}')  # noqa
-    TRIGGER_TYPING_INDICATOR          = (Methods.POST, CHANNEL + '/typing')  # noqa
-    GET_PINNED_MESSAGES               = (Methods.GET, CHANNEL + '/pins')  # noqa
-    ADD_PINNED_CHANNEL_MESSAGE        = (Methods.PUT, CHANNEL + '/pins/{message}')  # noqa
-    DELETE_PINNED_CHANNEL_MESSAGE     = (Methods.DELETE, CHANNEL + '/pins/{message}')  # noqa
-    GROUP_DM_ADD_RECIPIENT            = (Methods.PUT, CHANNEL + '/recipients/{user}')  # noqa
-    GROUP_DM_REMOVE_RECIPIENT         = (Methods.DELETE, CHANNEL + '/recipients/{user}')  # noqa
+    GET_CHANNEL                       = Route(Methods.GET, CHANNEL)  # noqa
+    MODIFY_CHANNEL                    = Route(Methods.PATCH, CHANNEL)  # noqa
+    DELETE_CHANNEL                    = Route(Methods.DELETE, CHANNEL)  # noqa
+    GET_CHANNEL_MESSAGES              = Route(Methods.GET, CHANNEL + '/messages')  # noqa
+    GET_CHANNEL_MESSAGE               = Route(Methods.GET, CHANNEL + '/messages/{message}')  # noqa
+    CREATE_MESSAGE                    = Route(Methods.POST, CHANNEL + '/messages')  # noqa
+    CREATE_REACTION                   = Route(Methods.PUT, CHANNEL + '/messages/{message}/reactions/{emoji}/@me')  # noqa
+    DELETE_OWN_REACTION               = Route(Methods.DELETE, CHANNEL + '/messages/{message}/reactions/{emoji}/@me')  # noqa
+    DELETE_USER_REACTION              = Route(Methods.DELETE, CHANNEL + '/messages/{message}/reactions/{emoji}/{user}')  # noqa
+    GET_REACTIONS                     = Route(Methods.GET, CHANNEL + '/messages/{message}/reactions/{emoji}')  # noqa
+    DELETE_ALL_REACTIONS              = Route(Methods.DELETE, CHANNEL + '/messages/{message}/reactions')  # noqa
+    EDIT_MESSAGE                      = Route(Methods.PATCH, CHANNEL + '/messages/{message}')  # noqa
+    DELETE_MESSAGE                    = Route(Methods.DELETE, CHANNEL + '/messages/{message}')  # noqa
+    BULK_DELETE_MESSAGES              = Route(Methods.POST, CHANNEL + '/messages/bulk-delete')  # noqa
+    EDIT_CHANNEL_PERMISSIONS          = Route(Methods.PUT, CHANNEL + '/permissions/{permission}')  # noqa
+    GET_CHANNEL_INVITES               = Route(Methods.GET, CHANNEL + '/invites')  # noqa
+    CREATE_CHANNEL_INVITE             = Route(Methods.POST, CHANNEL + '/invites')  # noqa
+    DELETE_CHANNEL_PERMISSION         = Route(Methods.DELETE, CHANNEL + '/permissions/{permission}')  # noqa
+    TRIGGER_TYPING_INDICATOR          = Route(Methods.POST, CHANNEL + '/typing')  # noqa
+    GET_PINNED_MESSAGES               = Route(Methods.GET, CHANNEL + '/pins')  # noqa
+    ADD_PINNED_CHANNEL_MESSAGE        = Route(Methods.PUT, CHANNEL + '/pins/{message}')  # noqa
+    DELETE_PINNED_CHANNEL_MESSAGE     = Route(Methods.DELETE, CHANNEL + '/pins/{message}')  # noqa
+    GROUP_DM_ADD_RECIPIENT            = Route(Methods.PUT, CHANNEL + '/recipients/{user}')  # noqa
+    GROUP_DM_REMOVE_RECIPIENT         = Route(Methods.DELETE, CHANNEL + '/recipients/{user}')  # noqa
 
     # Audit Log
-    GET_GUILD_AUDIT_LOG               = (Methods.GET, GUILD + '/{guild}/audit-logs')  # noqa
+    GET_GUILD_AUDIT_LOG               = Route(Methods.GET, GUILD + '/{guild}/audit-logs')  # noqa
 
     # Emoji
     EMOJI                             = '/emojis'  # noqa
-    LIST_GUILD_EMOJIS                 = (Methods.GET, GUILD + '/{guild}' + EMOJI)  # noqa
-    GET_GUILD_EMOJI                   = (Methods.GET, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
-    CREATE_GUILD_EMOJI                = (Methods.POST, GUILD + '/{guild}' + EMOJI)  # noqa
-    MODIFY_GUILD_EMOJI                = (Methods.PATCH, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
-    DELETE_GUILD_EMOJI                = (Methods.DELETE, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
+    LIST_GUILD_EMOJIS                 = Route(Methods.GET, GUILD + '/{guild}' + EMOJI)  # noqa
+    GET_GUILD_EMOJI                   = Route(Methods.GET, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
+    CREATE_GUILD_EMOJI                = Route(Methods.POST, GUILD + '/{guild}' + EMOJI)  # noqa
+    MODIFY_GUILD_EMOJI                = Route(Methods.PATCH, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
+    DELETE_GUILD_EMOJI                = Route(Methods.DELETE, GUILD + '/{guild}' + EMOJI + '/{emoji}')  # noqa
 
     # Invite
     INVITE                            = '/invites/{invite}'  # noqa
-    GET_INVITE                        = (Methods.GET, INVITE)  # noqa
-    DELETE_INVITE                     = (Methods.DELETE, INVITE)  # noqa
+    GET_INVITE                        = Route(Methods.GET, INVITE)  # noqa
+    DELETE_INVITE                     = Route(Methods.DELETE, INVITE)  # noqa
 
     # User
     USER                              = '/users'  # noqa
-    GET_CURRENT_USER                  = (Methods.GET, USER + '/@me')  # noqa
-    GET_USER                          = (Methods.GET, USER + '/{user}')  # noqa
-    MODIFY_CURRENT_USER               = (Methods.PATCH, USER + '/@me')  # noqa
-    GET_CURRENT_USER_GUILDS           = (Methods.GET, USER + '/@me/guilds')  # noqa
-    LEAVE_GUILD                       = (Methods.DELETE, USER + '/@me/guilds/{guild}')  # noqa
-    GET_USER_DMS                      = (Methods.GET, USER + '/@me/channels')  # noqa
-    CREATE_DM                         = (Methods.POST, USER + '/@me/channels')  # noqa
-    CREATE_GROUP_DM                   = (Methods.POST, USER + '/@me/channels')  # noqa
-    GET_USER_CONNECTIONS              = (Methods.GET, USER + '/@me/connections')  # noqa
+    GET_CURRENT_USER                  = Route(Methods.GET, USER + '/@me')  # noqa
+    GET_USER                          = Route(Methods.GET, USER + '/{user}')  # noqa
+    MODIFY_CURRENT_USER               = Route(Methods.PATCH, USER + '/@me')  # noqa
+    GET_CURRENT_USER_GUILDS           = Route(Methods.GET, USER + '/@me/guilds')  # noqa
+    LEAVE_GUILD                       = Route(Methods.DELETE, USER + '/@me/guilds/{guild}')  # noqa
+    GET_USER_DMS                      = Route(Methods.GET, USER + '/@me/channels')  # noqa
+    CREATE_DM                         = Route(Methods.POST, USER + '/@me/channels')  # noqa
+    CREATE_GROUP_DM                   = Route(Methods.POST, USER + '/@me/channels')  # noqa
+    GET_USER_CONNECTIONS              = Route(Methods.GET, USER + '/@me/connections')  # noqa
 
     # Voice
     VOICE                             = '/voice/regions'  # noqa
-    LIST_VOICE_REGIONS                = (Methods.GET, VOICE)  # noqa
+    LIST_VOICE_REGIONS                = Route(Methods.GET, VOICE)  # noqa
 
     # Webhook
     WEBHOOK                           = '/webhooks'  # noqa
-    CREATE_WEBHOOK                    = (Methods.POST, CHANNEL + WEBHOOK)  # noqa
-    GET_CHANNEL_WEBHOOKS              = (Methods.GET, CHANNEL + WEBHOOK)  # noqa
-    GET_GUILD_WEBHOOKS                = (Methods.GET, GUILD + '/{guild}' + WEBHOOK)  # noqa
-    GET_WEBHOOK                       = (Methods.GET, WEBHOOK + '/{webhook}')  # noqa
-    GET_WEBHOOK_WITH_TOKEN            = (Methods.GET, WEBHOOK + '/{webhook}/{token}')  # noqa
-    MODIFY_WEBHOOK                    = (Methods.PATCH, WEBHOOK + '/{webhook}')  # noqa
-    MODIFY_WEBHOOK_WITH_TOKEN         = (Methods.PATCH, WEBHOOK + '/{webhook}/{token}')  # noqa
-    DELETE_WEBHOOK                    = (Methods.DELETE, WEBHOOK + '/{webhook}')  # noqa
-    DELETE_WEBHOOK_WITH_TOKEN         = (Methods.DELETE, WEBHOOK + '/{webhook}/{token}')  # noqa
-    EXECUTE_WEBHOOK                   = (Methods.POST, WEBHOOK + '/{webhook}/{token}')  # noqa
-    EXECUTE_SLACK_COMPATIBLE_WEBHOOK  = (Methods.POST, WEBHOOK + '/{webhook}/{token}/slack')  # noqa
-    EXECUTE_GITHUB_COMPATIBLE_WEBHOOK = (Methods.POST, WEBHOOK + '/{webhook}/{token}/github')  # noqa
+    CREATE_WEBHOOK                    = Route(Methods.POST, CHANNEL + WEBHOOK)  # noqa
+    GET_CHANNEL_WEBHOOKS              = Route(Methods.GET, CHANNEL + WEBHOOK)  # noqa
+    GET_GUILD_WEBHOOKS                = Route(Methods.GET, GUILD + '/{guild}' + WEBHOOK)  # noqa
+    GET_WEBHOOK                       = Route(Methods.GET, WEBHOOK + '/{webhook}')  # noqa
+    GET_WEBHOOK_WITH_TOKEN            = Route(Methods.GET, WEBHOOK + '/{webhook}/{token}')  # noqa
+    MODIFY_WEBHOOK                    = Route(Methods.PATCH, WEBHOOK + '/{webhook}')  # noqa
+    MODIFY_WEBHOOK_WITH_TOKEN         = Route(Methods.PATCH, WEBHOOK + '/{webhook}/{token}')  # noqa
+    DELETE_WEBHOOK                    = Route(Methods.DELETE, WEBHOOK + '/{webhook}')  # noqa
+    DELETE_WEBHOOK_WITH_TOKEN         = Route(Methods.DELETE, WEBHOOK + '/{webhook}/{token}')  # noqa
+    EXECUTE_WEBHOOK                   = Route(Methods.POST, WEBHOOK + '/{webhook}/{token}')  # noqa
+    EXECUTE_SLACK_COMPATIBLE_WEBHOOK  = Route(Methods.POST, WEBHOOK + '/{webhook}/{token}/slack')  # noqa
+    EXECUTE_GITHUB_COMPATIBLE_WEBHOOK = Route(Methods.POST, WEBHOOK + '/{webhook}/{token}/github')  # noqa
 
     # OAuth2
     OAUTH                             = '/oauth2/applications'  # noqa
-    GET_CURRENT_APPLICATION_INFO      = (Methods.GET, OAUTH + '/@me')  # noqa
+    GET_CURRENT_APPLICATION_INFO      = Route(Methods.GET, OAUTH + '/@me')  # noqa
 
     # Gateway
     GATEWAY                           = '/gateway'  # noqa
-    GET_GATEWAY                       = (Methods.GET, GATEWAY)  # noqa
-    GET_GATEWAY_BOT                   = (Methods.GET, GATEWAY + '/bot')  # noqa
+    GET_GATEWAY                       = Route(Methods.GET, GATEWAY)  # noqa
+    GET_GATEWAY_BOT                   = Route(Methods.GET, GATEWAY + '/bot')  # noqa
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import logging
+
+import trio
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['MessageQueue']
+
+
+class _PendingMessage:
+    __slots__ = ('content', 'embed', 'created', 'done', 'result', 'error')
+
+    def __init__(self, content, embed):
+        self.content = content
+        self.embed = embed
+        self.created = trio.current_time()
+        self.done = trio.Event()
+        self.result = None
+        self.error = None
+
+
+class _ChannelQueue:
+    __slots__ = ('channel_id', 'pending', 'full')
+
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+        self.pending = collections.deque()
+        self.full = trio.Event()
+
+
+class MessageQueue:
+    """Merges messages that are sent to the same channel in quick succession.
+
+    Pending text messages of a channel are joined into a single message as long as it stays
+    within the character limit. Bot messages in this API version can only carry a single embed,
+    so a message with an embed can take the text of other messages, but not their embeds.
+
+    A channel's pending messages are sent once a message with all of them wouldn't fit anymore
+    or once the oldest of them has waited for `max_delay` seconds. While a message is being sent,
+    new ones pile up, so a channel that is rate limited automatically gets larger messages.
+
+    .. code-block:: python3
+
+        messages = []
+
+        async def send(queue, content):
+            messages.append(await queue.send(channel_id, content))
+
+        async with MessageQueue(api) as queue, trio.open_nursery() as nursery:
+            # Both lines end up in the same message.
+            nursery.start_soon(send, queue, 'Line 1')
+            nursery.start_soon(send, queue, 'Line 2')
+
+        assert messages[0] is messages[1]
+
+    Parameters
+    ----------
+    api : :class:`shitcord.http.API`
+        The API client to send the messages with.
+    max_delay : float, optional
+        The maximum seconds a message waits for others before being sent. Defaults to 0.5.
+    max_length : int, optional
+        The maximum length of a merged message. Defaults to 2000.
+    separator : str, optional
+        The string to join the content of merged messages with. Defaults to a newline.
+
+    Attributes
+    ----------
+    sent : int
+        The amount of messages that were actually sent.
+    queued : int
+        The amount of messages that were passed to :meth:`send`.
+    """
+
+    def __init__(self, api, *, max_delay=0.5, max_length=2000, separator='\n'):
+        self.api = api
+        self.max_delay = max_delay
+        self.max_length = max_length
+        self.separator = separator
+
+        self.sent = 0
+        self.queued = 0
+
+        self._channels = {}
+        self._nursery_manager = None
+        self._nursery = None
+        self._closing = False
+
+    def __repr__(self):
+        return '<shitcord.http.MessageQueue channels={} queued={} sent={}>'.format(len(self._channels), self.queued, self.sent)
+
+    async def __aenter__(self):
+        self._closing = False
+        self._nursery_manager = trio.open_nursery()
+        self._nursery = await self._nursery_manager.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Don't let anyone wait for their deadline anymore.
+        self._closing = True
+        for queue in self._channels.values():
+            queue.full.set()
+
+        try:
+            return await self._nursery_manager.__aexit__(*exc_info)
+        finally:
+            self._nursery = None
+
+    def _fits(self, length, content, has_embed, embed):
+        if embed is not None and has_embed:
+            return False
+
+        if length and content:
+            length += len(self.separator)
+        return length + len(content) <= self.max_length
+
+    def _is_full(self, queue):
+        """Whether the first message that would be sent from a queue can't take any more content."""
+
+        length = 0
+        has_embed = False
+        for message in queue.pending:
+            if not self._fits(length, message.content, has_embed, message.embed):
+                return True
+
+            if length and message.content:
+                length += len(self.separator)
+            length += len(message.content)
+            has_embed = has_embed or message.embed is not None
+
+        return length >= self.max_length
+
+    def _take_batch(self, queue):
+        batch = [queue.pending.popleft()]
+        length = len(batch[0].content)
+        has_embed = batch[0].embed is not None
+
+        while queue.pending and self._fits(length, queue.pending[0].content, has_embed, queue.pending[0].embed):
+            message = queue.pending.popleft()
+            if length and message.content:
+                length += len(self.separator)
+            length += len(message.content)
+            has_embed = has_embed or message.embed is not None
+            batch.append(message)
+
+        return batch
+
+    async def _send_batch(self, channel_id, batch):
+        content = self.separator.join(message.content for message in batch if message.content)
+        embed = next((message.embed for message in batch if message.embed is not None), None)
+
+        try:
+            result = await self.api.create_message(channel_id, content or None, embed=embed)
+        except Exception as error:
+            for message in batch:
+                message.error = error
+        else:
+            for message in batch:
+                message.result = result
+        finally:
+            self.sent += 1
+            for message in batch:
+                message.done.set()
+
+    async def _run(self, queue):
+        while queue.pending:
+            if not self._closing:
+                with trio.move_on_at(queue.pending[0].created + self.max_delay):
+                    await queue.full.wait()
+            queue.full = trio.Event()
+
+            batch = self._take_batch(queue)
+            logger.debug('Sending %s merged messages to channel %s.', len(batch), queue.channel_id)
+            await self._send_batch(queue.channel_id, batch)
+
+        del self._channels[queue.channel_id]
+
+    async def send(self, channel_id, content=None, *, embed=None):
+        """|coro|
+
+        Queues a message and waits until it was sent.
+
+        Parameters
+        ----------
+        channel_id : int
+            The ID of the channel to send the message to.
+        content : str, optional
+            The content of the message.
+        embed : :class:`shitcord.models.Embed`, optional
+            An embed to send with the message.
+
+        Returns
+        -------
+        :class:`shitcord.models.Message`
+            The message the content ended up in. Every caller whose content was merged
+            into the same message gets the same object.
+
+        Raises
+        ------
+        RuntimeError
+            Will be raised if the queue isn't used as asynchronous context manager.
+        ShitRequestFailed
+            Will be raised if the message the content was merged into couldn't be sent.
+        """
+
+        if self._nursery is None:
+            raise RuntimeError('MessageQueue must be used as asynchronous context manager.')
+
+        queue = self._channels.get(channel_id)
+        if queue is None:
+            queue = self._channels[channel_id] = _ChannelQueue(channel_id)
+            self._nursery.start_soon(self._run, queue)
+
+        message = _PendingMessage(content or '', embed)
+        queue.pending.append(message)
+        self.queued += 1
+
+        if self._is_full(queue):
+            queue.full.set()
+
+        await message.done.wait()
+        if message.error is not None:
+            raise message.error
+
+        return message.result
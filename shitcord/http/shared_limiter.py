@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import socket
+import sys
+import time
+
+import trio
+
+from .priority import Priority
+from .rate_limit import Limiter, _get_reset_after
+from .window import RateLimitWindow
+from ..utils.compat import BrokenResourceError, CancelScope, spawn_system_task
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['LimiterCoordinator', 'SharedLimiter']
+
+GLOBAL_BUCKET = 'global_rate_limit'
+
+
+def _format_bucket(bucket):
+    return ' '.join(bucket) if isinstance(bucket, tuple) else bucket
+
+
+class _LineStream:
+    """Sends and receives newline-delimited JSON messages over a stream."""
+
+    __slots__ = ('stream', '_buffer')
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._buffer = bytearray()
+
+    async def send(self, message):
+        await self.stream.send_all(json.dumps(message).encode('utf-8') + b'\n')
+
+    async def receive(self):
+        while True:
+            index = self._buffer.find(b'\n')
+            if index >= 0:
+                line = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                return json.loads(line)
+
+            data = await self.stream.receive_some(65536)
+            if not data:
+                return None
+            self._buffer += data
+
+
+class LimiterCoordinator:
+    """Tracks the rate limit buckets of all processes that use the same bot token on one host.
+
+    Every :class:`shitcord.http.SharedLimiter` connects to the coordinator through a Unix socket,
+    reserves a request before sending it and reports the rate limit headers of the responses
+    along with its next reservation.
+    Reservations count against a bucket immediately, so processes can't overshoot a limit
+    together while their requests are still in flight.
+
+    The coordinator can be run as a standalone process:
+
+    .. code-block:: shell
+
+        python -m shitcord.http.shared_limiter /tmp/shitcord-limiter.sock
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket to listen on.
+
+    Attributes
+    ----------
+    buckets : dict
+        A dict mapping buckets to their state.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.buckets = {}
+        self.global_reset = 0.0
+
+    def __repr__(self):
+        return '<shitcord.http.LimiterCoordinator path={0.path!r} buckets={1}>'.format(self, len(self.buckets))
+
+    def _get_bucket(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = RateLimitWindow()
+        return bucket
+
+    def acquire(self, key):
+        """Reserves a request to a bucket and returns the seconds to wait before trying again, if any."""
+
+        now = time.time()
+        if now < self.global_reset:
+            return self.global_reset - now
+
+        return self._get_bucket(key).acquire(now)
+
+    def release(self, key):
+        """Gives back a reservation of a request that wasn't made, e.g. because it timed out."""
+
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.release(time.time())
+
+    def update(self, key, limit, remaining, reset):
+        """Updates a bucket with the rate limit headers of a response.
+
+        Parameters
+        ----------
+        key : str
+            The bucket.
+        limit : int
+            The value of the ``X-RateLimit-Limit`` header. ``None`` if the route isn't rate limited.
+        remaining : int
+            The value of the ``X-RateLimit-Remaining`` header.
+        reset : float
+            The UNIX timestamp at which the bucket resets, on the local clock.
+            For the global rate limit, the time at which requests can be made again.
+        """
+
+        if key == GLOBAL_BUCKET:
+            self.global_reset = max(self.global_reset, reset)
+        else:
+            self._get_bucket(key).update(limit, remaining, reset, time.time())
+
+    def snapshot(self):
+        """Returns a dict mapping the buckets to their current state."""
+
+        now = time.time()
+        buckets = {key: {'limit': bucket.limit, 'remaining': bucket.remaining, 'reset_after': max(bucket.reset - now, 0.0)}
+                   for key, bucket in self.buckets.items()}
+        buckets[GLOBAL_BUCKET] = {'reset_after': max(self.global_reset - now, 0.0)}
+        return buckets
+
+    def _handle_message(self, message):
+        for update in message.get('updates', ()):
+            self.update(*update)
+        for key in message.get('releases', ()):
+            self.release(key)
+
+        op = message.get('op')
+        if op == 'acquire':
+            return {'delay': self.acquire(message['bucket'])}
+        if op == 'update':
+            return {}
+        if op == 'snapshot':
+            return {'buckets': self.snapshot()}
+
+        return {'error': 'Unknown operation {!r}.'.format(op)}
+
+    async def _handle_connection(self, stream):
+        lines = _LineStream(stream)
+        try:
+            while True:
+                message = await lines.receive()
+                if message is None:
+                    break
+
+                await lines.send(self._handle_message(message))
+        except (BrokenResourceError, trio.ClosedResourceError, ValueError) as error:
+            logger.debug('Limiter connection closed: %s', error)
+        finally:
+            await stream.aclose()
+
+    async def serve(self, *, task_status=trio.TASK_STATUS_IGNORED):
+        """|coro|
+
+        Listens for limiters until cancelled. Use ``nursery.start(coordinator.serve)``
+        to wait until the socket is ready.
+        """
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        sock = trio.socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        await sock.bind(self.path)
+        sock.listen()
+
+        logger.debug('Limiter coordinator listening on %s.', self.path)
+        task_status.started(self)
+
+        try:
+            await trio.serve_listeners(self._handle_connection, [trio.SocketListener(sock)])
+        finally:
+            os.unlink(self.path)
+
+
+class SharedLimiter(Limiter):
+    """A :class:`shitcord.http.Limiter` that shares the rate limit state with other processes.
+
+    Requests are reserved at a :class:`shitcord.http.LimiterCoordinator` before they are sent.
+    If the coordinator can't be reached, this falls back to the behavior of the in-process
+    limiter and tries to reconnect later. The local buckets are kept up to date either way.
+
+    .. code-block:: python3
+
+        api = API(token, limiter=SharedLimiter('/tmp/shitcord-limiter.sock'))
+
+    Parameters
+    ----------
+    path : str
+        The path of the coordinator's Unix socket.
+    reconnect_interval : float, optional
+        The seconds to wait before trying to reach the coordinator again. Defaults to 5.
+    timeout : float, optional
+        The seconds the coordinator has to reply before it is treated as unreachable. Defaults to 1.
+    aging : float, optional
+        See :class:`shitcord.http.Limiter`. The coordinator serves reservations in the order
+        they arrive, so priorities only apply while it can't be reached.
+    """
+
+    def __init__(self, path, *, reconnect_interval=5.0, timeout=1.0, aging=10.0):
+        super().__init__(aging=aging)
+        self.path = path
+        self.reconnect_interval = reconnect_interval
+        self.timeout = timeout
+
+        self._lines = None
+        self._lock = trio.Lock()
+        self._next_attempt = 0.0
+        self._pending = []
+        self._releases = []
+        self._flushing = False
+
+    def __repr__(self):
+        return '<shitcord.http.SharedLimiter path={0.path!r} connected={0.connected}>'.format(self)
+
+    @property
+    def connected(self):
+        """Whether the limiter is connected to the coordinator."""
+
+        return self._lines is not None
+
+    async def _connect(self):
+        if self._lines is not None:
+            return True
+
+        if trio.current_time() < self._next_attempt:
+            return False
+
+        try:
+            stream = await trio.open_unix_socket(self.path)
+        except (OSError, RuntimeError) as error:
+            logger.warning('Could not reach the limiter coordinator at %s (%s). Using the in-process limiter.', self.path, error)
+            self._next_attempt = trio.current_time() + self.reconnect_interval
+            return False
+
+        self._lines = _LineStream(stream)
+        return True
+
+    async def _call(self, message):
+        """Sends a message to the coordinator and returns its reply or ``None`` if it isn't reachable."""
+
+        async with self._lock:
+            if not await self._connect():
+                return None
+
+            # Piggyback the updates from responses on the message, so they don't cost another round trip.
+            message['updates'], self._pending = self._pending, []
+            message['releases'], self._releases = self._releases, []
+
+            reply = None
+            try:
+                # A reply that is left unread would be taken for the reply to the next message.
+                # The coordinator is local, so waiting for the reply even if we're cancelled is cheap,
+                # unless it stalls. Then the connection is dropped, so no late reply can be mistaken.
+                with CancelScope(shield=True):
+                    with trio.move_on_after(self.timeout) as scope:
+                        await self._lines.send(message)
+                        reply = await self._lines.receive()
+
+                if scope.cancelled_caught:
+                    logger.warning('The limiter coordinator did not reply within %s seconds.', self.timeout)
+            except (BrokenResourceError, trio.ClosedResourceError, OSError) as error:
+                logger.warning('Lost the connection to the limiter coordinator: %s', error)
+            except ValueError as error:
+                logger.warning('Received an invalid reply from the limiter coordinator: %s', error)
+
+            if reply is None:
+                lines, self._lines = self._lines, None
+                self._next_attempt = trio.current_time() + self.reconnect_interval
+                await lines.stream.aclose()
+
+            return reply
+
+    async def chill(self, bucket, priority=Priority.NORMAL):
+        """|coro|
+
+        Reserves a request to the given bucket at the coordinator and blocks until it's safe to make it.
+
+        Parameters
+        ----------
+        bucket : tuple
+            The bucket to check.
+        priority : :class:`shitcord.http.Priority`, optional
+            The lane to wait in while the coordinator can't be reached.
+
+        Returns
+        -------
+        float
+            The duration we waited for.
+        """
+
+        key = _format_bucket(bucket)
+        waited = 0.0
+
+        while True:
+            reply = await self._call({'op': 'acquire', 'bucket': key})
+            if reply is None:
+                return waited + await super().chill(bucket, priority)
+
+            if reply['delay'] <= 0:
+                return waited
+
+            logger.debug('Bucket %s is exhausted across processes, waiting %s seconds.', key, reply['delay'])
+            await trio.sleep(reply['delay'])
+            waited += reply['delay']
+
+    def update_bucket(self, bucket, response):
+        """Updates a bucket with the rate limit headers of a response.
+
+        The update is sent to the coordinator in the background, or together with
+        the next reservation of this process if that happens first.
+
+        Parameters
+        ----------
+        bucket : tuple
+            The bucket to update.
+        response : :class:`asks.Response`
+            A response object to retrieve rate limit headers from.
+        """
+
+        super().update_bucket(bucket, response)
+        if not self.connected:
+            return
+
+        headers = response.headers
+        if 'X-RateLimit-Global' in headers:
+            retry_after = float(headers.get('Retry-After', 1))
+            self._pending.append((GLOBAL_BUCKET, None, 0, time.time() + retry_after))
+
+        elif 'X-RateLimit-Remaining' in headers:
+            # The coordinator runs on the same host, so the reset is sent on our own clock.
+            self._pending.append((_format_bucket(bucket), int(headers.get('X-RateLimit-Limit', 1)),
+                                  int(headers.get('X-RateLimit-Remaining')), time.time() + _get_reset_after(headers)))
+
+        elif response.status_code != 429:
+            self._pending.append((_format_bucket(bucket), None, 0, 0.0))
+
+        if self._pending and not self._flushing:
+            self._flushing = True
+            spawn_system_task(self.flush)
+
+    def release(self, bucket):
+        """Gives back a reservation at the coordinator for a request that won't be made.
+
+        Like updates, the release is sent in the background.
+        """
+
+        if not self.connected:
+            return super().release(bucket)
+
+        self._releases.append(_format_bucket(bucket))
+        if not self._flushing:
+            self._flushing = True
+            spawn_system_task(self.flush)
+
+    async def flush(self):
+        """|coro|
+
+        Sends pending bucket updates to the coordinator right away.
+        """
+
+        try:
+            if self._pending or self._releases:
+                await self._call({'op': 'update'})
+        except Exception:
+            # This runs as a system task, where any exception would crash the whole program.
+            logger.exception('Failed to send bucket updates to the limiter coordinator.')
+        finally:
+            self._flushing = False
+
+    async def get_shared_snapshot(self):
+        """|coro|
+
+        Returns the state of the buckets as tracked by the coordinator or ``None`` if it isn't reachable.
+        """
+
+        reply = await self._call({'op': 'snapshot'})
+        return reply['buckets'] if reply is not None else None
+
+
+def main():
+    if len(sys.argv) != 2:
+        raise SystemExit('Usage: python -m shitcord.http.shared_limiter <socket path>')
+
+    logging.basicConfig(level=logging.DEBUG)
+    trio.run(LimiterCoordinator(sys.argv[1]).serve)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+import abc
+import collections
+import json
+import logging
+import ssl
+from urllib.parse import urlencode, urlsplit
+
+import asks
+import h11
+import trio
+
+from .multipart import MultipartWriter
+from ..utils.compat import BrokenResourceError, CancelScope
+
+logger = logging.getLogger(__name__)
+asks.init(trio)
+
+__all__ = ['AsksTransport', 'H11Transport', 'Response', 'Transport']
+
+
+class _Headers(dict):
+    """A dict of response headers with case-insensitive lookups."""
+
+    def __init__(self, headers):
+        super().__init__((name.lower(), value) for name, value in headers.items())
+
+    def __getitem__(self, name):
+        return super().__getitem__(name.lower())
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name.lower(), value)
+
+    def __contains__(self, name):
+        return super().__contains__(name.lower())
+
+    def get(self, name, default=None):
+        return super().get(name.lower(), default)
+
+
+class Response:
+    """Represents a response that was received by a :class:`shitcord.http.Transport`.
+
+    This provides the parts of :class:`asks.response_objects.Response` the HTTP client relies on.
+
+    Attributes
+    ----------
+    status_code : int
+        The status code of the response.
+    headers : dict
+        The headers of the response with case-insensitive lookups.
+    content : bytes
+        The body of the response.
+    """
+
+    __slots__ = ('status_code', 'headers', 'content', '_actual_response')
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = _Headers(headers)
+        self.content = content
+        self._actual_response = None
+
+    def __repr__(self):
+        return '<shitcord.http.Response status_code={}>'.format(self.status_code)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class Transport(abc.ABC):
+    """An Abstract Base Class for the connection layer of :class:`shitcord.http.HTTP`.
+
+    A transport performs a single HTTP request and returns an object that provides
+    ``status_code``, ``headers``, ``content``, ``text`` and ``json()`` like :class:`shitcord.http.Response`.
+    Rate limits and retries are handled by the HTTP client, not by the transport.
+    """
+
+    @abc.abstractmethod
+    async def request(self, method, url, *, headers=None, params=None, json=None, data=None):
+        """|coro|
+
+        Performs a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL without query parameters.
+        headers : dict, optional
+            The request headers.
+        params : dict, optional
+            The query parameters.
+        json : optional
+            An object to send as JSON body.
+        data : optional
+            The body as :class:`bytes` or :class:`shitcord.http.MultipartWriter`.
+        """
+
+        raise NotImplementedError
+
+    async def download(self, url, write, *, headers=None):
+        """|coro|
+
+        Performs a GET request and passes the body of a successful response to `write` chunk by chunk.
+
+        Transports that can stream response bodies override this, the default
+        implementation passes the whole body at once.
+
+        Parameters
+        ----------
+        url : str
+            The URL to download.
+        write : Callable
+            A coroutine function that is called with every chunk of the body.
+        headers : dict, optional
+            The request headers.
+
+        Returns
+        -------
+        :class:`shitcord.http.Response`
+            The response. Its ``content`` is only set if the status code doesn't indicate success.
+        """
+
+        response = await self.request('GET', url, headers=headers)
+        if 200 <= response.status_code < 300:
+            await write(response.content)
+            return Response(response.status_code, response.headers, b'')
+
+        return response
+
+    async def aclose(self):
+        """|coro|
+
+        Closes all connections of the transport.
+        """
+
+
+class AsksTransport(Transport):
+    """A transport that performs requests with an :class:`asks.Session`.
+
+    asks can't stream request bodies, so :class:`shitcord.http.MultipartWriter` bodies are
+    streamed through an :class:`shitcord.http.H11Transport` with its own connections instead.
+    With `stream_uploads` disabled, they are read into memory and sent through asks.
+
+    Parameters
+    ----------
+    session : :class:`asks.Session`, optional
+        The session to use. A new one will be created if none is given.
+    connections : int, optional
+        The size of the connection pool of a new session and of the one for uploads. Defaults to 10.
+    stream_uploads : bool, optional
+        Whether multipart bodies are streamed. Defaults to ``True``.
+    """
+
+    def __init__(self, session=None, *, connections=10, stream_uploads=True):
+        self.session = session if session is not None else asks.Session(connections=connections)
+        self.connections = connections
+        self.stream_uploads = stream_uploads
+
+        self._uploads = None
+
+    def __repr__(self):
+        return '<shitcord.http.AsksTransport session={0.session!r}>'.format(self)
+
+    async def request(self, method, url, *, data=None, **kwargs):
+        if isinstance(data, MultipartWriter):
+            if self.stream_uploads:
+                if self._uploads is None:
+                    self._uploads = H11Transport(max_connections=self.connections)
+                return await self._uploads.request(method, url, data=data, **kwargs)
+
+            # Progress can only be reported once asks has sent the whole body.
+            progress, data.progress = data.progress, None
+            try:
+                response = await self.session.request(method, url, data=await data.read(), **kwargs)
+            finally:
+                data.progress = progress
+
+            if progress is not None:
+                progress(len(data), len(data))
+            return response
+
+        if data is not None:
+            kwargs['data'] = data
+
+        return await self.session.request(method, url, **kwargs)
+
+    async def aclose(self):
+        if self._uploads is not None:
+            await self._uploads.aclose()
+
+    async def download(self, url, write, *, headers=None):
+        response = await self.session.get(url, headers=headers, stream=True)
+        if not 200 <= response.status_code < 300:
+            content = b''.join([chunk async for chunk in response.body])
+            return Response(response.status_code, response.headers, content)
+
+        async with response.body:
+            async for chunk in response.body:
+                await write(chunk)
+
+        return Response(response.status_code, response.headers, b'')
+
+
+class _Connection:
+    __slots__ = ('stream', 'protocol', 'expires', 'requests', 'responded')
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.protocol = h11.Connection(h11.CLIENT)
+        self.expires = None
+        self.requests = 0
+        self.responded = False
+
+    async def send(self, event):
+        data = self.protocol.send(event)
+        if data:
+            await self.stream.send_all(data)
+
+    async def receive(self, max_size):
+        while True:
+            event = self.protocol.next_event()
+            if event is not h11.NEED_DATA:
+                return event
+
+            data = await self.stream.receive_some(max_size)
+            if not data and self.protocol.their_state is h11.SEND_RESPONSE:
+                # The server closed the connection before it sent anything.
+                raise _StaleConnection()
+            self.protocol.receive_data(data)
+
+    @property
+    def reusable(self):
+        return self.protocol.our_state is h11.DONE and self.protocol.their_state is h11.DONE
+
+    async def aclose(self):
+        with CancelScope(shield=True):
+            await self.stream.aclose()
+
+
+class _StaleConnection(Exception):
+    """An idle connection was closed by the server before a request on it was answered."""
+
+
+class _HostPool:
+    __slots__ = ('idle', 'semaphore')
+
+    def __init__(self, limit):
+        self.idle = collections.deque()
+        self.semaphore = trio.Semaphore(limit)
+
+
+class H11Transport(Transport):
+    """A transport that speaks HTTP/1.1 with h11 over trio streams.
+
+    Connections are pooled per host and kept alive between requests. The pool never holds more
+    than `max_connections` connections to a host. Requests that would need another connection
+    wait until one is returned to the pool. Idle connections are reused in last-in first-out order,
+    so only as many connections as needed stay warm and the rest expire.
+
+    Request bodies of :class:`shitcord.http.MultipartWriter` are streamed chunk by chunk,
+    and so are the response bodies of :meth:`download`.
+
+    h11 handles one request per connection at a time, so requests aren't pipelined. Discord's
+    edge doesn't answer pipelined requests concurrently either, which is why concurrency
+    comes from the connection pool instead.
+
+    Parameters
+    ----------
+    max_connections : int, optional
+        The maximum amount of connections per host. Defaults to 20.
+    keepalive_timeout : float, optional
+        The seconds an idle connection is kept open. A shorter ``Keep-Alive`` timeout
+        sent by the server takes precedence. Defaults to 30.
+    max_requests_per_connection : int, optional
+        The amount of requests after which a connection is closed. ``None`` for no limit.
+    connect_timeout : float, optional
+        The seconds to wait for a new connection. Defaults to 10.
+    ssl_context : :class:`ssl.SSLContext`, optional
+        The SSL context for HTTPS connections.
+    receive_size : int, optional
+        The maximum amount of bytes to read from a connection at once. Defaults to 64 KiB.
+    """
+
+    def __init__(self, *, max_connections=20, keepalive_timeout=30.0, max_requests_per_connection=None,
+                 connect_timeout=10.0, ssl_context=None, receive_size=65536):
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.max_requests_per_connection = max_requests_per_connection
+        self.connect_timeout = connect_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.receive_size = receive_size
+
+        self.connections_opened = 0
+        self._pools = {}
+
+    def __repr__(self):
+        return '<shitcord.http.H11Transport max_connections={0.max_connections} hosts={1}>'.format(self, len(self._pools))
+
+    def _get_pool(self, key):
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(self.max_connections)
+        return pool
+
+    async def _open_connection(self, scheme, host, port):
+        with trio.fail_after(self.connect_timeout):
+            if scheme == 'https':
+                stream = await trio.open_ssl_over_tcp_stream(host, port, ssl_context=self.ssl_context, https_compatible=True)
+            else:
+                stream = await trio.open_tcp_stream(host, port)
+
+        self.connections_opened += 1
+        logger.debug('Opened a connection to %s:%s.', host, port)
+        return _Connection(stream)
+
+    async def _get_connection(self, pool):
+        """Returns an idle connection that didn't expire yet or ``None``."""
+
+        now = trio.current_time()
+        while pool.idle:
+            connection = pool.idle.pop()
+            if connection.expires > now:
+                return connection
+
+            await connection.aclose()
+
+        return None
+
+    def _get_expiry(self, headers):
+        timeout = self.keepalive_timeout
+        for name, value in headers:
+            if name == b'keep-alive':
+                for option in value.split(b','):
+                    key, _, number = option.strip().partition(b'=')
+                    if key == b'timeout' and number.isdigit():
+                        # Give up on the connection a bit before the server does.
+                        timeout = min(timeout, max(int(number) - 1, 0))
+
+        return trio.current_time() + timeout
+
+    @staticmethod
+    def _prepare_body(headers, json_body, data):
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        elif isinstance(data, str):
+            data = data.encode('utf-8')
+
+        if data is not None:
+            headers['Content-Length'] = str(len(data))
+        return data
+
+    async def _send_body(self, connection, data):
+        if isinstance(data, MultipartWriter):
+            async def write(chunk):
+                await connection.send(h11.Data(data=chunk))
+
+            await data.write_to(write)
+        elif data:
+            await connection.send(h11.Data(data=data))
+
+        await connection.send(h11.EndOfMessage())
+
+    async def _perform(self, connection, method, target, headers, data, write=None):
+        connection.responded = False
+        await connection.send(h11.Request(method=method, target=target, headers=headers))
+        await self._send_body(connection, data)
+        connection.requests += 1
+
+        response = await connection.receive(self.receive_size)
+        while isinstance(response, h11.InformationalResponse):
+            response = await connection.receive(self.receive_size)
+        if not isinstance(response, h11.Response):
+            raise h11.RemoteProtocolError('Expected a response, received {!r}.'.format(response))
+        connection.responded = True
+
+        if write is not None and not 200 <= response.status_code < 300:
+            # Bodies of failed downloads are kept for the error.
+            write = None
+
+        chunks = []
+        while True:
+            event = await connection.receive(self.receive_size)
+            if isinstance(event, h11.Data):
+                if write is not None:
+                    await write(event.data)
+                else:
+                    chunks.append(event.data)
+            elif isinstance(event, (h11.EndOfMessage, h11.ConnectionClosed)):
+                break
+
+        connection.expires = self._get_expiry(response.headers)
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in response.headers}
+        return Response(response.status_code, headers, b''.join(chunks))
+
+    async def request(self, method, url, *, headers=None, params=None, json=None, data=None):
+        return await self._request(method, url, headers, params, json, data, None)
+
+    async def download(self, url, write, *, headers=None):
+        return await self._request('GET', url, headers, None, None, None, write)
+
+    async def _request(self, method, url, headers, params, json, data, write):
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        if params:
+            target += ('&' if parts.query else '?') + urlencode({key: str(value) for key, value in params.items()})
+
+        headers = dict(headers or {})
+        headers['Host'] = parts.netloc
+        data = self._prepare_body(headers, json, data)
+        header_list = [(name.encode('latin-1'), str(value).encode('latin-1')) for name, value in headers.items()]
+
+        pool = self._get_pool((scheme, parts.hostname, port))
+        async with pool.semaphore:
+            while True:
+                connection = await self._get_connection(pool)
+                reused = connection is not None
+                if connection is None:
+                    connection = await self._open_connection(scheme, parts.hostname, port)
+
+                try:
+                    response = await self._perform(connection, method.encode('ascii'), target.encode('latin-1'), header_list, data, write)
+                except (_StaleConnection, BrokenResourceError, h11.RemoteProtocolError) as error:
+                    await connection.aclose()
+                    if reused and not connection.responded and isinstance(error, (_StaleConnection, BrokenResourceError)):
+                        # The server closed the idle connection before we noticed. Try a fresh one.
+                        logger.debug('Pooled connection to %s was closed by the server, reconnecting.', parts.hostname)
+                        continue
+                    raise
+                except BaseException:
+                    # Cancelled requests leave the connection in an unknown state.
+                    await connection.aclose()
+                    raise
+
+                break
+
+            exhausted = self.max_requests_per_connection is not None and connection.requests >= self.max_requests_per_connection
+            if connection.reusable and not exhausted:
+                connection.protocol.start_next_cycle()
+                pool.idle.append(connection)
+            else:
+                await connection.aclose()
+
+        return response
+
+    async def aclose(self):
+        for pool in self._pools.values():
+            while pool.idle:
+                await pool.idle.pop().aclose()
+
+        self._pools.clear()
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import re
+
+import trio
+
+from .api import API
+from .http import HTTP
+from .transport import AsksTransport
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['WebhookClient']
+
+WEBHOOK_URL = re.compile(r'/webhooks/(?P<id>\d+)/(?P<token>[\w-]+)')
+
+
+class _Execution:
+    __slots__ = ('content', 'embeds', 'identity', 'done', 'result', 'error')
+
+    def __init__(self, content, embeds, identity, wait):
+        self.content = content
+        self.embeds = embeds
+        self.identity = identity
+
+        # Most callers don't care about the result, so they don't get an event.
+        self.done = trio.Event() if wait else None
+        self.result = None
+        self.error = None
+
+
+class WebhookClient:
+    """Executes a webhook at a high rate without a bot token.
+
+    Executions are put into a bounded queue and sent by a single task per webhook.
+    While a request is in flight or the webhook is rate limited, queued executions pile up
+    and are combined into as few requests as possible: their contents are joined as long as they
+    stay within the character limit and their embeds are sent together, up to 10 per request.
+    Only executions with the same username, avatar and TTS setting are combined.
+
+    All clients share one HTTP client and thus one connection pool by default. Their rate limits
+    are still tracked separately, since the webhook ID is a major parameter of the bucket.
+
+    .. code-block:: python3
+
+        async with WebhookClient.from_url(url) as webhook:
+            for alert in alerts:
+                await webhook.send(embeds=[alert.to_embed()])
+
+    Parameters
+    ----------
+    webhook_id : int
+        The ID of the webhook.
+    token : str
+        The token of the webhook.
+    http : :class:`shitcord.http.HTTP`, optional
+        The HTTP client to send the requests with. Defaults to the one returned by :meth:`get_shared_http`.
+    max_queue : int, optional
+        The amount of executions that can be queued before :meth:`send` blocks. Defaults to 1000.
+    max_embeds : int, optional
+        The maximum amount of embeds per request. Defaults to 10.
+    max_length : int, optional
+        The maximum length of the content of a request. Defaults to 2000.
+    separator : str, optional
+        The string to join the contents of combined executions with. Defaults to a newline.
+
+    Attributes
+    ----------
+    sent : int
+        The amount of requests that were made.
+    queued : int
+        The amount of executions that were queued.
+    failed : int
+        The amount of executions whose request failed.
+    """
+
+    POOL_SIZE = 20
+
+    _shared_http = None
+
+    def __init__(self, webhook_id, token, *, http=None, max_queue=1000, max_embeds=10, max_length=2000, separator='\n'):
+        self.webhook_id = int(webhook_id)
+        self.token = token
+        self.api = API(http=http or self.get_shared_http())
+        self.max_embeds = max_embeds
+        self.max_length = max_length
+        self.separator = separator
+
+        self.sent = 0
+        self.queued = 0
+        self.failed = 0
+
+        self._send_channel, self._receive_channel = trio.open_memory_channel(max_queue)
+        self._carry = None
+        self._nursery_manager = None
+        self._nursery = None
+
+    def __repr__(self):
+        return '<shitcord.http.WebhookClient webhook_id={0.webhook_id} queued={0.queued} sent={0.sent}>'.format(self)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Creates a client from the URL of a webhook.
+
+        Raises
+        ------
+        ValueError
+            Will be raised if the URL doesn't contain a webhook ID and token.
+        """
+
+        match = WEBHOOK_URL.search(url)
+        if match is None:
+            raise ValueError('{!r} is not a webhook URL.'.format(url))
+
+        return cls(match.group('id'), match.group('token'), **kwargs)
+
+    @classmethod
+    def get_shared_http(cls):
+        """Returns the HTTP client that is shared by all webhook clients without an explicit one.
+
+        It doesn't send an ``Authorization`` header and keeps up to :attr:`POOL_SIZE` connections open.
+        """
+
+        if cls._shared_http is None:
+            WebhookClient._shared_http = HTTP(None, transport=AsksTransport(connections=cls.POOL_SIZE))
+        return cls._shared_http
+
+    async def __aenter__(self):
+        self._nursery_manager = trio.open_nursery()
+        self._nursery = await self._nursery_manager.__aenter__()
+        self._nursery.start_soon(self._run)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # The worker sends whatever is left in the queue before it stops.
+        await self._send_channel.aclose()
+
+        try:
+            return await self._nursery_manager.__aexit__(*exc_info)
+        finally:
+            self._nursery = None
+
+    def _fits(self, batch, length, embeds, execution):
+        if execution.identity != batch[0].identity:
+            return False
+
+        if embeds + len(execution.embeds) > self.max_embeds:
+            return False
+
+        if length and execution.content:
+            length += len(self.separator)
+        return length + len(execution.content) <= self.max_length
+
+    def _take_batch(self, first):
+        batch = [first]
+        length = len(first.content)
+        embeds = len(first.embeds)
+
+        while True:
+            try:
+                execution = self._receive_channel.receive_nowait()
+            except (trio.WouldBlock, trio.EndOfChannel):
+                break
+
+            if not self._fits(batch, length, embeds, execution):
+                self._carry = execution
+                break
+
+            if length and execution.content:
+                length += len(self.separator)
+            length += len(execution.content)
+            embeds += len(execution.embeds)
+            batch.append(execution)
+
+        return batch
+
+    async def _execute(self, batch):
+        username, avatar_url, tts = batch[0].identity
+        wait = any(execution.done is not None for execution in batch)
+
+        data = {
+            'content': self.separator.join(execution.content for execution in batch if execution.content) or None,
+            'embeds': [embed.to_json() for execution in batch for embed in execution.embeds] or None,
+            'username': username,
+            'avatar_url': avatar_url,
+            'tts': tts or None,
+        }
+
+        try:
+            result = await self.api.execute_webhook(self.webhook_id, self.token, data, wait=wait)
+        except Exception as error:
+            self.failed += len(batch)
+            if not wait:
+                logger.warning('Executing webhook %s failed: %s', self.webhook_id, error)
+
+            for execution in batch:
+                execution.error = error
+        else:
+            for execution in batch:
+                execution.result = result
+        finally:
+            self.sent += 1
+            for execution in batch:
+                if execution.done is not None:
+                    execution.done.set()
+
+    async def _run(self):
+        while True:
+            first, self._carry = self._carry, None
+            if first is None:
+                try:
+                    first = await self._receive_channel.receive()
+                except trio.EndOfChannel:
+                    break
+
+            batch = self._take_batch(first)
+            logger.debug('Executing webhook %s with %s combined executions.', self.webhook_id, len(batch))
+            await self._execute(batch)
+
+    def _create_execution(self, content, embeds, username, avatar_url, tts, wait):
+        if self._nursery is None:
+            raise RuntimeError('WebhookClient must be used as asynchronous context manager.')
+
+        embeds = list(embeds or ())
+        if len(embeds) > self.max_embeds:
+            raise ValueError('A webhook can only send {} embeds at once.'.format(self.max_embeds))
+
+        return _Execution(content or '', embeds, (username, avatar_url, tts), wait)
+
+    async def send(self, content=None, *, embeds=None, username=None, avatar_url=None, tts=False, wait=False):
+        """|coro|
+
+        Queues an execution of the webhook. Blocks while the queue is full.
+
+        Parameters
+        ----------
+        content : str, optional
+            The content of the message.
+        embeds : list, optional
+            Up to 10 :class:`shitcord.models.Embed` objects to send with the message.
+        username : str, optional
+            Overrides the default username of the webhook.
+        avatar_url : str, optional
+            Overrides the default avatar of the webhook.
+        tts : bool, optional
+            Whether the message should be sent as TTS message. Defaults to ``False``.
+        wait : bool, optional
+            Whether to wait until the message was sent. Discord only returns the message then,
+            so this makes the request slower and should only be used if the message is needed.
+            Defaults to ``False``.
+
+        Returns
+        -------
+        :class:`shitcord.models.Message`
+            The message the execution ended up in if `wait` is ``True``. ``None`` otherwise.
+
+        Raises
+        ------
+        RuntimeError
+            Will be raised if the client isn't used as asynchronous context manager.
+        ValueError
+            Will be raised if more embeds are given than a request can carry.
+        ShitRequestFailed
+            Will be raised if `wait` is ``True`` and the request failed.
+            Otherwise failures are only logged and counted.
+        """
+
+        execution = self._create_execution(content, embeds, username, avatar_url, tts, wait)
+        await self._send_channel.send(execution)
+        self.queued += 1
+
+        if not wait:
+            return None
+
+        await execution.done.wait()
+        if execution.error is not None:
+            raise execution.error
+
+        return execution.result
+
+    def send_nowait(self, content=None, *, embeds=None, username=None, avatar_url=None, tts=False):
+        """Queues an execution of the webhook without waiting for it to be sent.
+
+        This takes the same parameters as :meth:`send`, except for `wait`.
+
+        Raises
+        ------
+        trio.WouldBlock
+            Will be raised if the queue is full.
+        """
+
+        execution = self._create_execution(content, embeds, username, avatar_url, tts, False)
+        self._send_channel.send_nowait(execution)
+        self.queued += 1
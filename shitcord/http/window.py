@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+__all__ = ['RateLimitWindow']
+
+# While the limits of a new bucket are unknown, only one request is sent to it.
+# Everyone else asks again after PROBE_INTERVAL seconds, unless the probe takes longer than PROBE_TIMEOUT.
+PROBE_INTERVAL = 0.05
+PROBE_TIMEOUT = 5.0
+
+# Rate limit resets are only precise to the second, so no window is assumed to be shorter than that.
+MIN_WINDOW = 1.0
+
+
+class RateLimitWindow:
+    """Counts the requests to a rate limit bucket that were reserved in its current window.
+
+    The limits are taken from the responses to the bucket. Reservations are counted
+    when they are made, so concurrent requests can't exhaust the bucket before their
+    responses arrive. Times are UNIX timestamps, so windows can be compared across processes.
+    """
+
+    __slots__ = ('limit', 'remaining', 'reset', 'window', 'probing')
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = 0
+        self.reset = 0.0
+        self.window = 0.0
+        self.probing = 0.0
+
+    def acquire(self, now):
+        """Reserves a request and returns ``0`` or the seconds to wait before trying again."""
+
+        if self.limit is None:
+            # Nothing is known about this bucket yet. Let a single request find out about its limits.
+            if self.probing > now:
+                return PROBE_INTERVAL
+
+            self.probing = now + PROBE_TIMEOUT
+            return 0.0
+
+        if self.limit < 0:
+            # The route isn't rate limited at all.
+            return 0.0
+
+        if now >= self.reset:
+            # A new window starts with our first request to it.
+            self.remaining = self.limit
+            self.reset = now + self.window
+
+        if self.remaining > 0:
+            self.remaining -= 1
+            return 0.0
+
+        return self.reset - now
+
+    def release(self, now):
+        """Gives back a reservation that wasn't used."""
+
+        if self.limit is None:
+            # Let someone else find out about the limits.
+            self.probing = 0.0
+        elif self.limit > 0 and now < self.reset and self.remaining < self.limit:
+            self.remaining += 1
+
+    def update(self, limit, remaining, reset, now):
+        self.probing = 0.0
+
+        if limit is None:
+            self.limit = -1
+            return
+
+        if self.limit is None or reset > self.reset:
+            # A new window started. Reservations of other processes might not have reached Discord yet.
+            self.remaining = remaining if self.limit is None else min(remaining, self.remaining)
+            self.reset = reset
+            self.window = max(reset - now, MIN_WINDOW)
+        else:
+            # Responses of the same window can arrive out of order.
+            self.remaining = min(remaining, self.remaining)
+
+        self.limit = limit
@@ -13,17 +13,15 @@ class Model(abc.ABC):
 
     Attributes
     ----------
-    snowflake: :class:`Snowflake`
-        A :class:`Snowflake` object that represents the model's ID.
     id : int
         The ID of the model. This should always be retrieved from the Discord API.
         For the case a model doesn't have an ID, defaults to 0.
     """
 
+    __slots__ = ('id', '_http')
+
     def __init__(self, model_id, *, http):
-        model_id = model_id or 0
-        self.snowflake = Snowflake(int(model_id))
-        self.id = self.snowflake.snowflake
+        self.id = int(model_id or 0)
         self._http = http
 
     def __eq__(self, other):
@@ -38,12 +36,27 @@ class Model(abc.ABC):
     def __hash__(self):
         return self.id >> 22
 
+    def _merge(self, data, fields):
+        # Rebinding instead of mutating keeps shallow copies of the model intact.
+        for key, attr in fields.items():
+            if key in data:
+                setattr(self, attr, data[key])
+
+    def _update(self, data):
+        """Merges a partial payload of the model into it.
+
+        Only the attributes whose keys are present in `data` are replaced. They are rebound
+        instead of mutated, so a shallow copy of the model taken before keeps the old values.
+        """
+
+        raise NotImplementedError
+
     @property
-    def created_at(self):
-        return self.snowflake.timestamp
+    def snowflake(self):
+        """A :class:`Snowflake` object that represents the model's ID."""
 
-    def __getattr__(self, item):
-        return object.__getattribute__(self, item)
+        return Snowflake(self.id)
 
-    def __setattr__(self, key, value):
-        object.__setattr__(self, key, value)
+    @property
+    def created_at(self):
+        return Snowflake(self.id).timestamp
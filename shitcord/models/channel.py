@@ -4,11 +4,19 @@ import enum
 
 from . import abc
 from .base import Model
-from ..utils import parse_time
+from ..utils import LazyTime
 
 __all__ = ['_channel_from_payload', 'PartialChannel', 'TextChannel', 'DMChannel', 'VoiceChannel', 'GroupDMChannel', 'CategoryChannel']
 
 
+_GUILD_CHANNEL_FIELDS = {
+    'position': 'position',
+    'permission_overwrites': 'permission_overwrites',
+    'name': 'name',
+    'parent_id': 'parent_id',
+}
+
+
 def _channel_from_payload(payload, http):
     channel_type = IntChannelTypes(payload['type']).name
     channel_cls = _ChannelTypes[channel_type].value
@@ -37,7 +45,7 @@ class _BaseChannel(Model):
         An integer representing the channel type.
     """
 
-    __slots__ = ('snowflake', 'id', 'type')
+    __slots__ = ('type',)
 
     def __init__(self, data, http):
         super().__init__(data['id'], http=http)
@@ -72,6 +80,8 @@ class PartialChannel(_BaseChannel, abc.Sendable):
         The channel's name.
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
@@ -117,10 +127,15 @@ class TextChannel(_BaseChannel, abc.GuildChannel, abc.Sendable):
         A datetime representing when the last message in this channel was pinned.
     """
 
+    __slots__ = ('guild_id', 'position', 'permission_overwrites', 'name', 'topic', 'nsfw', 'last_message_id', 'rate_limit', 'parent_id',
+                 '_last_pinned')
+
+    last_pinned = LazyTime('_last_pinned')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
-        self.guild_id = data['guild_id']
+        self.guild_id = int(data['guild_id'])
         self.position = data['position']
         self.permission_overwrites = data['permission_overwrites']
         self.name = data['name']
@@ -129,7 +144,17 @@ class TextChannel(_BaseChannel, abc.GuildChannel, abc.Sendable):
         self.last_message_id = data.get('last_message_id')
         self.rate_limit = data.get('rate_limit_per_user', 0)
         self.parent_id = data.get('parent_id')
-        self.last_pinned = parse_time(data.get('last_pin_timestamp'))
+        self._last_pinned = data.get('last_pin_timestamp')
+
+    def _update(self, data):
+        self._merge(data, _GUILD_CHANNEL_FIELDS)
+        self._merge(data, {
+            'topic': 'topic',
+            'nsfw': 'nsfw',
+            'last_message_id': 'last_message_id',
+            'rate_limit_per_user': 'rate_limit',
+            'last_pin_timestamp': '_last_pinned',
+        })
 
     def __repr__(self):
         return '<shitcord.TextChannel id={} name={} guild_id={} nsfw={}>'.format(self.id, self.name, self.guild_id, self.nsfw)
@@ -156,12 +181,19 @@ class DMChannel(_BaseChannel, abc.PrivateChannel, abc.Sendable):
         A datetime representing when the last message in this channel was pinned.
     """
 
+    __slots__ = ('last_message_id', 'recipients', '_last_pinned')
+
+    last_pinned = LazyTime('_last_pinned')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
         self.last_message_id = data.get('last_message_id')
         self.recipients = data['recipients']
-        self.last_pinned = parse_time(data.get('last_pin_timestamp'))
+        self._last_pinned = data.get('last_pin_timestamp')
+
+    def _update(self, data):
+        self._merge(data, {'last_message_id': 'last_message_id', 'recipients': 'recipients', 'last_pin_timestamp': '_last_pinned'})
 
     def __repr__(self):
         return '<shitcord.DMChannel id={}>'.format(self.id)
@@ -197,10 +229,12 @@ class VoiceChannel(_BaseChannel, abc.Connectable, abc.GuildChannel):
         The channel's parent ID if a parent exists.
     """
 
+    __slots__ = ('guild_id', 'position', 'permission_overwrites', 'name', 'bitrate', 'user_limit', 'parent_id')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
-        self.guild_id = data['guild_id']
+        self.guild_id = int(data['guild_id'])
         self.position = data['position']
         self.permission_overwrites = data['permission_overwrites']
         self.name = data['name']
@@ -208,6 +242,10 @@ class VoiceChannel(_BaseChannel, abc.Connectable, abc.GuildChannel):
         self.user_limit = data['user_limit']
         self.parent_id = data.get('parent_id')
 
+    def _update(self, data):
+        self._merge(data, _GUILD_CHANNEL_FIELDS)
+        self._merge(data, {'bitrate': 'bitrate', 'user_limit': 'user_limit'})
+
     def __repr__(self):
         return '<shitcord.VoiceChannel id={} name={} bitrate={} user_limit={}>'.format(self.id, self.name, self.bitrate, self.user_limit)
 
@@ -242,6 +280,10 @@ class GroupDMChannel(_BaseChannel, abc.PrivateChannel, abc.Sendable):
         A datetime representing when the last message in this channel was pinned.
     """
 
+    __slots__ = ('name', 'last_message_id', 'recipients', 'icon', 'owner_id', 'application_id', '_last_pinned')
+
+    last_pinned = LazyTime('_last_pinned')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
@@ -251,7 +293,18 @@ class GroupDMChannel(_BaseChannel, abc.PrivateChannel, abc.Sendable):
         self.icon = data.get('icon')
         self.owner_id = data['owner_id']
         self.application_id = data.get('application_id')
-        self.last_pinned = parse_time(data.get('last_pin_timestamp'))
+        self._last_pinned = data.get('last_pin_timestamp')
+
+    def _update(self, data):
+        self._merge(data, {
+            'name': 'name',
+            'last_message_id': 'last_message_id',
+            'recipients': 'recipients',
+            'icon': 'icon',
+            'owner_id': 'owner_id',
+            'application_id': 'application_id',
+            'last_pin_timestamp': '_last_pinned',
+        })
 
     def __repr__(self):
         return '<shitcord.GroupDMChannel id={} name={} owner_id={}>'.format(self.id, self.name, self.owner_id)
@@ -286,16 +339,22 @@ class CategoryChannel(_BaseChannel, abc.GuildChannel):
         The channel's parent ID if a parent exists.
     """
 
+    __slots__ = ('guild_id', 'position', 'permission_overwrites', 'name', 'nsfw', 'parent_id')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
-        self.guild_id = data['guild_id']
+        self.guild_id = int(data['guild_id'])
         self.position = data['position']
         self.permission_overwrites = data['permission_overwrites']
         self.name = data['name']
         self.nsfw = data['nsfw']
         self.parent_id = data.get('parent_id')
 
+    def _update(self, data):
+        self._merge(data, _GUILD_CHANNEL_FIELDS)
+        self._merge(data, {'nsfw': 'nsfw'})
+
     def __repr__(self):
         return '<shitcord.CategoryChannel id={} name={} guild_id={} nsfw={}>'.format(self.id, self.name, self.guild_id, self.nsfw)
 
@@ -11,6 +11,8 @@ __all__ = ['EmbedThumbnail', 'EmbedVideo', 'EmbedImage', 'EmbedProvider',
 
 
 class _EmbedEmpty:
+    __slots__ = ()
+
     def __bool__(self):
         return False
 
@@ -407,6 +409,8 @@ class Embed:
         if 'fields' in data:
             self.fields = [EmbedField(**field) for field in data['fields']]
 
+        return self
+
     def set_footer(self, text, *, icon_url=EmbedEmpty):
         """Sets a footer at this embed object.
 
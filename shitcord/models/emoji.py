@@ -106,7 +106,7 @@ class Emoji(_BaseEmoji):
         A boolean indicating whether the emoji is animated or not.
     """
 
-    __slots__ = ('guild_id', 'roles', 'user', 'required_colons', 'managed', 'animated')
+    __slots__ = ('guild_id', 'roles', 'user', 'require_colons', 'managed', 'animated')
 
     def __init__(self, guild_id, data, http):
         super().__init__(data, http)
@@ -7,7 +7,14 @@ from .gateway import Presence
 from .role import Role
 from .voice import VoiceState
 from .channel import _channel_from_payload
-from ..utils import parse_time
+from ..utils import LazyTime
+
+_GUILD_FIELDS = {key: key for key in (
+    'name', 'icon', 'splash', 'owner', 'owner_id', 'permissions', 'region', 'afk_channel_id', 'afk_timeout', 'embed_enabled',
+    'embed_channel_id', 'verification_level', 'default_message_notifications', 'explicit_content_filter', 'features',
+    'mfa_level', 'application_id', 'widget_enabled', 'widget_channel_id', 'system_channel_id', 'large', 'unavailable',
+    'member_count',
+)}
 
 
 class Guild(Model):
@@ -85,10 +92,12 @@ class Guild(Model):
     """
 
     __slots__ = ('name', 'icon', 'splash', 'owner', 'owner_id', 'permissions', 'region', 'afk_channel_id', 'afk_timeout', 'embed_enabled',
-                 'embed_channel_id', 'verification_level', 'default_message_notifications', 'explicit_content_filter', 'role', 'emojis', 'features',
-                 'mfa_level', 'application_id', 'widget_enabled', 'widget_channel_id', 'system_channel_id', 'joined_at', 'large',
+                 'embed_channel_id', 'verification_level', 'default_message_notifications', 'explicit_content_filter', 'roles', 'emojis', 'features',
+                 'mfa_level', 'application_id', 'widget_enabled', 'widget_channel_id', 'system_channel_id', '_joined_at', 'large',
                  'unavailable', 'member_count', 'voice_states', 'members', 'channels', 'presences')
 
+    joined_at = LazyTime('_joined_at')
+
     def __init__(self, data, http):
         super().__init__(data['id'], http=http)
 
@@ -114,15 +123,23 @@ class Guild(Model):
         self.widget_enabled = data.get('widget_enabled')
         self.widget_channel_id = data.get('widget_channel_id')
         self.system_channel_id = data['system_channel_id']
-        self.joined_at = parse_time(data.get('joined_at'))
+        self._joined_at = data.get('joined_at')
         self.large = data.get('large')
         self.unavailable = data.get('unavailable')
         self.member_count = data.get('member_count')
         self.members = [Member(member, http) for member in data.get('members', [])]
-        self.channels = [_channel_from_payload(channel, http) for channel in data.get('channels', [])]
+        self.channels = []
+        for channel in data.get('channels', []):
+            # Channels sent with GUILD_CREATE don't carry the ID of their guild.
+            channel.setdefault('guild_id', self.id)
+            self.channels.append(_channel_from_payload(channel, http))
         self.voice_states = [VoiceState(voice_state, http) for voice_state in data.get('voice_states', [])]
         self.presences = [Presence(presence, http) for presence in data.get('presences', [])]
 
+    def _update(self, data):
+        # Roles and emojis have update events of their own, so they aren't rebuilt here.
+        self._merge(data, _GUILD_FIELDS)
+
     def __str__(self):
         return self.name
 
@@ -151,7 +168,7 @@ class PartialGuild(Model):
     def __init__(self, data, http):
         super().__init__(data['id'], http=http)
 
-        self.unavailable = data['unavailable']
+        self.unavailable = data.get('unavailable', False)
 
     def __repr__(self):
         return '<shitcord.PartialGuild id={}>'.format(self.id)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .user import User
+from ..utils import LazyTime
 
 
 class Member(User):
@@ -34,7 +35,9 @@ class Member(User):
         Whether the user is muted or not.
     """
 
-    __slots__ = ('nick', 'roles', 'joined_at', 'deaf', 'mute')
+    __slots__ = ('nick', 'guild_id', 'roles', '_joined_at', 'deaf', 'mute')
+
+    joined_at = LazyTime('_joined_at')
 
     def __init__(self, data, http):
         super().__init__(data['user'], http=http)
@@ -42,10 +45,18 @@ class Member(User):
         if data.get('guild_id'):  # provided by the guild_member_add event
             self.guild_id = int(data['guild_id'])
         self.roles = [int(role_id) for role_id in data['roles']]
-        self.joined_at = data['joined_at']
+        self._joined_at = data['joined_at']
         self.deaf = data['deaf']
         self.mute = data['mute']
 
+    def _update(self, data):
+        if 'user' in data:
+            super()._update(data['user'])
+
+        self._merge(data, {'nick': 'nick', 'joined_at': '_joined_at', 'deaf': 'deaf', 'mute': 'mute'})
+        if 'roles' in data:
+            self.roles = [int(role_id) for role_id in data['roles']]
+
     def __repr__(self):
         return '<shitcord.Member id={0.id} name={0.name}>'.format(self)
 
@@ -10,7 +10,7 @@ from .emoji import PartialEmoji
 from .member import Member
 from .user import User
 from ..http import rest_shit
-from ..utils import parse_time
+from ..utils import LazyTime
 
 __all__ = ['Attachment', 'File', 'Message', 'MessageType']
 
@@ -26,6 +26,17 @@ class MessageType(IntEnum):
     GUILD_MEMBER_JOIN      = 7  # noqa
 
 
+_MESSAGE_FIELDS = {
+    'content': 'content',
+    'edited_timestamp': '_edited_timestamp',
+    'tts': 'tts',
+    'mention_everyone': 'mention_everyone',
+    'pinned': 'pinned',
+    'activity': 'activity',
+    'application': 'application',
+}
+
+
 def _user_to_member(user: dict, member: dict, http):
     if 'member' in user:
         user.pop('member')
@@ -41,11 +52,13 @@ class File:
     .. note::
         If you want to pass a file opened via ``open`` it is necessary to use ``rb`` mode.
         To pass any binary data, usage of ``io.BytesIO`` is recommended.
+        Files are streamed in chunks when being uploaded. Buffers like ``bytes``, ``memoryview``
+        or ``mmap.mmap`` objects are uploaded without being copied.
 
     Attributes
     ----------
-    fp : str, BinaryIO
-        Either a filename to open a file in the hard drive or a file's binary representation.
+    fp : str, BinaryIO, bytes, memoryview
+        Either a filename to open a file in the hard drive, a file object or a buffer containing the file's data.
     filename : str, optional
         The filename to use when uploading to Discord. If not given, the default filename
         or the provided string for ``fp`` will be used.
@@ -55,7 +68,7 @@ class File:
 
     __slots__ = ('fp', 'filename', '_real_fp')
 
-    def __init__(self, fp: Union[str, BinaryIO], filename: Optional[str] = None, *, spoiler=False):
+    def __init__(self, fp: Union[str, BinaryIO, bytes, memoryview], filename: Optional[str] = None, *, spoiler=False):
         self.fp = fp
         self._real_fp = None
 
@@ -199,10 +212,13 @@ class Message(Model):
         A dictionary containing information about the application from Rich Presence related chat embeds.
     """
 
-    __slots__ = ('channel_id', 'guild_id', 'author', 'content', 'content', 'timestamp', 'edited_timestamp', 'tts',
+    __slots__ = ('channel_id', 'guild_id', 'author', 'content', '_timestamp', '_edited_timestamp', 'tts',
                  'mention_everyone', 'mentions', 'mention_roles', 'attachments', 'embeds', 'reactions', 'nonce',
                  'pinned', 'webhook_id', 'type', 'activity', 'application')
 
+    timestamp = LazyTime('_timestamp')
+    edited_timestamp = LazyTime('_edited_timestamp')
+
     def __init__(self, data, http):
         super().__init__(data['id'], http=http)
 
@@ -221,8 +237,8 @@ class Message(Model):
             self.author = User(author, http)
 
         self.content = data.get('content', '')
-        self.timestamp = parse_time(data['timestamp'])
-        self.edited_timestamp = parse_time(data.get('edited_timestamp'))
+        self._timestamp = data['timestamp']
+        self._edited_timestamp = data.get('edited_timestamp')
         self.tts = data['tts']
         self.mention_everyone = data['mention_everyone']
         self.mentions = [
@@ -241,6 +257,26 @@ class Message(Model):
         self.activity = data.get('activity')
         self.application = data.get('application')
 
+    def _update(self, data):
+        # Embed unfurls only carry the ID, the channel and the embeds.
+        self._merge(data, _MESSAGE_FIELDS)
+
+        http = self._http
+        if 'mentions' in data:
+            self.mentions = [
+                User(user, http) if user.get('member') is None
+                else _user_to_member(user, user.pop('member'), http)
+                for user in data['mentions']
+            ]
+        if 'mention_roles' in data:
+            self.mention_roles = [int(role_id) for role_id in data['mention_roles']]
+        if 'attachments' in data:
+            self.attachments = [Attachment(attachment, http) for attachment in data['attachments']]
+        if 'embeds' in data:
+            self.embeds = [Embed.from_json(embed) for embed in data['embeds']]
+        if 'reactions' in data:
+            self.reactions = [Reaction(reaction, http) for reaction in data['reactions']]
+
     def __repr__(self):
         return '<shitcord.Message id={0.id} author={0.author!s} nonce={0.nonce}>'.format(self)
 
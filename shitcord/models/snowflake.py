@@ -1,46 +1,68 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 DISCORD_EPOCH = 1420070400000
 
 
-class Snowflake:
+class Snowflake(int):
     """Represents a generic Snowflake class.
 
     As of the Discord API using Twitter's Snowflakes, there are many
     data stored inside them. This special class wraps around such a Snowflake ID
     and represents an interface that lets you access these data.
 
+    A Snowflake is an :class:`int`, so it can be used wherever an ID is expected.
+    The data are only extracted when they are accessed.
+
     Parameters
     ----------
     snowflake : int
         The Snowflake ID to initialize this class with.
-
-    Attributes
-    ----------
-    binary : str
-        A string representing the Snowflake's binary representation.
-    timestamp : :class:`datetime.datetime`
-        An offset-naive datetime object representing the Snowflake's creation time.
-    worker_id : int
-        The Worker ID that belongs to the Snowflake.
-    process_id : int
-        The Process ID that belongs to the Snowflake.
-    increment : int
-        The increment that belongs to the Snowflake.
     """
 
-    __slots__ = ('snowflake', 'binary', 'timestamp', 'worker_id', 'process_id', 'increment')
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<shitcord.Snowflake {}>'.format(int(self))
+
+    __str__ = int.__repr__
+
+    @property
+    def snowflake(self):
+        """The Snowflake ID as plain :class:`int`."""
+
+        return int(self)
+
+    @property
+    def binary(self):
+        """A string representing the Snowflake's binary representation."""
+
+        return bin(self)[2:].zfill(8)
+
+    @property
+    def timestamp(self):
+        """An aware UTC datetime object representing the Snowflake's creation time."""
+
+        return datetime.fromtimestamp(((self >> 22) + DISCORD_EPOCH) / 1000, timezone.utc)
+
+    @property
+    def worker_id(self):
+        """The Worker ID that belongs to the Snowflake."""
+
+        return (self & 0x3E0000) >> 17
+
+    @property
+    def process_id(self):
+        """The Process ID that belongs to the Snowflake."""
+
+        return (self & 0x1F000) >> 12
 
-    def __init__(self, snowflake: int):
-        self.snowflake = snowflake
+    @property
+    def increment(self):
+        """The increment that belongs to the Snowflake."""
 
-        self.binary = bin(self.snowflake)[2:].zfill(8)
-        self.timestamp = datetime.utcfromtimestamp(((self.snowflake >> 22) + DISCORD_EPOCH) / 1000)
-        self.worker_id = (self.snowflake & 0x3E0000) >> 17
-        self.process_id = (self.snowflake & 0x1F000) >> 12
-        self.increment = self.snowflake & 0xFFF
+        return self & 0xFFF
 
     @classmethod
     def create_snowflake(cls, date, high=False):
@@ -49,7 +71,7 @@ class Snowflake:
         Parameters
         ----------
         date : datetime
-            The datetime to create the snowflake with.
+            The datetime to create the snowflake with. Naive datetimes are treated as UTC.
         high : bool
             Whether or not set the lower 22 bit to high.
         """
@@ -61,7 +83,9 @@ class Snowflake:
 
     @staticmethod
     def _to_unix_seconds(date):
-        return (date - datetime(1970, 1, 1)).total_seconds()
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date.timestamp()
 
     def get_shard_id(self, shard_count):
         """Computes the shard ID from a given shard count.
@@ -75,4 +99,4 @@ class Snowflake:
             The total amount of shards.
         """
 
-        return (self.snowflake >> 22) % shard_count
+        return (self >> 22) % shard_count
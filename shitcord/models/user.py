@@ -51,6 +51,8 @@ class _BaseUser(Model, abc.DiscordUser):
         The hash of the user's avatar.
     """
 
+    __slots__ = ('name', 'discriminator', 'avatar_hash')
+
     def __init__(self, data, http):
         super().__init__(data['id'], http=http)
 
@@ -58,6 +60,11 @@ class _BaseUser(Model, abc.DiscordUser):
         self.discriminator = int(data['discriminator']) if data.get('discriminator') else None
         self.avatar_hash = data.get('avatar')
 
+    def _update(self, data):
+        self._merge(data, {'username': 'name', 'avatar': 'avatar_hash'})
+        if data.get('discriminator'):
+            self.discriminator = int(data['discriminator'])
+
     def __str__(self):
         return '{0.name}#{0.discriminator}'.format(self)
 
@@ -115,6 +122,17 @@ class _BaseUser(Model, abc.DiscordUser):
                               dict(user=self.id, hash=self.avatar_hash), image_format=image_format, size=size, animated=animated)
 
 
+_USER_FIELDS = {
+    'bot': 'bot',
+    'mfa_enabled': 'mfa_enabled',
+    'locale': 'language',
+    'verified': 'verified',
+    'email': 'email',
+    'flags': 'flags',
+    'premium_type': 'premium_type',
+}
+
+
 class User(_BaseUser):
     """Represents a User on Discord.
 
@@ -145,6 +163,8 @@ class User(_BaseUser):
         The user's premium type as an integer. None when permissions for accessing the premium type aren't granted.
     """
 
+    __slots__ = ('bot', 'mfa_enabled', 'language', 'verified', 'email', 'flags', 'premium_type')
+
     def __init__(self, data, http):
         super().__init__(data, http)
 
@@ -156,6 +176,10 @@ class User(_BaseUser):
         self.flags = data.get('flags')
         self.premium_type = data.get('premium_type')
 
+    def _update(self, data):
+        super()._update(data)
+        self._merge(data, _USER_FIELDS)
+
     @property
     def mention(self):
         """Returns a string that mentions the user."""
@@ -242,6 +266,8 @@ class Connection:
         A list of :class:`Integration` objects
     """
 
+    __slots__ = ('id', 'name', 'type', 'revoked', 'integrations')
+
     def __init__(self, data):
         self.id = data['id']
         self.name = data['name']
@@ -75,10 +75,11 @@ class VoiceRegion(Model):
         Whether this is a custom voice region.
     """
 
-    __slots__ = ('id', 'name', 'vip', 'optimal', 'deprecated', 'custom')
+    __slots__ = ('name', 'vip', 'optimal', 'deprecated', 'custom')
 
     def __init__(self, data, http):
-        super().__init__(data, http=http)
+        # Voice region IDs aren't snowflakes.
+        super().__init__(None, http=http)
 
         self.id = data['id']
         self.name = data['name']
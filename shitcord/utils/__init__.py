@@ -4,6 +4,6 @@ from .cache import Cache
 from .cdn import BASE_URL, Endpoints, format_url, PlebAvatar
 from .event_emitter import EventEmitter
 from .gateway import Limiter
-from .time import parse_time
+from .time import LazyTime, parse_time
 
-__all__ = ['BASE_URL', 'Endpoints', 'EventEmitter', 'format_url', 'parse_time', 'PlebAvatar']
+__all__ = ['BASE_URL', 'Endpoints', 'EventEmitter', 'format_url', 'LazyTime', 'parse_time', 'PlebAvatar']
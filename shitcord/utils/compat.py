@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+"""Names that moved between the trio versions Shitcord supports."""
+
+import trio
+
+__all__ = ['BrokenResourceError', 'CancelScope', 'spawn_system_task']
+
+# trio 0.9 calls this BrokenStreamError.
+BrokenResourceError = getattr(trio, 'BrokenResourceError', None) or trio.BrokenStreamError
+
+# Cancel scopes can only be created with open_cancel_scope before trio 0.11, which later removed it.
+CancelScope = getattr(trio, 'CancelScope', None) or trio.open_cancel_scope
+
+# trio.hazmat was renamed to trio.lowlevel in 0.15.
+spawn_system_task = trio.lowlevel.spawn_system_task if hasattr(trio, 'lowlevel') else trio.hazmat.spawn_system_task
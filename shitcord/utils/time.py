@@ -1,8 +1,94 @@
 import datetime
 import re
 
+_ISO_8601 = re.compile(r'(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?(Z|[+-]\d\d:?\d\d)?')
+
+
+def _parse_offset(offset):
+    if offset is None or offset == 'Z':
+        return datetime.timezone.utc
+
+    sign = -1 if offset[0] == '-' else 1
+    hours, minutes = int(offset[1:3]), int(offset[-2:])
+    if not hours and not minutes:
+        return datetime.timezone.utc
+    return datetime.timezone(sign * datetime.timedelta(hours=hours, minutes=minutes))
+
+
+def _parse_iso_8601(time):
+    match = _ISO_8601.fullmatch(time)
+    if match is None:
+        raise ValueError('{!r} is not an ISO 8601 timestamp.'.format(time))
+
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    return datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second or 0),
+        int(fraction.ljust(6, '0')) if fraction else 0, _parse_offset(offset))
+
+
+if hasattr(datetime.datetime, 'fromisoformat'):
+    def _parse(time):
+        # Discord's own timestamps are exactly what fromisoformat is fast at.
+        # Anything it refuses, e.g. a trailing Z before Python 3.11, takes the slow path.
+        try:
+            parsed = datetime.datetime.fromisoformat(time)
+        except ValueError:
+            return _parse_iso_8601(time)
+
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed
+else:
+    _parse = _parse_iso_8601
+
 
 def parse_time(time):
+    """Parses an ISO 8601 timestamp as sent by Discord into an aware datetime.
+
+    Timestamps without an offset are treated as UTC.
+
+    Parameters
+    ----------
+    time : str, optional
+        The timestamp to parse.
+
+    Returns
+    -------
+    :class:`datetime.datetime`
+        The parsed timestamp or ``None`` if `time` is empty.
+
+    Raises
+    ------
+    ValueError
+        Will be raised if `time` isn't an ISO 8601 timestamp.
+    """
+
     if time:
-        return datetime.datetime(*map(int, re.split(r'[^\d]', time.replace('+00:00', ''))))
+        return _parse(time)
     return None
+
+
+class LazyTime:
+    """A descriptor for timestamp attributes of slotted models.
+
+    Models store the raw string of a payload in the given slot and it is only parsed when the
+    attribute is read for the first time. Afterwards the parsed datetime replaces the string.
+    """
+
+    __slots__ = ('slot',)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.slot)
+        if isinstance(value, str):
+            value = parse_time(value)
+            setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)